@@ -10,6 +10,42 @@ class Settings(BaseSettings):
     SUPABASE_KEY: str | None = None
     DATA_SOURCE: str = "supabase"
     MOCK_DATA_PATH: str | None = None
+    MOCK_SORTED_COLUMNS: str = "read_at,created_at,next_review_at"
+    MOCK_PERSIST_DIR: str | None = None
+    MOCK_SNAPSHOT_EVERY: int = 1000
+    MOCK_JOURNAL_FSYNC: bool = False
+    MOCK_FAULTS_PATH: str | None = None
+    SQLITE_PATH: str = ".isotrack.sqlite3"
+    # "tabla.columna,..." reemplaza los índices por defecto; "columna" sola
+    # indexa todas las tablas.
+    SQLITE_INDEXED_COLUMNS: str | None = None
+    DB_CONCURRENCY: int = 8
+
+    # --- Documentos ---
+    DOCUMENT_LIST_RECENT_READS: int = 5
+    COMPLIANCE_CACHE_TTL_SECONDS: int = 300
+    TAG_INDEX_TTL_SECONDS: int = 300
+    DOCUMENT_BULK_CHUNK_SIZE: int = 200
+    REVIEW_CHECK_SECONDS: int = 300
+    REVIEW_NOTIFY_LOOKBACK_HOURS: int = 24
+    REVIEW_SCHEDULE_TTL_SECONDS: int = 900
+    READ_DIGEST_SECONDS: int = 86400
+    READ_DIGEST_DUE_SOON_DAYS: int = 3
+
+    # --- Búsqueda ---
+    SEARCH_INDEX_TTL_SECONDS: int = 300
+
+    # --- Procesos ---
+    PROCESS_TREE_TTL_SECONDS: int = 300
+    PROCESS_EXPORT_CHUNK_SIZE: int = 100
+
+    # --- HTTP ---
+    ETAG_MAX_BODY_BYTES: int = 5_000_000
+
+    # --- Tareas en segundo plano ---
+    # Cada proceso corre su propio planificador: activar en uno solo (ver readme).
+    JOBS_ENABLED: bool = False
+    READ_COUNTERS_RECONCILE_SECONDS: int = 3600
 
     # --- Logging ---
     LOG_LEVEL: str = "INFO"
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from datetime import datetime
 import logging
-from typing import Any, Dict, Optional, Sequence, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
 from postgrest.exceptions import APIError
 
@@ -27,6 +27,14 @@ class CustomSupabaseDAO:
 
     # --- Manejo centralizado de ejecución segura ---
     def _execute(self, query, action: str):
+        return self._execute_response(query, action).data
+
+    def _execute_with_count(self, query, action: str) -> Tuple[List[Any], int]:
+        """Ejecuta una consulta armada con ``count=...`` y devuelve filas y total."""
+        response = self._execute_response(query, action)
+        return response.data or [], response.count or 0
+
+    def _execute_response(self, query, action: str):
         try:
             response = query.execute()
         except APIError as error:
@@ -63,7 +71,7 @@ class CustomSupabaseDAO:
                 },
             )
 
-        return response.data
+        return response
 
     # --- Convierte objetos datetime en strings ISO 8601 recursivamente. ---
     @staticmethod
@@ -94,8 +102,15 @@ class CustomSupabaseDAO:
         # Sequence[str] puede incluir tuplas o listas de nombres de columnas.
         return ",".join(columns)
 
-    def _build_select_query(self, columns: Optional[SelectColumns] = None):
+    def _build_select_query(
+        self,
+        columns: Optional[SelectColumns] = None,
+        *,
+        count: Optional[str] = None,
+    ):
         selection = self._normalize_columns(columns)
+        if count:
+            return self.table.select(selection, count=count)
         return self.table.select(selection)
 
     @staticmethod
@@ -130,6 +145,14 @@ class CustomSupabaseDAO:
         data = self._execute(query, "insert")
         return data[0] if data else None
 
+    def insert_many(self, payloads: Sequence[dict]) -> List[Dict[str, Any]]:
+        """Inserta varios registros en una sola consulta, en el mismo orden."""
+        if not payloads:
+            return []
+        serialized = [self._serialize_payload(payload) for payload in payloads]
+        query = self.table.insert(serialized)
+        return self._execute(query, "insert_many") or []
+
     def update(self, record_id: Any, payload: dict):
         if not payload:
             raise DataAccessError(
@@ -176,6 +199,37 @@ class CustomSupabaseDAO:
         data = self.filter(**filters)
         return self._extract_single(data)
 
+    def count_where(self, filters: Dict[str, Any]) -> int:
+        """Cantidad de filas que cumplen ``filters`` sin traerlas."""
+        query = self._build_select_query("id", count="exact")
+        query = self._apply_filters(query, filters).limit(0)
+        return self._execute_with_count(query, "count_where")[1]
+
+    def latest_value(self, column: str, filters: Optional[Dict[str, Any]] = None):
+        """Máximo de ``column`` (ignorando nulos) con una consulta ordenada."""
+        query = self._apply_filters(self._build_select_query(column), filters or {})
+        query = query.not_.is_(column, "null").order(column, desc=True).limit(1)
+        data = self._execute(query, "latest_value")
+        return data[0].get(column) if data else None
+
+    def _iter_pages(
+        self, build_query: Callable[[], Any], action: str, *, batch_size: int = 1000
+    ) -> Iterator[Dict[str, Any]]:
+        """Recorre una consulta por páginas de ``batch_size`` filas.
+
+        ``build_query`` debe devolver una consulta con orden estable; cada
+        página se pide con ``range`` para no traer la tabla de una vez.
+        """
+        offset = 0
+        while True:
+            page = self._execute(
+                build_query().range(offset, offset + batch_size - 1), action
+            )
+            yield from page
+            if len(page) < batch_size:
+                return
+            offset += batch_size
+
     def update_where(self, filters: Dict[str, Any], payload: dict):
         """Actualiza registros que cumplen los filtros y retorna el primero."""
         query = self.table.update(payload)
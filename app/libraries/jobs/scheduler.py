@@ -0,0 +1,138 @@
+"""Planificador de tareas periódicas en segundo plano.
+
+Cada tarea corre en su propio hilo daemon: las tareas de mantenimiento
+hacen round-trips bloqueantes a la base y no deben ocupar el event loop
+de FastAPI. Una ejecución que falla se registra en el log y la tarea
+sigue programada.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PeriodicJob:
+    name: str
+    interval_seconds: float
+    func: Callable[[], Any]
+    run_on_start: bool = False
+    last_started_at: Optional[datetime] = None
+    last_duration_ms: Optional[float] = None
+    last_result: Any = None
+    last_error: Optional[str] = None
+    runs: int = 0
+    failures: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def run(self) -> Any:
+        """Ejecuta la tarea una vez; si ya está corriendo, no la solapa."""
+
+        if not self._lock.acquire(blocking=False):
+            logger.info("Tarea %s en curso, se omite la ejecución", self.name)
+            return None
+        try:
+            self.last_started_at = datetime.now(timezone.utc)
+            start = time.perf_counter()
+            try:
+                result = self.func()
+            except Exception as error:  # noqa: BLE001 - el hilo no debe morir
+                self.failures += 1
+                self.last_error = str(error)
+                logger.exception("Falló la tarea %s", self.name)
+                return None
+            finally:
+                self.runs += 1
+                self.last_duration_ms = (time.perf_counter() - start) * 1000
+            self.last_error = None
+            self.last_result = result
+            logger.info(
+                "Tarea %s completada",
+                self.name,
+                extra={"duration_ms": round(self.last_duration_ms, 2), "result": result},
+            )
+            return result
+        finally:
+            self._lock.release()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "interval_seconds": self.interval_seconds,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_started_at": self.last_started_at,
+            "last_duration_ms": self.last_duration_ms,
+            "last_error": self.last_error,
+        }
+
+
+class JobScheduler:
+    def __init__(self) -> None:
+        self._jobs: Dict[str, PeriodicJob] = {}
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return bool(self._threads)
+
+    def register(
+        self,
+        name: str,
+        interval_seconds: float,
+        func: Callable[[], Any],
+        *,
+        run_on_start: bool = False,
+    ) -> PeriodicJob:
+        if self.running:
+            raise RuntimeError("No se pueden registrar tareas con el planificador activo")
+        if interval_seconds <= 0:
+            raise ValueError(f"Intervalo inválido para la tarea {name}: {interval_seconds}")
+        job = PeriodicJob(name, interval_seconds, func, run_on_start=run_on_start)
+        self._jobs[name] = job
+        return job
+
+    def get(self, name: str) -> PeriodicJob:
+        return self._jobs[name]
+
+    def run_now(self, name: str) -> Any:
+        return self._jobs[name].run()
+
+    def status(self) -> List[Dict[str, Any]]:
+        return [job.status() for job in self._jobs.values()]
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        for job in self._jobs.values():
+            thread = threading.Thread(
+                target=self._loop, args=(job,), name=f"job-{job.name}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        if self._jobs:
+            logger.info("Planificador iniciado", extra={"jobs": list(self._jobs)})
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _loop(self, job: PeriodicJob) -> None:
+        if job.run_on_start and not self._stop.is_set():
+            job.run()
+        while not self._stop.wait(job.interval_seconds):
+            job.run()
+
+
+scheduler = JobScheduler()
@@ -0,0 +1,47 @@
+"""Ejecución concurrente de llamadas bloqueantes (round-trips a la base)."""
+
+from __future__ import annotations
+
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List
+
+from app.config.settings import settings
+
+_executor = ThreadPoolExecutor(
+    max_workers=max(1, settings.DB_CONCURRENCY),
+    thread_name_prefix="db-io",
+)
+_worker = threading.local()
+
+
+def _run_in_worker(context: contextvars.Context, call: Callable[[], Any]) -> Any:
+    _worker.active = True
+    try:
+        # El contexto copiado conserva request_id/user_id para los logs.
+        return context.run(call)
+    finally:
+        _worker.active = False
+
+
+def run_concurrently(*calls: Callable[[], Any]) -> List[Any]:
+    """Ejecuta ``calls`` en paralelo y devuelve sus resultados en el mismo orden.
+
+    Espera a que terminen todas y, si alguna falló, relanza la primera
+    excepción según el orden de ``calls``. Dentro de un hilo del pool las
+    llamadas se ejecutan en serie para no agotarlo con esperas anidadas.
+    """
+
+    if len(calls) <= 1 or getattr(_worker, "active", False):
+        return [call() for call in calls]
+
+    futures = [
+        _executor.submit(_run_in_worker, contextvars.copy_context(), call)
+        for call in calls
+    ]
+    errors = [future.exception() for future in futures]
+    for error in errors:
+        if error is not None:
+            raise error
+    return [future.result() for future in futures]
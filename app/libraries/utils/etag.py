@@ -0,0 +1,75 @@
+"""ETags fuertes y GET condicional (``If-None-Match`` → ``304``).
+
+Hay dos formas de obtener el ETag de una respuesta:
+
+* :func:`conditional_get`: la ruta entrega una *sonda* barata (conteos y
+  máximos de ``updated_at``) y, si el cliente ya tiene esa versión, se
+  responde ``304`` sin hidratar ni serializar nada.
+* :class:`app.middleware.etag.ETagMiddleware`: para el resto de los GET se
+  calcula el hash del cuerpo ya serializado; se evita reenviarlo, pero no
+  el trabajo de armarlo.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Callable, Optional
+
+from fastapi import Request, Response
+
+_VARY = "Authorization"
+
+
+def make_etag(*parts: Any) -> str:
+    """ETag fuerte a partir de valores serializables a JSON."""
+
+    payload = json.dumps(parts, default=str, separators=(",", ":"), sort_keys=True)
+    return body_etag(payload.encode("utf-8"))
+
+
+def body_etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Comparación débil, como exige ``If-None-Match`` (RFC 9110 §13.1.2)."""
+
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Vary": _VARY})
+
+
+def conditional_get(
+    request: Request, response: Response, probe: Callable[[], Any]
+) -> Optional[Response]:
+    """Resuelve un GET condicional con una sonda de versión.
+
+    ``probe`` devuelve un valor que cambia cada vez que cambia la respuesta,
+    o ``None`` si para esos parámetros no hay sonda confiable (en ese caso
+    el ETag lo calcula el middleware con el cuerpo). Devuelve la respuesta
+    ``304`` a enviar o ``None`` para seguir con la ruta.
+    """
+
+    version = probe()
+    if version is None:
+        return None
+    etag = make_etag(request.url.path, str(request.url.query), version)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    response.headers["Vary"] = _VARY
+    return None
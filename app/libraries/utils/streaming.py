@@ -0,0 +1,33 @@
+"""Serialización incremental de registros para respuestas en streaming.
+
+Los generadores se consumen de a un registro: la memoria no depende del
+tamaño total de la respuesta. Como no hay ``Content-Length``, el
+middleware de ETags deja pasar estas respuestas sin leerlas.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Iterable, Iterator
+
+
+def _dumps(record: Dict[str, Any]) -> str:
+    return json.dumps(record, default=str, ensure_ascii=False, separators=(",", ":"))
+
+
+def ndjson_lines(records: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    """Un objeto JSON por línea (``application/x-ndjson``)."""
+
+    for record in records:
+        yield (_dumps(record) + "\n").encode("utf-8")
+
+
+def json_array_chunks(records: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    """Un arreglo JSON válido emitido elemento por elemento."""
+
+    yield b"["
+    separator = b""
+    for record in records:
+        yield separator + _dumps(record).encode("utf-8")
+        separator = b",\n"
+    yield b"]"
@@ -8,12 +8,16 @@ from fastapi.middleware.cors import CORSMiddleware
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from app.config.logging import setup_logging
+from app.config.settings import settings
+from app.libraries.jobs.scheduler import scheduler
 from app.middleware.error_handler import (
     custom_error_handler,
     http_exception_handler,
     validation_exception_handler,
 )
+from app.middleware.etag import ETagMiddleware
 from app.middleware.request_context import RequestContextLogMiddleware
+from app.modules.jobs import register_jobs
 from app.modules.routes import register_routes
 
 # 🔹 Lista de orígenes permitidos
@@ -30,6 +34,7 @@ def create_app() -> FastAPI:
         description="Backend MVP for documentation and processes management.",
     )
 
+    app.add_middleware(ETagMiddleware)
     app.add_middleware(RequestContextLogMiddleware)
 
     app.middleware("http")(custom_error_handler)
@@ -48,6 +53,12 @@ def create_app() -> FastAPI:
     )
 
     register_routes(app)
+
+    # --- Tareas periódicas ---
+    if settings.JOBS_ENABLED and not scheduler.running:
+        register_jobs(scheduler)
+        app.add_event_handler("startup", scheduler.start)
+        app.add_event_handler("shutdown", scheduler.stop)
     return app
 
 
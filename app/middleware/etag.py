@@ -0,0 +1,55 @@
+# app/middleware/etag.py
+"""Middleware que agrega ETags por hash del cuerpo a las respuestas GET."""
+
+from __future__ import annotations
+
+from typing import Awaitable, Callable
+
+from fastapi import Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.config.settings import settings
+from app.libraries.utils.etag import body_etag, etag_matches, not_modified
+
+
+class ETagMiddleware(BaseHTTPMiddleware):
+    """Calcula un ETag fuerte para los GET JSON que no trajeron uno propio.
+
+    Las rutas con sonda de versión (:func:`~app.libraries.utils.etag.conditional_get`)
+    ya fijan el header y quedan fuera; las respuestas sin ``Content-Length``
+    (streaming) o más grandes que ``ETAG_MAX_BODY_BYTES`` se envían tal cual.
+    """
+
+    async def dispatch(
+        self,
+        request: Request,
+        call_next: Callable[[Request], Awaitable[Response]],
+    ):
+        response = await call_next(request)
+        if request.method not in {"GET", "HEAD"} or response.status_code != 200:
+            return response
+        if "etag" in response.headers:
+            return response
+        if not response.headers.get("content-type", "").startswith("application/json"):
+            return response
+        length = response.headers.get("content-length")
+        if length is None or int(length) > settings.ETAG_MAX_BODY_BYTES:
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        etag = body_etag(body)
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return not_modified(etag)
+
+        buffered = Response(
+            content=body,
+            status_code=response.status_code,
+            background=response.background,
+        )
+        # Se copian los headers crudos para no perder los repetidos (cookies).
+        buffered.raw_headers = [
+            *response.raw_headers,
+            (b"etag", etag.encode("latin-1")),
+            (b"vary", b"Authorization"),
+        ]
+        return buffered
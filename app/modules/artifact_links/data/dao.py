@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 from app.libraries.customs.supabase_dao import CustomSupabaseDAO
 
@@ -16,17 +16,41 @@ class ArtifactLinkDAO(CustomSupabaseDAO):
     def list_for_entity(self, entity_id: str, entity_type: str) -> List[Dict[str, Any]]:
         """Devuelve los vínculos donde la entidad participa como origen o destino."""
 
-        outgoing = self.filter(from_id=entity_id, from_type=entity_type)
-        incoming = self.filter(to_id=entity_id, to_type=entity_type)
+        # Una sola consulta para ambas direcciones.
+        query = self._build_select_query().or_(
+            f'and(from_id.eq."{entity_id}",from_type.eq.{entity_type}),'
+            f'and(to_id.eq."{entity_id}",to_type.eq.{entity_type})'
+        )
+        data = self._execute(query, "list_for_entity")
 
         records: Dict[str, Dict[str, Any]] = {}
-        for item in outgoing + incoming:
+        for item in data:
             identifier = item.get("id")
             if identifier is None:
                 continue
             records.setdefault(identifier, item)
         return list(records.values())
 
+    def list_for_entities(
+        self, entity_ids: Sequence[str], entity_type: str
+    ) -> List[Dict[str, Any]]:
+        """Como :meth:`list_for_entity` para varias entidades del mismo tipo."""
+
+        if not entity_ids:
+            return []
+        values = ",".join(f'"{entity_id}"' for entity_id in entity_ids)
+        query = self._build_select_query().or_(
+            f"and(from_id.in.({values}),from_type.eq.{entity_type}),"
+            f"and(to_id.in.({values}),to_type.eq.{entity_type})"
+        )
+        data = self._execute(query, "list_for_entities")
+        records: Dict[str, Dict[str, Any]] = {}
+        for item in data:
+            identifier = item.get("id")
+            if identifier is not None:
+                records.setdefault(identifier, item)
+        return list(records.values())
+
     def get_by_pair(
         self,
         *,
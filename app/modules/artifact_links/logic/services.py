@@ -67,10 +67,20 @@ class ArtifactLinkService(BaseService):
         self, profile: Dict[str, Any], entity_id: str, entity_type: ArtifactEntityType
     ):
         entity = self._resolve_entity(entity_type, entity_id)
+        return self.list_for_loaded_entity(profile, entity, entity_type)
+
+    def list_for_loaded_entity(
+        self,
+        profile: Dict[str, Any],
+        entity: Dict[str, Any],
+        entity_type: ArtifactEntityType,
+    ):
+        """Igual que :meth:`list_for_entity` para una entidad ya obtenida."""
+
         company_id = entity.get("company_id")
         if company_id:
             self.user_service.ensure_can_access_company(profile, company_id)
-        return self.dao.list_for_entity(entity_id, entity_type.value)
+        return self.dao.list_for_entity(entity["id"], entity_type.value)
 
     def create_link(self, profile: Dict[str, Any], payload: Dict[str, Any]):
         from_id = payload.get("from_id")
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from typing import Dict, List
+from datetime import datetime
+from typing import Dict, List, Sequence
 
 from app.libraries.utils.response_builder import ResponseBuilder
 from app.libraries.utils.response_models import ApiResponse
@@ -10,11 +11,17 @@ from app.libraries.utils.response_models import ApiResponse
 from ..logic.services import DocumentService
 from .schemas import (
     Document,
+    DocumentBulkCreate,
+    DocumentBulkResponse,
+    DocumentComplianceMatrix,
     DocumentCreatePayload,
     DocumentDetail,
     DocumentListItem,
     DocumentRead,
+    DocumentReadBulkCreate,
     DocumentReadCreate,
+    DocumentReadPage,
+    DocumentTagCount,
     DocumentUpdate,
     DocumentVersion,
     DocumentVersionCreate,
@@ -32,12 +39,20 @@ class DocumentController:
         company_id: str | None,
         process_id: str | None,
         include_inactive: bool,
+        search: str | None = None,
+        review_due_before: datetime | None = None,
+        tags: Sequence[str] | None = None,
+        expand: Sequence[str] | None = None,
     ) -> ApiResponse[List[DocumentListItem]]:
         records = self.service.list_documents(
             profile,
             company_id=company_id,
             process_id=process_id,
             include_inactive=include_inactive,
+            search=search,
+            review_due_before=review_due_before,
+            tags=tags,
+            expand=expand,
         )
         items = [
             DocumentListItem.model_validate(record).model_dump(by_alias=True)
@@ -45,6 +60,18 @@ class DocumentController:
         ]
         return ResponseBuilder.success(items, "Documentos obtenidos")
 
+    def list_documents_version(self, profile: Dict, **params):
+        return self.service.list_documents_version(profile, **params)
+
+    def list_tags(
+        self, profile: Dict, company_id: str | None, *, include_inactive: bool
+    ) -> ApiResponse[List[DocumentTagCount]]:
+        counts = self.service.list_tags(
+            profile, company_id, include_inactive=include_inactive
+        )
+        items = [DocumentTagCount.model_validate(item) for item in counts]
+        return ResponseBuilder.success(items, "Etiquetas obtenidas")
+
     def get_document(self, document_id: str, profile: Dict) -> ApiResponse[DocumentDetail]:
         record = self.service.get_document_detail(document_id, profile)
         schema = DocumentDetail.model_validate(record)
@@ -66,6 +93,16 @@ class DocumentController:
         schema = DocumentDetail.model_validate(created)
         return ResponseBuilder.success(schema, "Documento creado")
 
+    def create_documents_bulk(
+        self, profile: Dict, payload: DocumentBulkCreate
+    ) -> ApiResponse[DocumentBulkResponse]:
+        items = [item.model_dump(exclude_unset=True) for item in payload.items]
+        result = self.service.create_documents_bulk(profile, items)
+        schema = DocumentBulkResponse.model_validate(result)
+        return ResponseBuilder.success(
+            schema.model_dump(by_alias=True), "Carga masiva procesada"
+        )
+
     def update_document(
         self, profile: Dict, document_id: str, payload: DocumentUpdate
     ) -> ApiResponse[Document]:
@@ -96,3 +133,29 @@ class DocumentController:
         recorded = self.service.record_read(profile, document_id, read_payload)
         schema = DocumentRead.model_validate(recorded)
         return ResponseBuilder.success(schema, "Lectura registrada")
+
+    def record_reads_bulk(
+        self, profile: Dict, payload: DocumentReadBulkCreate
+    ) -> ApiResponse[List[DocumentRead]]:
+        read_payload = payload.model_dump(exclude_unset=True, exclude={"document_ids"})
+        recorded = self.service.record_reads_bulk(
+            profile, payload.document_ids, read_payload
+        )
+        items = [DocumentRead.model_validate(record) for record in recorded]
+        return ResponseBuilder.success(items, "Lecturas registradas")
+
+    def list_reads(
+        self, profile: Dict, document_id: str, *, offset: int, limit: int
+    ) -> ApiResponse[DocumentReadPage]:
+        page = self.service.list_reads(profile, document_id, offset=offset, limit=limit)
+        schema = DocumentReadPage.model_validate(page)
+        return ResponseBuilder.success(
+            schema.model_dump(by_alias=True), "Lecturas obtenidas"
+        )
+
+    def get_compliance_matrix(
+        self, profile: Dict, company_id: str | None
+    ) -> ApiResponse[DocumentComplianceMatrix]:
+        matrix = self.service.get_compliance_matrix(profile, company_id)
+        schema = DocumentComplianceMatrix.model_validate(matrix)
+        return ResponseBuilder.success(schema, "Matriz de cumplimiento obtenida")
@@ -2,21 +2,29 @@
 
 from __future__ import annotations
 
+from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 
 from app.libraries.auth.roles import require_role
+from app.libraries.utils.etag import conditional_get
 from app.libraries.utils.response_models import ApiResponse
 
 from .controller import DocumentController
 from .schemas import (
     Document,
+    DocumentBulkCreate,
+    DocumentBulkResponse,
+    DocumentComplianceMatrix,
     DocumentCreatePayload,
     DocumentDetail,
     DocumentListItem,
     DocumentRead,
+    DocumentReadBulkCreate,
     DocumentReadCreate,
+    DocumentReadPage,
+    DocumentTagCount,
     DocumentUpdate,
     DocumentVersion,
     DocumentVersionCreate,
@@ -26,19 +34,81 @@ router = APIRouter()
 controller = DocumentController()
 
 
+def _split_csv(value: Optional[str]) -> Optional[List[str]]:
+    if value is None:
+        return None
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
 @router.get("/", response_model=ApiResponse[List[DocumentListItem]])
 async def list_documents(
+    request: Request,
+    response: Response,
     company_id: Optional[str] = Query(default=None),
     process_id: Optional[str] = Query(default=None),
     include_inactive: bool = Query(default=False),
+    search: Optional[str] = Query(
+        default=None, description="Texto a buscar en título o código"
+    ),
+    review_due_before: Optional[datetime] = Query(
+        default=None, description="Solo documentos con revisión vencida a esta fecha"
+    ),
+    tags: Optional[str] = Query(
+        default=None,
+        description="Etiquetas separadas por coma; el documento debe tenerlas todas",
+    ),
+    expand: Optional[str] = Query(
+        default=None,
+        description=(
+            "Relaciones a incluir separadas por coma: none, current_version, "
+            "versions, reads, owner. Sin el parámetro se incluyen todas; las "
+            "no pedidas se omiten de cada documento."
+        ),
+    ),
     profile=Depends(require_role(["root", "admin", "user"])),
 ):
-    return controller.list_documents(
-        profile,
-        company_id=company_id,
-        process_id=process_id,
-        include_inactive=include_inactive,
+    params = {
+        "company_id": company_id,
+        "process_id": process_id,
+        "include_inactive": include_inactive,
+        "search": search,
+        "review_due_before": review_due_before,
+        "tags": _split_csv(tags),
+        "expand": _split_csv(expand),
+    }
+    cached = conditional_get(
+        request,
+        response,
+        lambda: controller.list_documents_version(profile, **params),
     )
+    if cached is not None:
+        return cached
+    return controller.list_documents(profile, **params)
+
+
+@router.get("/tags", response_model=ApiResponse[List[DocumentTagCount]])
+async def list_tags(
+    company_id: Optional[str] = Query(default=None),
+    include_inactive: bool = Query(default=False),
+    profile=Depends(require_role(["root", "admin", "user"])),
+):
+    return controller.list_tags(profile, company_id, include_inactive=include_inactive)
+
+
+@router.get("/compliance", response_model=ApiResponse[DocumentComplianceMatrix])
+async def get_compliance_matrix(
+    company_id: Optional[str] = Query(default=None),
+    profile=Depends(require_role(["root", "admin"])),
+):
+    return controller.get_compliance_matrix(profile, company_id)
+
+
+@router.post("/reads/bulk", response_model=ApiResponse[List[DocumentRead]])
+async def record_reads_bulk(
+    payload: DocumentReadBulkCreate,
+    profile=Depends(require_role(["root", "admin", "user"])),
+):
+    return controller.record_reads_bulk(profile, payload)
 
 
 @router.get("/{document_id}", response_model=ApiResponse[DocumentDetail])
@@ -54,6 +124,14 @@ async def create_document(
     return controller.create_document(profile, payload)
 
 
+@router.post("/bulk", response_model=ApiResponse[DocumentBulkResponse])
+async def create_documents_bulk(
+    payload: DocumentBulkCreate,
+    profile=Depends(require_role(["root", "admin"])),
+):
+    return controller.create_documents_bulk(profile, payload)
+
+
 @router.put("/{document_id}", response_model=ApiResponse[Document])
 async def update_document(
     document_id: str,
@@ -93,3 +171,16 @@ async def record_read(
     profile=Depends(require_role(["root", "admin", "user"])),
 ):
     return controller.record_read(profile, document_id, payload)
+
+
+@router.get(
+    "/{document_id}/reads",
+    response_model=ApiResponse[DocumentReadPage],
+)
+async def list_reads(
+    document_id: str,
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=50, ge=1, le=200),
+    profile=Depends(require_role(["root", "admin", "user"])),
+):
+    return controller.list_reads(profile, document_id, offset=offset, limit=limit)
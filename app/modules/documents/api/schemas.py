@@ -6,7 +6,7 @@ from datetime import datetime, date
 from enum import Enum
 from typing import List, Optional
 
-from pydantic import BaseModel, Field, ConfigDict, field_validator
+from pydantic import BaseModel, Field, ConfigDict, field_validator, model_serializer
 
 from app.modules.artifact_links.api.schemas import ArtifactLink
 
@@ -50,6 +50,11 @@ class DocumentCreate(DocumentBase):
     company_id: Optional[str] = Field(
         default=None, description="Empresa propietaria del documento"
     )
+    next_review_at: Optional[datetime] = Field(
+        default=None, alias="nextReviewAt", description="Próxima revisión programada"
+    )
+
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class DocumentCreatePayload(DocumentCreate):
@@ -59,6 +64,22 @@ class DocumentCreatePayload(DocumentCreate):
     )
 
 
+class DocumentBulkItem(DocumentCreatePayload):
+    client_id: str = Field(
+        ..., alias="clientId", description="Identificador del ítem en el cliente"
+    )
+
+
+class DocumentBulkCreate(BaseModel):
+    items: List[DocumentBulkItem] = Field(..., min_length=1, max_length=1000)
+
+
+class DocumentBulkStatus(str, Enum):
+    CREATED = "created"
+    PARTIAL = "partial"
+    FAILED = "failed"
+
+
 class DocumentUpdate(BaseModel):
     title: Optional[str] = None
     code: Optional[str] = None
@@ -70,12 +91,17 @@ class DocumentUpdate(BaseModel):
     company_id: Optional[str] = None
     category: Optional[str] = None
     tags: Optional[List[str]] = None
-    nextReviewAt: Optional[datetime] = None
+    next_review_at: Optional[datetime] = Field(default=None, alias="nextReviewAt")
+
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class Document(DocumentBase):
     id: str
     company_id: str
+    current_version_id: Optional[str] = Field(
+        default=None, description="Versión vigente del documento"
+    )
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
@@ -129,6 +155,24 @@ class DocumentReadCreate(BaseModel):
     )
 
 
+class DocumentReadBulkCreate(BaseModel):
+    document_ids: List[str] = Field(
+        ...,
+        alias="documentIds",
+        min_length=1,
+        max_length=500,
+        description="Documentos leídos; se registra su versión vigente",
+    )
+    read_at: Optional[datetime] = Field(
+        default=None, description="Fecha de lectura (por defecto ahora)"
+    )
+    due_date: Optional[date] = Field(
+        default=None, description="Fecha límite de lectura si aplica"
+    )
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
 class DocumentRead(BaseModel):
     id: Optional[str] = None
     document_id: str
@@ -148,6 +192,22 @@ class DocumentDetail(Document):
     links: List[ArtifactLink] = Field(default_factory=list)
 
 
+class DocumentBulkResult(BaseModel):
+    client_id: str = Field(..., alias="clientId")
+    status: DocumentBulkStatus
+    document: Optional[DocumentDetail] = None
+    error: Optional[str] = None
+    details: Optional[dict] = None
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class DocumentBulkResponse(BaseModel):
+    created: int = 0
+    failed: int = 0
+    results: List[DocumentBulkResult] = Field(default_factory=list)
+
+
 class DocumentVersionListItem(BaseModel):
     id: str
     document_id: str
@@ -185,6 +245,30 @@ class DocumentReadSummary(BaseModel):
     model_config = ConfigDict(populate_by_name=True, from_attributes=True)
 
 
+class DocumentReadStats(BaseModel):
+    total_readers: int = Field(default=0, alias="totalReaders")
+    current_version_readers: int = Field(default=0, alias="currentVersionReaders")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class DocumentReadPage(BaseModel):
+    items: List[DocumentReadSummary] = Field(default_factory=list)
+    total: int = 0
+    offset: int = 0
+    limit: int = 0
+
+
+class DocumentTagCount(BaseModel):
+    tag: str
+    count: int = 0
+
+
+# Relaciones del listado que solo existen si se pidieron en ``expand``; sin
+# cargar se omiten, para no confundir "no expandido" con "vacío".
+LIST_EXPANSION_FIELDS = ("owner", "current_version", "versions", "reads", "read_summary")
+
+
 class DocumentListItem(Document):
     owner: Optional[str] = None
     status: Optional[str] = None
@@ -196,11 +280,68 @@ class DocumentListItem(Document):
         default=None, alias="currentVersion"
     )
     versions: List[DocumentVersionListItem] = Field(default_factory=list)
-    reads: List[DocumentReadSummary] = Field(default_factory=list)
+    reads: List[DocumentReadSummary] = Field(
+        default_factory=list, description="Últimas lecturas del documento"
+    )
+    read_summary: Optional[DocumentReadStats] = Field(
+        default=None,
+        alias="readSummary",
+        description="Solo si se expanden las lecturas",
+    )
     next_review_at: Optional[datetime] = Field(default=None, alias="nextReviewAt")
 
     model_config = ConfigDict(populate_by_name=True, from_attributes=True)
 
+    @model_serializer(mode="wrap")
+    def _omit_unexpanded(self, handler):
+        data = handler(self)
+        for name in LIST_EXPANSION_FIELDS:
+            if name not in self.model_fields_set:
+                data.pop(name, None)
+                data.pop(self.model_fields[name].alias, None)
+        return data
+
 
 class DocumentListResponse(BaseModel):
     items: List[DocumentListItem]
+
+
+class ComplianceStatus(str, Enum):
+    READ_CURRENT = "read_current"
+    READ_OLD = "read_old"
+    UNREAD = "unread"
+
+
+class ComplianceUser(BaseModel):
+    id: str
+    name: Optional[str] = None
+    position: Optional[str] = None
+
+
+class ComplianceDocument(BaseModel):
+    id: str
+    title: Optional[str] = None
+    code: Optional[str] = None
+    current_version: Optional[str] = None
+    read_current: int = Field(
+        default=0, description="Usuarios que leyeron la versión vigente"
+    )
+    read_old: int = Field(
+        default=0, description="Usuarios que solo leyeron versiones anteriores"
+    )
+    unread: int = Field(default=0, description="Usuarios sin lecturas")
+
+
+class ComplianceRow(BaseModel):
+    user: ComplianceUser
+    statuses: List[ComplianceStatus] = Field(
+        default_factory=list,
+        description="Estado por documento, en el mismo orden que ``documents``",
+    )
+
+
+class DocumentComplianceMatrix(BaseModel):
+    company_id: str
+    generated_at: datetime
+    documents: List[ComplianceDocument] = Field(default_factory=list)
+    rows: List[ComplianceRow] = Field(default_factory=list)
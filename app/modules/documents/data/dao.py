@@ -1,32 +1,120 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional, Sequence
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
+from app.config.settings import settings
 from app.libraries.customs.supabase_dao import CustomSupabaseDAO
+from app.services.supabase_client import supabase
+
+from .versioning import latest_version, sort_versions
+
+
+def _quote_filter_value(value: str) -> str:
+    """Escapa un valor libre para usarlo dentro de ``or_``."""
+
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
 
 
 class DocumentDAO(CustomSupabaseDAO):
     def __init__(self) -> None:
         super().__init__("documents")
 
+    def filter_documents(
+        self,
+        filters: Dict[str, Any],
+        *,
+        text: Optional[str] = None,
+        review_due_before: Optional[Any] = None,
+        ids: Optional[Sequence[str]] = None,
+    ):
+        """Filtra documentos en la base, incluyendo texto y vencimiento de revisión.
+
+        ``ids`` restringe a un conjunto ya resuelto (p. ej. por etiquetas).
+        """
+        query = self._apply_filters(self._build_select_query(), filters)
+        if ids is not None:
+            query = query.in_("id", list(ids))
+        if text:
+            pattern = _quote_filter_value(f"*{text.strip()}*")
+            query = query.or_(f"title.ilike.{pattern},code.ilike.{pattern}")
+        if review_due_before is not None:
+            query = query.lte("next_review_at", review_due_before)
+        return self._execute(query, "filter_documents")
+
+    def set_current_versions(self, documents: Sequence[Dict[str, Any]]):
+        """Asigna ``current_version_id`` a varios documentos en una sola consulta.
+
+        Un ``update`` aplica el mismo valor a todas las filas, así que se usa
+        un ``upsert`` por ``id`` que solo lleva el puntero y las columnas
+        ``not null`` (PostgreSQL las valida antes de resolver el conflicto).
+        """
+        payload = [
+            self._serialize_payload(
+                {
+                    "id": document["id"],
+                    "title": document["title"],
+                    "type": document["type"],
+                    "current_version_id": document["current_version_id"],
+                }
+            )
+            for document in documents
+        ]
+        query = self.table.upsert(payload, on_conflict="id")
+        return self._execute(query, "set_current_versions")
+
+    def iter_active(
+        self, columns: str, *, batch_size: int = 1000
+    ) -> Iterator[Dict[str, Any]]:
+        """Documentos activos de todas las empresas, paginados por ``id``."""
+        return self._iter_pages(
+            lambda: self._build_select_query(columns).eq("active", True).order("id"),
+            "iter_active_documents",
+            batch_size=batch_size,
+        )
+
+    def list_review_schedule(self):
+        """Documentos activos con ``next_review_at``, solo las columnas de agenda."""
+        query = (
+            self._build_select_query("id,company_id,next_review_at,active")
+            .eq("active", True)
+            .not_.is_("next_review_at", "null")
+        )
+        return self._execute(query, "list_review_schedule")
+
 
 class DocumentVersionDAO(CustomSupabaseDAO):
     def __init__(self) -> None:
         super().__init__("document_versions")
 
     def get_last_version(self, document_id: str) -> Optional[Dict[str, Any]]:
-        data = self.table.select("*").eq("document_id", document_id).execute().data
-        if not data:
-            return None
-        # Ordena por versión semántica como string
-        sorted_data = sorted(
-            data, key=lambda x: str(x.get("version", "")), reverse=True
+        """Última versión por ``version_sort_key`` con una sola consulta indexada."""
+        query = (
+            self._build_select_query()
+            .eq("document_id", document_id)
+            .not_.is_("version_sort_key", "null")
+            .order("version_sort_key", desc=True, nullsfirst=False)
+            .order("created_at", desc=True)
+            .limit(1)
         )
-        return sorted_data[0]
+        data = self._execute(query, "get_last_version")
+        if data:
+            return data[0]
+        # Versiones cargadas antes de ``version_sort_key``: se ordenan en memoria.
+        return latest_version(self.list_for_document(document_id))
+
+    def get_by_ids(self, version_ids: Sequence[str]):
+        if not version_ids:
+            return []
+        query = self._build_select_query().in_("id", list(version_ids))
+        return self._execute(query, "get_versions_by_ids")
 
     def list_for_document(self, document_id: str):
-        data = self.table.select("*").eq("document_id", document_id).execute().data
-        return sorted(data, key=lambda x: str(x.get("version", "")))
+        query = self._build_select_query().eq("document_id", document_id)
+        return sort_versions(self._execute(query, "list_for_document"))
 
     def list_for_documents(self, document_ids: Sequence[str]):
         if not document_ids:
@@ -41,17 +129,194 @@ class DocumentVersionDAO(CustomSupabaseDAO):
         return self._execute(query, "list_for_documents")
 
 
-class DocumentReadDAO(CustomSupabaseDAO):
+class DocumentReadCounterDAO(CustomSupabaseDAO):
+    """Lectores por documento y versión en ``document_read_counters``.
+
+    Con Supabase los mantiene el trigger ``document_reads_counters`` sobre
+    ``document_reads`` (ver ``doc/plan_fases_qms.md``): cada lectura suma y
+    resta dentro de la misma transacción, sin consultas extra. Los backends
+    locales (mock, sqlite) no tienen triggers; ahí :class:`DocumentReadDAO`
+    aplica los ajustes con :meth:`apply_deltas` bajo ``lock``. Las
+    diferencias que puedan quedar las corrige la reconciliación periódica
+    (:meth:`replace_for_document`).
+    """
+
+    lock = threading.RLock()
+
     def __init__(self) -> None:
+        super().__init__("document_read_counters")
+
+    @property
+    def maintained_by_database(self) -> bool:
+        return settings.DATA_SOURCE.lower() == "supabase"
+
+    def list_for_documents(self, document_ids: Sequence[str]):
+        if not document_ids:
+            return []
+        query = self._build_select_query("document_id,version,readers").in_(
+            "document_id", list(document_ids)
+        )
+        return self._execute(query, "list_read_counters")
+
+    def apply_deltas(self, document_id: str, deltas: Dict[str, int]) -> None:
+        """Suma ``deltas`` (versión → variación) a los contadores del documento."""
+        deltas = {version: delta for version, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        with self.lock:
+            query = (
+                self._build_select_query("version,readers")
+                .eq("document_id", document_id)
+                .in_("version", list(deltas))
+            )
+            current = {
+                str(row.get("version")): int(row.get("readers") or 0)
+                for row in self._execute(query, "get_read_counters")
+            }
+            rows = [
+                {
+                    "document_id": document_id,
+                    "version": version,
+                    "readers": max(0, current.get(version, 0) + delta),
+                    "updated_at": datetime.utcnow(),
+                }
+                for version, delta in deltas.items()
+            ]
+            self._upsert(rows, "apply_read_counter_deltas")
+
+    def apply_bulk_deltas(self, deltas: Dict[str, Dict[str, int]]) -> None:
+        """Como :meth:`apply_deltas` para varios documentos, en dos consultas."""
+        pending: Dict[str, Dict[str, int]] = {}
+        for document_id, changes in deltas.items():
+            changes = {version: delta for version, delta in changes.items() if delta}
+            if changes:
+                pending[document_id] = changes
+        if not pending:
+            return
+        deltas = pending
+        with self.lock:
+            current = {
+                (row.get("document_id"), str(row.get("version"))): int(
+                    row.get("readers") or 0
+                )
+                for row in self.list_for_documents(list(deltas))
+            }
+            rows = [
+                {
+                    "document_id": document_id,
+                    "version": version,
+                    "readers": max(0, current.get((document_id, version), 0) + delta),
+                    "updated_at": datetime.utcnow(),
+                }
+                for document_id, changes in deltas.items()
+                for version, delta in changes.items()
+            ]
+            self._upsert(rows, "apply_bulk_read_counter_deltas")
+
+    def replace_for_document(
+        self,
+        document_id: str,
+        counts: Dict[str, int],
+        stored: Iterable[Dict[str, Any]] = (),
+    ) -> bool:
+        """Reescribe los contadores que difieren de ``counts``; ``True`` si hubo."""
+        stored_counts = {
+            str(row.get("version")): int(row.get("readers") or 0) for row in stored
+        }
+        rows = [
+            {
+                "document_id": document_id,
+                "version": version,
+                "readers": counts.get(version, 0),
+                "updated_at": datetime.utcnow(),
+            }
+            for version in set(counts) | set(stored_counts)
+            if counts.get(version, 0) != stored_counts.get(version, 0)
+        ]
+        if not rows:
+            return False
+        with self.lock:
+            self._upsert(rows, "reconcile_read_counters")
+        return True
+
+    def _upsert(self, rows: List[Dict[str, Any]], action: str) -> None:
+        payload = [self._serialize_payload(row) for row in rows]
+        query = self.table.upsert(payload, on_conflict="document_id,version")
+        self._execute(query, action)
+
+
+class DocumentReadDAO(CustomSupabaseDAO):
+    # Lo que usa el resumen de lecturas del listado.
+    SUMMARY_COLUMNS = "id,document_id,user_id,read_at,due_date"
+
+    def __init__(self, counters: Optional[DocumentReadCounterDAO] = None) -> None:
         super().__init__("document_reads")
+        self.counters = counters or DocumentReadCounterDAO()
 
     def upsert_read(self, payload: Dict[str, Any]):
-        """Create or update a read entry keeping only the latest per user."""
+        """Create or update a read entry keeping only the latest per user.
+
+        Con Supabase es un único ``upsert`` y el trigger ajusta
+        ``document_read_counters``. En los backends locales una lectura
+        nueva suma uno a su versión y, si reemplaza la lectura de otra
+        versión, resta uno a esa.
+        """
         serialized = self._serialize_payload(payload)
         query = self.table.upsert(serialized, on_conflict="document_id,user_id")
-        data = self._execute(query, "upsert_read")
+        if self.counters.maintained_by_database:
+            data = self._execute(query, "upsert_read")
+            return data[0] if data else None
+
+        with self.counters.lock:
+            previous = self.get_user_read(payload["document_id"], payload["user_id"])
+            data = self._execute(query, "upsert_read")
+            deltas: Counter = Counter()
+            if payload.get("version") is not None:
+                deltas[str(payload["version"])] += 1
+            if previous and previous.get("version") is not None:
+                deltas[str(previous["version"])] -= 1
+            self.counters.apply_deltas(payload["document_id"], dict(deltas))
         return data[0] if data else None
 
+    def upsert_reads(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Varias lecturas de un mismo usuario con un único ``upsert``.
+
+        Los contadores se ajustan como en :meth:`upsert_read`; en los
+        backends locales, con una sola consulta de lecturas previas y un
+        solo ajuste en lote.
+        """
+        if not rows:
+            return []
+        payload = [self._serialize_payload(row) for row in rows]
+        query = self.table.upsert(payload, on_conflict="document_id,user_id")
+        if self.counters.maintained_by_database:
+            return self._execute(query, "upsert_reads") or []
+
+        with self.counters.lock:
+            previous_query = (
+                self._build_select_query("document_id,user_id,version")
+                .in_("document_id", [row["document_id"] for row in rows])
+                .in_("user_id", list({row["user_id"] for row in rows}))
+            )
+            previous = {
+                (read.get("document_id"), read.get("user_id")): read.get("version")
+                for read in self._execute(previous_query, "get_user_reads")
+            }
+            recorded = self._execute(query, "upsert_reads") or []
+
+            deltas: Dict[str, Counter] = {}
+            for row in rows:
+                changes = deltas.setdefault(row["document_id"], Counter())
+                if row.get("version") is not None:
+                    changes[str(row["version"])] += 1
+                old_version = previous.get((row["document_id"], row["user_id"]))
+                if old_version is not None:
+                    changes[str(old_version)] -= 1
+            self.counters.apply_bulk_deltas(
+                {document_id: dict(changes) for document_id, changes in deltas.items()}
+            )
+        return recorded
+
     def list_for_document(self, document_id: str, user_id: Optional[str] = None):
         query = (
             self.table.select("*")
@@ -74,6 +339,77 @@ class DocumentReadDAO(CustomSupabaseDAO):
         )
         return self._execute(query, "list_reads_for_documents")
 
+    def list_read_marks(self, document_ids: Sequence[str]):
+        """Solo las columnas necesarias para marcar quién leyó qué versión."""
+        if not document_ids:
+            return []
+        query = self._build_select_query("document_id,user_id,version").in_(
+            "document_id", list(document_ids)
+        )
+        return self._execute(query, "list_read_marks")
+
+    def list_due_marks(self, document_ids: Sequence[str], due_until: Any):
+        """Lecturas de ``document_ids`` con ``due_date`` hasta ``due_until``."""
+        if not document_ids:
+            return []
+        query = (
+            self._build_select_query("document_id,user_id,version,due_date")
+            .in_("document_id", list(document_ids))
+            .not_.is_("due_date", "null")
+            .lte("due_date", due_until)
+        )
+        return self._execute(query, "list_due_read_marks")
+
+    def list_page(
+        self, document_id: str, *, offset: int = 0, limit: int = 50
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Página de lecturas (más recientes primero) y el total del documento."""
+        query = (
+            self._build_select_query(count="exact")
+            .eq("document_id", document_id)
+            .order("read_at", desc=True)
+            .range(offset, offset + limit - 1)
+        )
+        return self._execute_with_count(query, "list_reads_page")
+
+    def list_recent_for_documents(
+        self, document_ids: Sequence[str], limit: int
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Las ``limit`` lecturas más recientes de cada documento.
+
+        Con Supabase es una sola consulta sobre ``documents`` que embebe
+        ``document_reads`` con ``limit`` por documento, así que se transfieren
+        a lo sumo ``limit`` lecturas de cada uno. Los backends locales no
+        embeben recursos: leen las columnas del resumen de todas las
+        lecturas y aplican el tope en memoria.
+        """
+        recent: Dict[str, List[Dict[str, Any]]] = {}
+        if not document_ids or limit <= 0:
+            return recent
+        if settings.DATA_SOURCE.lower() == "supabase":
+            query = (
+                supabase.table("documents")
+                .select(f"id,document_reads({self.SUMMARY_COLUMNS})")
+                .in_("id", list(document_ids))
+                .order("read_at", desc=True, foreign_table="document_reads")
+                .limit(limit, foreign_table="document_reads")
+            )
+            for document in self._execute(query, "list_recent_reads"):
+                recent[document["id"]] = document.get("document_reads") or []
+            return recent
+
+        query = (
+            self._build_select_query(self.SUMMARY_COLUMNS)
+            .in_("document_id", list(document_ids))
+            .order("document_id")
+            .order("read_at", desc=True)
+        )
+        for read in self._execute(query, "list_recent_reads"):
+            reads = recent.setdefault(read.get("document_id"), [])
+            if len(reads) < limit:
+                reads.append(read)
+        return recent
+
     def get_user_read(
         self, document_id: str, user_id: str, version: Optional[str] = None
     ) -> Optional[Dict[str, Any]]:
@@ -0,0 +1,79 @@
+"""Helpers to order document versions numerically.
+
+Las versiones se guardan como texto (``"1.0"``, ``"2.3"``, ``"10"``), así
+que ordenarlas como string deja ``"10"`` antes que ``"9"``. Cada versión
+guarda además ``version_sort_key``, un entero que respeta el orden
+numérico de hasta tres componentes (``mayor.menor.parche``) y permite
+obtener la última versión con un único ``order(...).limit(1)``.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+_COMPONENT_BASE = 1000
+_COMPONENTS = 3
+_VERSION_PATTERN = re.compile(r"^\s*[vV]?(\d+(?:\.\d+){0,2})\s*$")
+
+
+def version_sort_key(value: Any) -> Optional[int]:
+    """Devuelve la clave numérica de ``value`` o ``None`` si no es numérica."""
+
+    if value is None or isinstance(value, bool):
+        return None
+    match = _VERSION_PATTERN.match(str(value))
+    if not match:
+        return None
+    parts = [int(part) for part in match.group(1).split(".")]
+    if any(part >= _COMPONENT_BASE for part in parts[1:]):
+        return None
+    parts += [0] * (_COMPONENTS - len(parts))
+    key = 0
+    for part in parts:
+        key = key * _COMPONENT_BASE + part
+    return key
+
+
+def version_order(version: Dict[str, Any]) -> Tuple[int, int, str, str]:
+    """Clave de orden ascendente; las versiones no numéricas van primero."""
+
+    raw = version.get("version")
+    key = version.get("version_sort_key")
+    if key is None:
+        key = version_sort_key(raw)
+    if key is None:
+        return (0, 0, str(raw or ""), str(version.get("created_at") or ""))
+    return (1, key, "", str(version.get("created_at") or ""))
+
+
+def sort_versions(versions: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return sorted(versions, key=version_order)
+
+
+def latest_version(versions: Iterable[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    return max(versions, key=version_order, default=None)
+
+
+def current_version(
+    document: Dict[str, Any], versions: Iterable[Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """Versión apuntada por ``current_version_id`` o, si no hay, la mayor."""
+
+    versions = list(versions)
+    pointer = document.get("current_version_id")
+    if pointer:
+        for version in versions:
+            if version.get("id") == pointer:
+                return version
+    return latest_version(versions)
+
+
+def next_version_label(last: Optional[Dict[str, Any]]) -> str:
+    """Etiqueta para una versión autoincrementada a partir de la última."""
+
+    if not last:
+        return "1.0"
+    key = version_order(last)[1]
+    major = key // (_COMPONENT_BASE ** (_COMPONENTS - 1)) if key else 0
+    return f"{major + 1}.0"
@@ -0,0 +1,208 @@
+"""Matriz de cumplimiento de lecturas (usuarios × documentos) con bitsets.
+
+Cada documento guarda dos enteros usados como bitsets sobre el índice de
+usuarios: ``read_any`` (leyó alguna versión) y ``read_current`` (leyó la
+versión vigente). El estado de una celda sale de dos operaciones ``&`` y
+los totales por documento de ``int.bit_count``.
+
+Las matrices se cachean por empresa en :data:`compliance_cache` y se
+actualizan en el lugar cuando se registra una lectura o se publica una
+versión vigente; altas y bajas de documentos o usuarios invalidan la
+entrada y la próxima consulta la reconstruye.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.config.settings import settings
+
+READ_CURRENT = "read_current"
+READ_OLD = "read_old"
+UNREAD = "unread"
+
+
+@dataclass
+class ComplianceMatrix:
+    company_id: str
+    users: List[Dict[str, Any]]
+    documents: List[Dict[str, Any]]
+    current_labels: List[Optional[str]]
+    read_any: List[int] = field(default_factory=list)
+    read_current: List[int] = field(default_factory=list)
+    generated_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    built_at: float = field(default_factory=time.monotonic)
+
+    def __post_init__(self) -> None:
+        self.user_index = {
+            user["id"]: position for position, user in enumerate(self.users)
+        }
+        self.document_index = {
+            document["id"]: position for position, document in enumerate(self.documents)
+        }
+        if not self.read_any:
+            self.read_any = [0] * len(self.documents)
+        if not self.read_current:
+            self.read_current = [0] * len(self.documents)
+
+    @classmethod
+    def build(
+        cls,
+        company_id: str,
+        users: List[Dict[str, Any]],
+        documents: List[Dict[str, Any]],
+        current_labels: List[Optional[str]],
+        reads: Iterable[Dict[str, Any]],
+    ) -> "ComplianceMatrix":
+        matrix = cls(company_id, users, documents, current_labels)
+        for read in reads:
+            matrix.apply_read(
+                read.get("document_id"), read.get("user_id"), read.get("version")
+            )
+        return matrix
+
+    # Actualizaciones incrementales ------------------------------------
+    def apply_read(self, document_id: Any, user_id: Any, version: Any) -> bool:
+        """Marca la lectura; devuelve ``False`` si el usuario o documento no existe."""
+
+        position = self.document_index.get(document_id)
+        user_position = self.user_index.get(user_id)
+        if position is None or user_position is None:
+            return False
+        bit = 1 << user_position
+        self.read_any[position] |= bit
+        # Una lectura por usuario y documento: la nueva reemplaza a la anterior.
+        current = self.current_labels[position]
+        if current is not None and version is not None and str(version) == current:
+            self.read_current[position] |= bit
+        else:
+            self.read_current[position] &= ~bit
+        return True
+
+    def apply_current_version(self, document_id: Any, label: Any) -> bool:
+        position = self.document_index.get(document_id)
+        if position is None:
+            return False
+        label = str(label) if label is not None else None
+        if label != self.current_labels[position]:
+            self.current_labels[position] = label
+            self.documents[position]["current_version"] = label
+            self.read_current[position] = 0
+        return True
+
+    # Lectura -----------------------------------------------------------
+    def status(self, user_position: int, position: int) -> str:
+        bit = 1 << user_position
+        if self.read_current[position] & bit:
+            return READ_CURRENT
+        if self.read_any[position] & bit:
+            return READ_OLD
+        return UNREAD
+
+    def to_payload(self) -> Dict[str, Any]:
+        user_total = len(self.users)
+        documents = []
+        for position, document in enumerate(self.documents):
+            current = self.read_current[position].bit_count()
+            old = self.read_any[position].bit_count() - current
+            documents.append(
+                {
+                    **document,
+                    "read_current": current,
+                    "read_old": old,
+                    "unread": user_total - current - old,
+                }
+            )
+
+        rows = []
+        for user_position, user in enumerate(self.users):
+            bit = 1 << user_position
+            statuses = [
+                READ_CURRENT if current & bit else READ_OLD if seen & bit else UNREAD
+                for seen, current in zip(self.read_any, self.read_current)
+            ]
+            rows.append({"user": user, "statuses": statuses})
+
+        return {
+            "company_id": self.company_id,
+            "generated_at": self.generated_at,
+            "documents": documents,
+            "rows": rows,
+        }
+
+
+class ComplianceCache:
+    """Matrices por empresa con actualización incremental.
+
+    ``generation`` cambia con cada actualización o invalidación; una matriz
+    construida mientras cambiaban los datos se descarta en :meth:`put` para
+    no perder lecturas registradas durante la construcción.
+    """
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._matrices: Dict[str, ComplianceMatrix] = {}
+        self._generations: Dict[str, int] = {}
+
+    def generation(self, company_id: str) -> int:
+        with self._lock:
+            return self._generations.get(company_id, 0)
+
+    def _bump(self, company_id: str) -> None:
+        self._generations[company_id] = self._generations.get(company_id, 0) + 1
+
+    def get_payload(self, company_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            matrix = self._matrices.get(company_id)
+            if matrix is None:
+                return None
+            if time.monotonic() - matrix.built_at > self.ttl_seconds:
+                # Vencida: recoge usuarios nuevos y cambios hechos por fuera.
+                del self._matrices[company_id]
+                return None
+            return matrix.to_payload()
+
+    def put(self, matrix: ComplianceMatrix, generation: int) -> None:
+        with self._lock:
+            if self._generations.get(matrix.company_id, 0) == generation:
+                self._matrices[matrix.company_id] = matrix
+
+    def invalidate(self, company_id: Optional[str] = None) -> None:
+        with self._lock:
+            if company_id is None:
+                for key in self._generations:
+                    self._generations[key] += 1
+                self._matrices.clear()
+                return
+            self._bump(company_id)
+            self._matrices.pop(company_id, None)
+
+    def apply_read(
+        self, company_id: str, document_id: str, user_id: str, version: Any
+    ) -> None:
+        with self._lock:
+            self._bump(company_id)
+            matrix = self._matrices.get(company_id)
+            if matrix is None:
+                return
+            if not matrix.apply_read(document_id, user_id, version):
+                del self._matrices[company_id]
+
+    def apply_current_version(
+        self, company_id: str, document_id: str, label: Any
+    ) -> None:
+        with self._lock:
+            self._bump(company_id)
+            matrix = self._matrices.get(company_id)
+            if matrix is None:
+                return
+            if not matrix.apply_current_version(document_id, label):
+                del self._matrices[company_id]
+
+
+compliance_cache = ComplianceCache(settings.COMPLIANCE_CACHE_TTL_SECONDS)
@@ -0,0 +1,236 @@
+"""Agenda en memoria de revisiones pendientes (``next_review_at``).
+
+Cada empresa tiene un min-heap de ``(next_review_at, document_id)``: la
+tarea periódica solo mira la cabeza de cada heap, así que encontrar las
+revisiones vencidas no recorre la tabla ``documents``. La agenda se carga
+desde la base y se vuelve a cargar cada ``ttl_seconds``: los hooks de
+:class:`DocumentService` solo la adelantan en el proceso que corre las
+tareas, y los cambios hechos en otros workers llegan con la recarga. Las
+revisiones ya avisadas se recuerdan para no repetirlas al recargar.
+
+Reprogramar o cancelar no busca dentro del heap: la entrada vigente de cada
+documento queda en ``_scheduled`` y las viejas se descartan al salir
+(borrado perezoso). Cuando las descartadas superan a las vigentes, el heap
+se reconstruye.
+"""
+
+from __future__ import annotations
+
+import heapq
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.config.settings import settings
+
+HeapEntry = Tuple[datetime, str]
+
+
+def as_utc_datetime(value: Any) -> Optional[datetime]:
+    """Convierte ``next_review_at`` (texto ISO o ``datetime``) a UTC."""
+
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        moment = value
+    else:
+        try:
+            moment = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+
+def review_due_at(document: Dict[str, Any]) -> Optional[datetime]:
+    return as_utc_datetime(
+        document.get("next_review_at", document.get("nextReviewAt"))
+    )
+
+
+class ReviewSchedule:
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._heaps: Dict[str, List[HeapEntry]] = {}
+        self._scheduled: Dict[str, Tuple[str, datetime]] = {}
+        self._notified: Dict[str, datetime] = {}
+        # Cambios de los hooks mientras se lee la base; se reaplican al final.
+        self._changed: Optional[Dict[str, Optional[Dict[str, Any]]]] = None
+        self._loaded = False
+        self._loaded_at = 0.0
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def __len__(self) -> int:
+        return len(self._scheduled)
+
+    def ensure_loaded(
+        self,
+        loader: Callable[[], Iterable[Dict[str, Any]]],
+        *,
+        not_before: Optional[datetime] = None,
+    ) -> bool:
+        """Carga la agenda si no está cargada o venció su TTL.
+
+        ``not_before`` descarta vencidas antiguas, que ya se avisaron antes
+        de reiniciar el proceso. La lectura corre fuera del lock, así que
+        los hooks no esperan a la base; la agenda nueva se instala al final.
+        """
+
+        with self._load_lock:
+            if self._loaded and time.monotonic() - self._loaded_at < self.ttl_seconds:
+                return False
+            loaded_at = time.monotonic()
+            with self._lock:
+                self._changed = {}
+            try:
+                documents = list(loader())
+            except Exception:
+                with self._lock:
+                    self._changed = None
+                raise
+            with self._lock:
+                changed, self._changed = self._changed, None
+                self._heaps = {}
+                self._scheduled = {}
+                if not_before is not None:
+                    self._notified = {
+                        document_id: due_at
+                        for document_id, due_at in self._notified.items()
+                        if due_at >= not_before
+                    }
+                for document in documents:
+                    due_at = review_due_at(document)
+                    if due_at is None or (not_before is not None and due_at < not_before):
+                        continue
+                    self._apply(document)
+                for document_id, document in changed.items():
+                    if document is None:
+                        self._scheduled.pop(document_id, None)
+                    else:
+                        self._apply(document)
+                self._loaded = True
+                self._loaded_at = loaded_at
+            return True
+
+    def schedule(self, document: Optional[Dict[str, Any]]) -> None:
+        """Programa, reprograma o cancela según el estado del documento."""
+
+        if not document or document.get("id") is None:
+            return
+        with self._lock:
+            if self._changed is not None:
+                self._changed[str(document["id"])] = document
+            if self._loaded:
+                self._apply(document)
+
+    def cancel(self, document_id: Any) -> None:
+        with self._lock:
+            if self._changed is not None:
+                self._changed[str(document_id)] = None
+            self._scheduled.pop(str(document_id), None)
+
+    def next_due(self) -> Optional[datetime]:
+        with self._lock:
+            heads = [
+                self._clean_head(company_id) for company_id in list(self._heaps)
+            ]
+            return min((head[0] for head in heads if head), default=None)
+
+    def pop_due(self, now: datetime) -> List[Dict[str, Any]]:
+        """Saca las revisiones con fecha ``<= now`` de todas las empresas."""
+
+        due: List[Dict[str, Any]] = []
+        with self._lock:
+            for company_id in list(self._heaps):
+                heap = self._heaps[company_id]
+                while True:
+                    head = self._clean_head(company_id)
+                    if head is None or head[0] > now:
+                        break
+                    due_at, document_id = heapq.heappop(heap)
+                    del self._scheduled[document_id]
+                    self._notified[document_id] = due_at
+                    due.append(
+                        {
+                            "document_id": document_id,
+                            "company_id": company_id,
+                            "next_review_at": due_at,
+                        }
+                    )
+                if not heap:
+                    del self._heaps[company_id]
+        return due
+
+    def restore(self, entries: Iterable[Dict[str, Any]]) -> None:
+        """Devuelve a la agenda entradas de :meth:`pop_due` que no se pudieron
+        avisar, salvo que el documento se haya reprogramado mientras tanto."""
+
+        with self._lock:
+            for entry in entries:
+                document_id = str(entry["document_id"])
+                if self._notified.get(document_id) == entry["next_review_at"]:
+                    del self._notified[document_id]
+                if document_id in self._scheduled:
+                    continue
+                self._push(
+                    {"id": document_id, "company_id": entry.get("company_id")},
+                    entry["next_review_at"],
+                )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._heaps.clear()
+            self._scheduled.clear()
+            self._notified.clear()
+            self._loaded = False
+
+    # ------------------------------------------------------------------
+    # Internos (con el lock tomado)
+    # ------------------------------------------------------------------
+    def _apply(self, document: Dict[str, Any]) -> None:
+        document_id = str(document["id"])
+        due_at = review_due_at(document)
+        if due_at is None or document.get("active") is False:
+            self._scheduled.pop(document_id, None)
+        elif self._notified.get(document_id) != due_at:
+            self._push(document, due_at)
+
+    def _push(self, document: Dict[str, Any], due_at: datetime) -> None:
+        document_id = str(document["id"])
+        company_id = document.get("company_id") or ""
+        if self._scheduled.get(document_id) == (company_id, due_at):
+            return
+        self._scheduled[document_id] = (company_id, due_at)
+        heap = self._heaps.setdefault(company_id, [])
+        heapq.heappush(heap, (due_at, document_id))
+        if len(heap) > 64 and len(heap) > 2 * len(self._scheduled):
+            self._compact(company_id)
+
+    def _is_current(self, company_id: str, entry: HeapEntry) -> bool:
+        due_at, document_id = entry
+        return self._scheduled.get(document_id) == (company_id, due_at)
+
+    def _clean_head(self, company_id: str) -> Optional[HeapEntry]:
+        heap = self._heaps.get(company_id)
+        while heap and not self._is_current(company_id, heap[0]):
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def _compact(self, company_id: str) -> None:
+        heap = [
+            entry
+            for entry in self._heaps[company_id]
+            if self._is_current(company_id, entry)
+        ]
+        heapq.heapify(heap)
+        self._heaps[company_id] = heap
+
+
+review_schedule = ReviewSchedule(settings.REVIEW_SCHEDULE_TTL_SECONDS)
@@ -2,17 +2,60 @@
 
 from __future__ import annotations
 
-from collections import defaultdict
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+import uuid
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
 
+from app.config.settings import settings
 from app.libraries.customs.base_service import BaseService
-from app.libraries.exceptions.app_exceptions import AuthError, ValidationError
+from app.libraries.exceptions.app_exceptions import (
+    AppError,
+    AuthError,
+    NotFoundError,
+    ValidationError,
+)
+from app.libraries.utils.concurrency import run_concurrently
 from app.modules.artifact_links.api.schemas import ArtifactEntityType
 from app.modules.artifact_links.logic.services import ArtifactLinkService
+from app.modules.search.logic.index import DOCUMENT, search_index
 from app.modules.users.logic.services import UserService
+from app.services.notifications import NotificationService, notification_service
 
 from ..data.dao import DocumentDAO, DocumentReadDAO, DocumentVersionDAO
+from ..data.versioning import (
+    current_version,
+    next_version_label,
+    version_order,
+    version_sort_key,
+)
+from .compliance import ComplianceMatrix, compliance_cache
+from .reviews import review_due_at, review_schedule
+from .tags import normalize_tags, tag_index
+
+# Relaciones que puede completar el listado (parámetro ``expand``).
+DOCUMENT_EXPANSIONS: FrozenSet[str] = frozenset(
+    {"current_version", "versions", "reads", "owner"}
+)
+
+
+def parse_expand(values: Optional[Sequence[str]]) -> FrozenSet[str]:
+    """``None`` conserva el listado completo; ``none`` no expande nada."""
+
+    if values is None:
+        return DOCUMENT_EXPANSIONS
+    requested = {value.strip().lower() for value in values if value.strip()}
+    requested.discard("none")
+    unknown = requested - DOCUMENT_EXPANSIONS
+    if unknown:
+        raise ValidationError(
+            "Valor de expand no soportado",
+            details={
+                "invalid": sorted(unknown),
+                "allowed": ["none", *sorted(DOCUMENT_EXPANSIONS)],
+            },
+        )
+    return frozenset(requested)
 
 
 class DocumentService(BaseService):
@@ -23,12 +66,14 @@ class DocumentService(BaseService):
         read_dao: Optional[DocumentReadDAO] = None,
         user_service: Optional[UserService] = None,
         artifact_link_service: Optional[ArtifactLinkService] = None,
+        notifications: Optional[NotificationService] = None,
     ) -> None:
         super().__init__(document_dao or DocumentDAO())
         self.version_dao = version_dao or DocumentVersionDAO()
         self.read_dao = read_dao or DocumentReadDAO()
         self.user_service = user_service or UserService()
         self.artifact_links = artifact_link_service or ArtifactLinkService()
+        self.notifications = notifications or notification_service
 
     # ------------------------------------------------------------------
     # Helpers
@@ -50,6 +95,26 @@ class DocumentService(BaseService):
         if document.get("company_id") != company_id:
             raise AuthError("No tienes permiso para acceder a este documento")
 
+    def _current_version(self, document: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Versión vigente con una sola consulta: por puntero o por índice."""
+        version_id = document.get("current_version_id")
+        if version_id:
+            version = self.version_dao.get_by_id(version_id)
+            if version:
+                return version
+        return self.version_dao.get_last_version(document["id"])
+
+    def _tag_loader(self, company_id: str):
+        return lambda: self.dao.filter(
+            columns="id,company_id,tags,active", company_id=company_id
+        )
+
+    def _tag_company(self, profile: Dict[str, Any], company_id: Optional[str]) -> str:
+        resolved_company = self._resolve_company(profile, company_id)
+        if not resolved_company:
+            raise ValidationError("Debe indicarse una empresa para usar etiquetas")
+        return resolved_company
+
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
@@ -60,55 +125,263 @@ class DocumentService(BaseService):
         company_id: Optional[str] = None,
         process_id: Optional[str] = None,
         include_inactive: bool = False,
+        search: Optional[str] = None,
+        review_due_before: Optional[datetime] = None,
+        tags: Optional[Sequence[str]] = None,
+        expand: Optional[Sequence[str]] = None,
     ):
-        resolved_company = self._resolve_company(profile, company_id)
-        filters: Dict[str, Any] = {}
-        if resolved_company:
-            filters["company_id"] = resolved_company
-        if process_id:
-            filters["process_id"] = process_id
-        if not include_inactive:
-            filters["active"] = True
-
-        if not filters and profile.get("role") == "root":
+        expansions = parse_expand(expand)
+        filters = self._list_filters(profile, company_id, process_id, include_inactive)
+        if tags:
+            # Los IDs salen del índice de etiquetas; la base solo los trae.
+            tag_company = self._tag_company(profile, company_id)
+            document_ids = tag_index.match(
+                tag_company,
+                self._tag_loader(tag_company),
+                tags,
+                include_inactive=include_inactive,
+            )
+            if not document_ids:
+                return []
+            documents = self.dao.filter_documents(
+                filters,
+                text=search,
+                review_due_before=review_due_before,
+                ids=sorted(document_ids),
+            )
+        elif search or review_due_before is not None:
+            documents = self.dao.filter_documents(
+                filters, text=search, review_due_before=review_due_before
+            )
+        elif not filters and profile.get("role") == "root":
             documents = self.dao.get_all()
         else:
             documents = self.dao.filter(**filters)
 
-        return self._hydrate_documents(documents)
+        return self._hydrate_documents(documents, expansions)
+
+    def list_documents_version(
+        self,
+        profile: Dict[str, Any],
+        *,
+        company_id: Optional[str] = None,
+        process_id: Optional[str] = None,
+        include_inactive: bool = False,
+        search: Optional[str] = None,
+        review_due_before: Optional[datetime] = None,
+        tags: Optional[Sequence[str]] = None,
+        expand: Optional[Sequence[str]] = None,
+    ):
+        """Sonda barata de :meth:`list_documents` para GET condicionales.
+
+        Combina conteo y último ``updated_at`` de los documentos filtrados con
+        el último cambio de versiones, lecturas y contadores. Devuelve
+        ``None`` con búsqueda o vencimiento, donde no hay sonda confiable.
+        Las etiquetas no necesitan sonda propia: cambiarlas toca
+        ``updated_at`` y el filtro ya forma parte de la URL del ETag.
+        Toda expansión muestra nombres de usuario (dueño, aprobador o
+        lector) y ``user_profiles`` no tiene ``updated_at``, así que con
+        alguna expansión la sonda incluye esos nombres.
+        """
+        expansions = parse_expand(expand)
+        if search or review_due_before is not None:
+            return None
+        filters = self._list_filters(profile, company_id, process_id, include_inactive)
+        calls = [
+            lambda: self.dao.count_where(filters),
+            lambda: self.dao.latest_value("updated_at", filters),
+            lambda: self.version_dao.latest_value("created_at"),
+            lambda: self.read_dao.latest_value("read_at"),
+            lambda: self.read_dao.counters.latest_value("updated_at"),
+        ]
+        if expansions:
+            calls.append(
+                lambda: self.user_service.dao.list_display_names(
+                    filters.get("company_id")
+                )
+            )
+        return [filters, *run_concurrently(*calls)]
 
     def get_document_detail(self, document_id: str, profile: Dict[str, Any]):
         document = self.get_by_id(document_id)
         self._ensure_document_access(profile, document)
-        versions = self.version_dao.list_for_document(document_id)
-        latest_version = self.version_dao.get_last_version(document_id)
-        current_user_read = None
-        if profile.get("id"):
-            current_user_read = self.read_dao.get_user_read(
-                document_id, profile["id"],
-                latest_version.get("version") if latest_version else None,
-            )
+        user_id = profile.get("id")
+
+        # Versiones, lectura del usuario y vínculos son independientes entre sí.
+        versions, user_read, links = run_concurrently(
+            lambda: self.version_dao.list_for_document(document_id),
+            lambda: (
+                self.read_dao.get_user_read(document_id, user_id) if user_id else None
+            ),
+            lambda: self.artifact_links.list_for_loaded_entity(
+                profile, document, ArtifactEntityType.DOCUMENT
+            ),
+        )
+        latest_version = current_version(document, versions)
+        current_user_read = user_read
+        if user_read and latest_version is not None:
+            if str(user_read.get("version")) != str(latest_version.get("version")):
+                current_user_read = None
         payload = {
             **document,
             "versions": versions,
             "latest_version": latest_version,
             "current_user_read": current_user_read,
-            "links": self.artifact_links.list_for_entity(
-                profile, document_id, ArtifactEntityType.DOCUMENT
-            ),
+            "links": links,
         }
         return payload
 
+    def get_compliance_matrix(
+        self, profile: Dict[str, Any], company_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Matriz usuarios × documentos activos con el estado de lectura."""
+        resolved_company = self._resolve_company(profile, company_id)
+        if not resolved_company:
+            raise ValidationError("Debe indicarse una empresa")
+
+        cached = compliance_cache.get_payload(resolved_company)
+        if cached is not None:
+            return cached
+
+        generation = compliance_cache.generation(resolved_company)
+        users, documents = run_concurrently(
+            lambda: self.user_service.dao.list_by_company(resolved_company),
+            lambda: self.dao.filter(company_id=resolved_company, active=True),
+        )
+        document_ids = [document["id"] for document in documents]
+        versions, reads = run_concurrently(
+            lambda: self.version_dao.list_for_documents(document_ids),
+            lambda: self.read_dao.list_read_marks(document_ids),
+        )
+
+        versions_by_document: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for version in versions:
+            versions_by_document[version.get("document_id")].append(version)
+
+        current_labels: List[Optional[str]] = []
+        document_entries = []
+        for document in documents:
+            document_versions = versions_by_document.get(document["id"], [])
+            current = current_version(document, document_versions)
+            label = None
+            if current and current.get("version") is not None:
+                label = str(current["version"])
+            current_labels.append(label)
+            document_entries.append(
+                {
+                    "id": document["id"],
+                    "title": document.get("title"),
+                    "code": document.get("code"),
+                    "current_version": label,
+                }
+            )
+
+        user_entries = [
+            {
+                "id": user["id"],
+                "name": user.get("full_name") or user.get("email") or user["id"],
+                "position": user.get("position"),
+            }
+            for user in users
+            if user.get("id")
+        ]
+        matrix = ComplianceMatrix.build(
+            resolved_company, user_entries, document_entries, current_labels, reads
+        )
+        compliance_cache.put(matrix, generation)
+        return matrix.to_payload()
+
+    def list_tags(
+        self,
+        profile: Dict[str, Any],
+        company_id: Optional[str] = None,
+        *,
+        include_inactive: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Etiquetas de la empresa con la cantidad de documentos de cada una."""
+        resolved_company = self._tag_company(profile, company_id)
+        return tag_index.counts(
+            resolved_company,
+            self._tag_loader(resolved_company),
+            include_inactive=include_inactive,
+        )
+
+    def list_reads(
+        self,
+        profile: Dict[str, Any],
+        document_id: str,
+        *,
+        offset: int = 0,
+        limit: int = 50,
+    ) -> Dict[str, Any]:
+        """Historial de lecturas paginado, de la más reciente a la más antigua."""
+        document = self.get_by_id(document_id)
+        self._ensure_document_access(profile, document)
+
+        reads, total = self.read_dao.list_page(document_id, offset=offset, limit=limit)
+        user_ids = list({read.get("user_id") for read in reads if read.get("user_id")})
+        users = self.user_service.dao.get_by_ids(user_ids) if user_ids else []
+        user_lookup = {user.get("id"): user for user in users if user}
+
+        items = []
+        for read in reads:
+            user = user_lookup.get(read.get("user_id"))
+            items.append(
+                {
+                    **read,
+                    "user": (
+                        user.get("full_name") or user.get("email") or user.get("id")
+                        if user
+                        else None
+                    ),
+                    "position": user.get("position") if user else None,
+                }
+            )
+        return {"items": items, "total": total, "offset": offset, "limit": limit}
+
     # ------------------------------------------------------------------
     # Private helpers
     # ------------------------------------------------------------------
-    def _hydrate_documents(self, documents: List[Dict[str, Any]]):
+    def _list_filters(
+        self,
+        profile: Dict[str, Any],
+        company_id: Optional[str],
+        process_id: Optional[str],
+        include_inactive: bool,
+    ) -> Dict[str, Any]:
+        resolved_company = self._resolve_company(profile, company_id)
+        filters: Dict[str, Any] = {}
+        if resolved_company:
+            filters["company_id"] = resolved_company
+        if process_id:
+            filters["process_id"] = process_id
+        if not include_inactive:
+            filters["active"] = True
+        return filters
+
+    def _hydrate_documents(
+        self,
+        documents: List[Dict[str, Any]],
+        expand: FrozenSet[str] = DOCUMENT_EXPANSIONS,
+    ):
+        """Completa el listado solo con las relaciones pedidas en ``expand``.
+
+        Cada expansión omitida evita sus consultas: sin ``versions`` ni
+        ``current_version`` no se leen versiones, sin ``reads`` no se leen
+        lecturas y sin nombres que mostrar no se consultan usuarios.
+        """
         if not documents:
             return []
 
         document_ids = [doc.get("id") for doc in documents if doc.get("id")]
-        versions = self.version_dao.list_for_documents(document_ids)
-        reads = self.read_dao.list_for_documents(document_ids)
+        # Las lecturas necesitan la versión vigente para su resumen.
+        needs_current = bool({"current_version", "reads"} & expand)
+        if "versions" in expand:
+            versions = self.version_dao.list_for_documents(document_ids)
+        elif needs_current:
+            versions = self._current_versions_for(documents)
+        else:
+            versions = []
 
         versions_by_document: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
         for version in versions:
@@ -121,45 +394,38 @@ class DocumentService(BaseService):
                 version_payload["version"] = str(version_value)
             versions_by_document[document_id].append(version_payload)
 
-        def version_sort_key(item: Dict[str, Any]):
-            raw = item.get("version")
-            if raw is None:
-                return (1, "")
-            try:
-                return (0, float(str(raw)))
-            except (TypeError, ValueError):
-                return (0, str(raw))
-
         for document_id in versions_by_document:
-            versions_by_document[document_id].sort(key=version_sort_key)
-
-        reads_by_document: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
-        for read in reads:
-            document_id = read.get("document_id")
-            if not document_id:
-                continue
-            reads_by_document[document_id].append(dict(read))
+            versions_by_document[document_id].sort(key=version_order)
 
-        for document_id in reads_by_document:
-            reads_by_document[document_id].sort(
-                key=lambda item: item.get("read_at") or "",
-                reverse=True,
+        # El puntero evita recorrer versiones; sin él, la mayor numérica.
+        current_by_document = {
+            document.get("id"): current_version(
+                document, versions_by_document.get(document.get("id"), [])
             )
-
-        user_ids = {
-            value
-            for doc in documents
-            for value in [doc.get("owner_id")]
-            if value
+            for document in documents
         }
-        for version in versions:
+        read_summaries = (
+            self._read_summaries(current_by_document) if "reads" in expand else {}
+        )
+
+        user_ids = set()
+        if "owner" in expand:
+            user_ids.update(doc["owner_id"] for doc in documents if doc.get("owner_id"))
+        if "versions" in expand:
+            named_versions = versions
+        elif "current_version" in expand:
+            named_versions = [v for v in current_by_document.values() if v]
+        else:
+            named_versions = []
+        for version in named_versions:
             approved_by = version.get("approved_by")
             if approved_by:
                 user_ids.add(approved_by)
-        for read in reads:
-            user_id = read.get("user_id")
-            if user_id:
-                user_ids.add(user_id)
+        for summary in read_summaries.values():
+            for read in summary["reads"]:
+                user_id = read.get("user_id")
+                if user_id:
+                    user_ids.add(user_id)
 
         user_lookup: Dict[str, Dict[str, Any]] = {}
         if user_ids:
@@ -174,9 +440,12 @@ class DocumentService(BaseService):
         hydrated: List[Dict[str, Any]] = []
         for document in documents:
             document_id = document.get("id")
-            owner_id = document.get("owner_id")
-            owner = user_lookup.get(owner_id) if owner_id else None
-            owner_name = get_user_display_name(owner)
+            payload = {**document, "tags": normalize_tags(document.get("tags"))}
+
+            if "owner" in expand:
+                owner_id = document.get("owner_id")
+                owner = user_lookup.get(owner_id) if owner_id else None
+                payload["owner"] = get_user_display_name(owner)
 
             document_versions = []
             for version in versions_by_document.get(document_id, []):
@@ -188,41 +457,315 @@ class DocumentService(BaseService):
                         approved_user
                     )
                 document_versions.append(version_payload)
+            if "versions" in expand:
+                payload["versions"] = document_versions
+            if "current_version" in expand:
+                payload["current_version"] = current_version(document, document_versions)
 
-            current_version = document_versions[-1] if document_versions else None
-
-            document_reads = []
-            for read in reads_by_document.get(document_id, []):
-                read_payload = dict(read)
-                user_id = read_payload.get("user_id")
-                if user_id:
-                    read_user = user_lookup.get(user_id)
-                    read_payload["user"] = get_user_display_name(read_user)
-                    if read_user:
-                        read_payload["position"] = read_user.get("position")
-                document_reads.append(read_payload)
-
-            tags_value = document.get("tags")
-            if tags_value is None:
-                tags = []
-            elif isinstance(tags_value, list):
-                tags = tags_value
-            else:
-                tags = [tags_value]
-
-            hydrated.append(
-                {
-                    **document,
-                    "tags": tags,
-                    "owner": owner_name,
-                    "current_version": current_version,
-                    "versions": document_versions,
-                    "reads": document_reads,
+            if "reads" in expand:
+                summary = read_summaries.get(document_id) or {
+                    "reads": [],
+                    "total_readers": 0,
+                    "current_version_readers": 0,
+                }
+                document_reads = []
+                for read in summary["reads"]:
+                    read_payload = dict(read)
+                    user_id = read_payload.get("user_id")
+                    if user_id:
+                        read_user = user_lookup.get(user_id)
+                        read_payload["user"] = get_user_display_name(read_user)
+                        if read_user:
+                            read_payload["position"] = read_user.get("position")
+                    document_reads.append(read_payload)
+                payload["reads"] = document_reads
+                payload["read_summary"] = {
+                    "total_readers": summary["total_readers"],
+                    "current_version_readers": summary["current_version_readers"],
                 }
-            )
+
+            hydrated.append(payload)
 
         return hydrated
 
+    def _current_versions_for(
+        self, documents: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Solo las versiones vigentes: por puntero y, sin él, todas las del
+        documento para elegir la mayor."""
+        pointers = [
+            doc["current_version_id"]
+            for doc in documents
+            if doc.get("current_version_id")
+        ]
+        without_pointer = [
+            doc["id"]
+            for doc in documents
+            if doc.get("id") and not doc.get("current_version_id")
+        ]
+        pointed, listed = run_concurrently(
+            lambda: self.version_dao.get_by_ids(pointers),
+            lambda: self.version_dao.list_for_documents(without_pointer),
+        )
+        found = {version.get("id") for version in pointed}
+        # Punteros rotos: se vuelve a la mayor versión del documento.
+        missing = [
+            doc["id"]
+            for doc in documents
+            if doc.get("current_version_id") and doc["current_version_id"] not in found
+        ]
+        if missing:
+            listed = [*listed, *self.version_dao.list_for_documents(missing)]
+        return [*pointed, *listed]
+
+    def _read_summaries(
+        self, current_by_document: Dict[str, Optional[Dict[str, Any]]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Agregados de lectura acotados por documento.
+
+        Los totales salen de ``document_read_counters`` y las últimas
+        ``DOCUMENT_LIST_RECENT_READS`` lecturas de todos los documentos de
+        una sola consulta, ambas en paralelo; el historial completo se
+        consulta paginado con :meth:`list_reads`.
+        """
+        recent_limit = max(0, settings.DOCUMENT_LIST_RECENT_READS)
+        document_ids = [key for key in current_by_document if key]
+        counters, recent = run_concurrently(
+            lambda: self.read_dao.counters.list_for_documents(document_ids),
+            lambda: self.read_dao.list_recent_for_documents(document_ids, recent_limit),
+        )
+
+        readers_by_document: Dict[str, Dict[str, int]] = defaultdict(dict)
+        for counter in counters:
+            readers_by_document[counter.get("document_id")][
+                str(counter.get("version"))
+            ] = int(counter.get("readers") or 0)
+
+        summaries: Dict[str, Dict[str, Any]] = {}
+        for document_id in document_ids:
+            readers = readers_by_document.get(document_id, {})
+            current = current_by_document[document_id]
+            label = current.get("version") if current else None
+            summaries[document_id] = {
+                "reads": recent.get(document_id, []),
+                "total_readers": sum(readers.values()),
+                "current_version_readers": (
+                    readers.get(str(label), 0) if label is not None else 0
+                ),
+            }
+        return summaries
+
+    def reconcile_read_counters(self, batch_size: int = 200) -> Dict[str, int]:
+        """Recalcula ``document_read_counters`` desde ``document_reads``.
+
+        Corrige desvíos de los ajustes incrementales (escrituras concurrentes
+        entre instancias, lecturas importadas o borradas a mano).
+        """
+        documents = self.dao.get_all(columns="id")
+        document_ids = [document["id"] for document in documents if document.get("id")]
+        corrected = 0
+        for start in range(0, len(document_ids), batch_size):
+            batch = document_ids[start : start + batch_size]
+            reads, counters = run_concurrently(
+                lambda: self.read_dao.list_read_marks(batch),
+                lambda: self.read_dao.counters.list_for_documents(batch),
+            )
+            counts: Dict[str, Counter] = defaultdict(Counter)
+            for read in reads:
+                if read.get("version") is not None:
+                    counts[read.get("document_id")][str(read["version"])] += 1
+            stored: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+            for counter in counters:
+                stored[counter.get("document_id")].append(counter)
+            for document_id in batch:
+                changed = self.read_dao.counters.replace_for_document(
+                    document_id,
+                    dict(counts.get(document_id, {})),
+                    stored.get(document_id, []),
+                )
+                if changed:
+                    corrected += 1
+        return {"documents": len(document_ids), "corrected": corrected}
+
+    def notify_due_reviews(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Avisa al responsable de cada documento cuya revisión venció.
+
+        Las fechas salen de :data:`review_schedule`; la base solo se consulta
+        para los documentos vencidos, para confirmar que la fecha no cambió
+        y obtener su responsable.
+        """
+        now = now or datetime.now(timezone.utc)
+        review_schedule.ensure_loaded(
+            self.dao.list_review_schedule,
+            not_before=now - timedelta(hours=settings.REVIEW_NOTIFY_LOOKBACK_HOURS),
+        )
+        due = review_schedule.pop_due(now)
+        if not due:
+            return {"due": 0, "notified": 0}
+
+        pending = {entry["document_id"]: entry for entry in due}
+        try:
+            notified = self._notify_reviews(pending)
+        except Exception:
+            # Lo que no llegó a avisarse vuelve a la agenda para el próximo ciclo.
+            review_schedule.restore(pending.values())
+            raise
+        return {"due": len(due), "notified": notified}
+
+    def _notify_reviews(self, pending: Dict[str, Dict[str, Any]]) -> int:
+        """Avisa las revisiones de ``pending`` y las quita a medida que quedan
+        resueltas (avisadas, o descartadas porque la fecha ya no aplica)."""
+
+        documents = self.dao.filter_documents({}, ids=list(pending))
+        documents = [
+            document
+            for document in documents
+            if document.get("active") is not False
+            and review_due_at(document)
+            == pending[str(document["id"])]["next_review_at"]
+        ]
+        owner_ids = list({doc["owner_id"] for doc in documents if doc.get("owner_id")})
+        owners = self.user_service.dao.get_by_ids(owner_ids) if owner_ids else []
+        owner_lookup = {owner.get("id"): owner for owner in owners if owner}
+        due_by_document = dict(pending)
+        notify = {str(document["id"]) for document in documents}
+        for document_id in list(pending):
+            if document_id not in notify:
+                del pending[document_id]
+
+        notified = 0
+        for document in documents:
+            document_id = str(document["id"])
+            owner = owner_lookup.get(document.get("owner_id"))
+            if not owner:
+                del pending[document_id]
+                continue
+            name = " ".join(
+                part for part in (document.get("code"), document.get("title")) if part
+            )
+            due_at = due_by_document[document_id]["next_review_at"]
+            self.notifications.notify_user(
+                owner,
+                subject=f"Revisión pendiente: {name}",
+                message=(
+                    f"La revisión del documento {name} venció el "
+                    f"{due_at:%d/%m/%Y}. Por favor, revísalo y actualiza su "
+                    "próxima fecha de revisión."
+                ),
+                metadata={"document_id": document["id"], "kind": "review_due"},
+            )
+            del pending[document_id]
+            self._record_audit(
+                action="review_due_notified",
+                entity_id=document["id"],
+                metadata={
+                    "next_review_at": due_at.isoformat(),
+                    "owner_id": owner.get("id"),
+                },
+                performed_by=None,
+            )
+            notified += 1
+        return notified
+
+    def send_read_digest(
+        self, today: Optional[date] = None, batch_size: int = 200
+    ) -> Dict[str, int]:
+        """Un aviso por usuario con sus lecturas obligatorias vencidas o por vencer.
+
+        Una lectura está pendiente si su ``due_date`` cae dentro de
+        ``READ_DIGEST_DUE_SOON_DAYS`` y la marca del usuario no corresponde a
+        la versión vigente. Los documentos activos se recorren paginados y,
+        por cada bloque de ``batch_size``, se leen sus versiones vigentes y
+        sus lecturas con vencimiento; en memoria solo quedan los pendientes.
+        """
+        today = today or datetime.now(timezone.utc).date()
+        due_until = today + timedelta(days=settings.READ_DIGEST_DUE_SOON_DAYS)
+
+        pending_by_user: Dict[str, List[Tuple[date, str, str]]] = defaultdict(list)
+        batch: List[Dict[str, Any]] = []
+        for document in self.dao.iter_active("id,code,title,current_version_id"):
+            batch.append(document)
+            if len(batch) >= batch_size:
+                self._collect_pending_reads(batch, today, due_until, pending_by_user)
+                batch = []
+        if batch:
+            self._collect_pending_reads(batch, today, due_until, pending_by_user)
+        if not pending_by_user:
+            return {"users": 0, "documents": 0, "notified": 0}
+
+        user_ids = list(pending_by_user)
+        users = []
+        for start in range(0, len(user_ids), 200):
+            users.extend(self.user_service.dao.get_by_ids(user_ids[start : start + 200]))
+
+        notified = 0
+        for user in users:
+            if not user or user.get("id") not in pending_by_user:
+                continue
+            lines = [line for _, _, line in sorted(pending_by_user[user["id"]])]
+            self.notifications.notify_user(
+                user,
+                subject=f"Tienes {len(lines)} lecturas obligatorias pendientes",
+                message="Documentos pendientes de lectura:\n" + "\n".join(lines),
+                metadata={"kind": "read_digest", "documents": len(lines)},
+            )
+            notified += 1
+        return {
+            "users": len(pending_by_user),
+            "documents": sum(len(lines) for lines in pending_by_user.values()),
+            "notified": notified,
+        }
+
+    def _collect_pending_reads(
+        self,
+        documents: List[Dict[str, Any]],
+        today: date,
+        due_until: date,
+        pending_by_user: Dict[str, List[Tuple[date, str, str]]],
+    ) -> None:
+        """Agrega a ``pending_by_user`` las lecturas pendientes de ``documents``."""
+        current: Dict[str, Dict[str, Any]] = {}
+        for version in self._current_versions_for(documents):
+            document_id = version.get("document_id")
+            best = current.get(document_id)
+            if best is None or version_order(version) > version_order(best):
+                current[document_id] = version
+        current_labels = {
+            document_id: str(version.get("version"))
+            for document_id, version in current.items()
+        }
+
+        due_dates: Dict[Tuple[str, str], date] = {}
+        read_current = set()
+        marks = self.read_dao.list_due_marks(
+            list(current_labels), due_until.isoformat()
+        )
+        for mark in marks:
+            key = (mark.get("document_id"), mark.get("user_id"))
+            label = current_labels.get(key[0])
+            if label is None or not key[1]:
+                continue
+            due_dates[key] = date.fromisoformat(str(mark["due_date"])[:10])
+            if str(mark.get("version")) == label:
+                read_current.add(key)
+
+        by_id = {document["id"]: document for document in documents}
+        for document_id, user_id in set(due_dates) - read_current:
+            document = by_id[document_id]
+            due_date = due_dates[(document_id, user_id)]
+            name = " ".join(
+                part for part in (document.get("code"), document.get("title")) if part
+            )
+            state = "venció" if due_date < today else "vence"
+            pending_by_user[user_id].append(
+                (
+                    due_date,
+                    document_id,
+                    f"- {name} (v{current_labels[document_id]}): "
+                    f"{state} el {due_date:%d/%m/%Y}",
+                )
+            )
+
     def create_document(
         self,
         profile: Dict[str, Any],
@@ -243,16 +786,176 @@ class DocumentService(BaseService):
             performed_by=profile.get("id"),
             audit_metadata={"company_id": company_id},
         )
+        compliance_cache.invalidate(company_id)
+        search_index.upsert(DOCUMENT, created)
+        tag_index.upsert(created)
+        review_schedule.schedule(created)
 
         if initial_version:
             version_payload = {**initial_version, "document_id": created["id"]}
             created_version = self._create_version_internal(
-                profile, created, version_payload
+                profile, created, version_payload, new_document=True
             )
             created["latest_version"] = created_version
             created["versions"] = [created_version]
         return created
 
+    def create_documents_bulk(
+        self, profile: Dict[str, Any], items: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Alta masiva de documentos con su versión inicial.
+
+        Los permisos se validan una vez por empresa y documentos y versiones
+        se insertan en lotes de ``DOCUMENT_BULK_CHUNK_SIZE``. La clave foránea
+        ``current_version_id`` no es diferible: cada lote inserta los
+        documentos sin puntero, luego sus versiones y al final asigna todos
+        los punteros con una sola escritura. Un lote que falla marca solo
+        sus ítems; el resultado informa el estado de cada ``client_id``.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+
+        def fail(position: int, error: str, details: Optional[dict] = None):
+            results[position] = {
+                "client_id": items[position]["client_id"],
+                "status": "failed",
+                "error": error,
+                "details": details,
+            }
+
+        companies: Dict[Optional[str], Any] = {}
+        seen_client_ids = set()
+        pending: List[Tuple[int, Dict[str, Any], Optional[Dict[str, Any]]]] = []
+        for position, item in enumerate(items):
+            if item["client_id"] in seen_client_ids:
+                fail(position, "clientId duplicado en la solicitud")
+                continue
+            seen_client_ids.add(item["client_id"])
+
+            requested = item.get("company_id")
+            if requested not in companies:
+                try:
+                    company_id = self._resolve_company(profile, requested)
+                    if not company_id:
+                        raise ValidationError(
+                            "Debe indicarse una empresa para el documento"
+                        )
+                    companies[requested] = company_id
+                except AppError as error:
+                    companies[requested] = error
+            company = companies[requested]
+            if isinstance(company, AppError):
+                fail(position, company.message, company.details or None)
+                continue
+
+            data = {
+                key: value
+                for key, value in item.items()
+                if key not in {"client_id", "initial_version"}
+            }
+            document_row = {
+                **data,
+                "id": str(uuid.uuid4()),
+                "company_id": company,
+                "active": data.get("active", True),
+            }
+            version_row = None
+            if item.get("initial_version") is not None:
+                version_row = {**item["initial_version"], "id": str(uuid.uuid4())}
+                if version_row.get("version") is None:
+                    version_row["version"] = next_version_label(None)
+                version_row["version"] = str(version_row["version"])
+                version_row["version_sort_key"] = version_sort_key(
+                    version_row["version"]
+                )
+                version_row["document_id"] = document_row["id"]
+                version_row.setdefault("status", "borrador")
+                version_row.setdefault("created_at", datetime.utcnow())
+            pending.append((position, document_row, version_row))
+
+        created_documents: List[Dict[str, Any]] = []
+        chunk_size = max(1, settings.DOCUMENT_BULK_CHUNK_SIZE)
+        for start in range(0, len(pending), chunk_size):
+            chunk = pending[start : start + chunk_size]
+            try:
+                documents = self.dao.insert_many([row for _, row, _ in chunk])
+            except AppError as error:
+                for position, _, _ in chunk:
+                    fail(position, error.message, error.details or None)
+                continue
+            documents_by_id = {document["id"]: document for document in documents}
+
+            version_rows = [row for _, _, row in chunk if row is not None]
+            versions_by_document: Dict[str, Dict[str, Any]] = {}
+            failure: Optional[Tuple[str, AppError]] = None
+            try:
+                for version in self.version_dao.insert_many(version_rows):
+                    versions_by_document[version["document_id"]] = version
+            except AppError as error:
+                failure = ("Versión inicial no creada", error)
+            if version_rows and failure is None:
+                pointers = [
+                    {
+                        **documents_by_id.get(document_row["id"], document_row),
+                        "current_version_id": version_row["id"],
+                    }
+                    for _, document_row, version_row in chunk
+                    if version_row is not None
+                ]
+                try:
+                    self.dao.set_current_versions(pointers)
+                except AppError as error:
+                    # Sin puntero, la lectura cae a la mayor versión existente.
+                    failure = ("Versión vigente no asignada", error)
+
+            for position, document_row, version_row in chunk:
+                document = documents_by_id.get(document_row["id"], document_row)
+                if version_row is not None and failure is None:
+                    document["current_version_id"] = version_row["id"]
+                result = {
+                    "client_id": items[position]["client_id"],
+                    "status": "created",
+                    "document": {**document, "versions": [], "latest_version": None},
+                }
+                if version_row is not None and failure is not None:
+                    label, error = failure
+                    result.update(
+                        status="partial",
+                        error=f"{label}: {error.message}",
+                        details=error.details or None,
+                    )
+                elif version_row is not None:
+                    version = versions_by_document.get(document["id"], version_row)
+                    result["document"].update(
+                        versions=[version], latest_version=version
+                    )
+                results[position] = result
+                created_documents.append(document)
+
+        touched_companies = {document.get("company_id") for document in created_documents}
+        for company_id in touched_companies:
+            compliance_cache.invalidate(company_id)
+        for document in created_documents:
+            search_index.upsert(DOCUMENT, document)
+            tag_index.upsert(document)
+            review_schedule.schedule(document)
+        if created_documents:
+            self._record_audit(
+                action="create_bulk",
+                entity_id=None,
+                metadata={
+                    "documents": [document["id"] for document in created_documents],
+                    "requested": len(items),
+                },
+                performed_by=profile.get("id"),
+            )
+
+        created = sum(1 for result in results if result["status"] != "failed")
+        return {
+            "created": created,
+            "failed": len(items) - created,
+            "results": results,
+        }
+
     def update_document(
         self,
         profile: Dict[str, Any],
@@ -265,21 +968,36 @@ class DocumentService(BaseService):
         if updates.get("company_id") and profile.get("role") != "root":
             raise AuthError("Solo un usuario root puede cambiar la empresa")
 
-        return self.update(
+        updated = self.update(
             document_id,
-            updates,
+            # ``updated_at`` alimenta los ETags del listado.
+            {**updates, "updated_at": datetime.utcnow()},
             performed_by=profile.get("id"),
             audit_metadata={"updated_fields": list(updates.keys())},
         )
+        if {"active", "company_id", "title", "code"} & updates.keys():
+            compliance_cache.invalidate(document.get("company_id"))
+            if updates.get("company_id"):
+                compliance_cache.invalidate(updates["company_id"])
+        search_index.move(DOCUMENT, document.get("company_id"), updated)
+        tag_index.upsert(updated, document.get("company_id"))
+        if {"next_review_at", "active", "company_id"} & updates.keys():
+            review_schedule.schedule(updated)
+        return updated
 
     def delete_document(self, profile: Dict[str, Any], document_id: str):
         document = self.get_by_id(document_id)
         self._ensure_document_access(profile, document)
-        return self.delete(
+        deleted = self.delete(
             document_id,
             performed_by=profile.get("id"),
             audit_metadata={"code": document.get("code")},
         )
+        compliance_cache.invalidate(document.get("company_id"))
+        search_index.remove(document.get("company_id"), DOCUMENT, document_id)
+        tag_index.remove(document.get("company_id"), document_id)
+        review_schedule.cancel(document_id)
+        return deleted
 
     def create_version(
         self,
@@ -297,16 +1015,26 @@ class DocumentService(BaseService):
         profile: Dict[str, Any],
         document: Dict[str, Any],
         payload: Dict[str, Any],
+        *,
+        new_document: bool = False,
     ):
+        # Un documento recién creado todavía no tiene versiones que consultar.
+        last_version = None if new_document else self._current_version(document)
         if "version" not in payload or payload["version"] is None:
-            last_version = self.version_dao.get_last_version(document["id"])
-            next_version = (last_version.get("version") if last_version else 0) + 1
-            payload["version"] = next_version
+            payload["version"] = next_version_label(last_version)
+        payload["version"] = str(payload["version"])
+        payload["version_sort_key"] = version_sort_key(payload["version"])
 
         payload.setdefault("status", "borrador")
         payload.setdefault("created_at", datetime.utcnow())
 
         created = self.version_dao.insert(payload)
+        if last_version is None or version_order(created) >= version_order(last_version):
+            self.dao.update(document["id"], {"current_version_id": created.get("id")})
+            document["current_version_id"] = created.get("id")
+            compliance_cache.apply_current_version(
+                document.get("company_id"), document["id"], created.get("version")
+            )
         self._record_audit(
             action="create_version",
             entity_id=document.get("id"),
@@ -329,7 +1057,7 @@ class DocumentService(BaseService):
 
         version_number = payload.get("version")
         if version_number is None:
-            latest = self.version_dao.get_last_version(document_id)
+            latest = self._current_version(document)
             if not latest:
                 raise ValidationError("El documento no posee versiones publicadas")
             version_number = latest.get("version")
@@ -342,6 +1070,9 @@ class DocumentService(BaseService):
             "due_date": payload.get("due_date"),
         }
         recorded = self.read_dao.upsert_read(read_data)
+        compliance_cache.apply_read(
+            document.get("company_id"), document_id, profile.get("id"), version_number
+        )
         self._record_audit(
             action="document_read",
             entity_id=document_id,
@@ -349,3 +1080,75 @@ class DocumentService(BaseService):
             performed_by=profile.get("id"),
         )
         return recorded
+
+    def record_reads_bulk(
+        self,
+        profile: Dict[str, Any],
+        document_ids: Sequence[str],
+        payload: Dict[str, Any],
+    ) -> List[Dict[str, Any]]:
+        """Registra la lectura de la versión vigente de varios documentos.
+
+        Los documentos se cargan con una consulta y de las versiones solo
+        las vigentes, por ``current_version_id`` (las de documentos sin
+        puntero se listan para elegir la mayor). Las lecturas se escriben
+        con un único ``upsert`` y queda un solo registro de auditoría. Si
+        algún documento falla la validación no se registra ninguno.
+        """
+        document_ids = list(dict.fromkeys(document_ids))
+        documents = self.dao.filter_documents({}, ids=document_ids)
+        found = {document["id"]: document for document in documents}
+        missing = [
+            document_id for document_id in document_ids if document_id not in found
+        ]
+        if missing:
+            raise NotFoundError("Documentos no encontrados", details={"ids": missing})
+        for document in documents:
+            self._ensure_document_access(profile, document)
+
+        versions_by_document: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for version in self._current_versions_for(documents):
+            versions_by_document[version.get("document_id")].append(version)
+        labels: Dict[str, str] = {}
+        for document_id in document_ids:
+            current = current_version(
+                found[document_id], versions_by_document[document_id]
+            )
+            if current and current.get("version") is not None:
+                labels[document_id] = str(current["version"])
+        without_versions = [
+            document_id for document_id in document_ids if document_id not in labels
+        ]
+        if without_versions:
+            raise ValidationError(
+                "Hay documentos sin versiones publicadas",
+                details={"ids": without_versions},
+            )
+
+        user_id = profile.get("id")
+        read_at = payload.get("read_at") or datetime.utcnow()
+        rows = [
+            {
+                "document_id": document_id,
+                "user_id": user_id,
+                "version": labels[document_id],
+                "read_at": read_at,
+                "due_date": payload.get("due_date"),
+            }
+            for document_id in document_ids
+        ]
+        recorded = self.read_dao.upsert_reads(rows)
+        for document_id in document_ids:
+            compliance_cache.apply_read(
+                found[document_id].get("company_id"),
+                document_id,
+                user_id,
+                labels[document_id],
+            )
+        self._record_audit(
+            action="document_read_bulk",
+            entity_id=None,
+            metadata={"versions": labels},
+            performed_by=user_id,
+        )
+        return recorded
@@ -0,0 +1,226 @@
+"""Índice de etiquetas por empresa: etiqueta → IDs de documentos.
+
+Responde el filtro ``?tags=`` del listado y los conteos de
+``/documents/tags`` desde memoria, sin recorrer la tabla ``documents``.
+Las etiquetas se comparan sin distinguir mayúsculas ni tildes
+(``"Calidad"`` y ``"calidad"`` son la misma) y se muestran con la
+primera forma vista.
+
+Como el índice de búsqueda, cada partición se construye la primera vez que
+se consulta la empresa y luego la mantiene :class:`DocumentService`. Los
+cambios hechos por otra instancia no llegan a esos hooks, así que cada
+partición se reconstruye al vencer ``TAG_INDEX_TTL_SECONDS``. La lectura de
+la empresa corre fuera del lock del registro, como en el índice de búsqueda:
+mientras tanto las consultas usan la partición anterior y los hooks se
+reaplican sobre la nueva antes de instalarla.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.config.settings import settings
+from app.modules.search.logic.index import fold_text
+
+
+def normalize_tags(value: Any) -> List[str]:
+    """Lista de etiquetas de un documento (la columna puede venir como texto)."""
+
+    if value is None:
+        return []
+    items = value if isinstance(value, (list, tuple, set)) else [value]
+    tags: List[str] = []
+    for item in items:
+        if item is None:
+            continue
+        text = " ".join(str(item).split())
+        if text and text not in tags:
+            tags.append(text)
+    return tags
+
+
+def tag_key(tag: str) -> str:
+    return fold_text(" ".join(tag.split()))
+
+
+class CompanyTagIndex:
+    def __init__(self) -> None:
+        self.postings: Dict[str, Set[str]] = defaultdict(set)
+        self.active_postings: Dict[str, Set[str]] = defaultdict(set)
+        self.labels: Dict[str, str] = {}
+        self.documents: Dict[str, Tuple[Tuple[str, ...], bool]] = {}
+        self.built_at = time.monotonic()
+
+    def add(self, document: Dict[str, Any]) -> None:
+        document_id = str(document["id"])
+        self.remove(document_id)
+        active = document.get("active", True) is not False
+        keys = []
+        for tag in normalize_tags(document.get("tags")):
+            key = tag_key(tag)
+            if not key or key in keys:
+                continue
+            keys.append(key)
+            self.labels.setdefault(key, tag)
+            self.postings[key].add(document_id)
+            if active:
+                self.active_postings[key].add(document_id)
+        self.documents[document_id] = (tuple(keys), active)
+
+    def remove(self, document_id: str) -> None:
+        previous = self.documents.pop(str(document_id), None)
+        if previous is None:
+            return
+        keys, _ = previous
+        for key in keys:
+            for postings in (self.postings, self.active_postings):
+                ids = postings.get(key)
+                if ids is None:
+                    continue
+                ids.discard(str(document_id))
+                if not ids:
+                    del postings[key]
+            if key not in self.postings:
+                self.labels.pop(key, None)
+
+    def match(self, tags: Iterable[str], *, include_inactive: bool) -> Set[str]:
+        """IDs con todas las ``tags`` (intersección, empezando por la menor)."""
+
+        postings = self.postings if include_inactive else self.active_postings
+        sets = [postings.get(tag_key(tag), set()) for tag in tags]
+        if not sets:
+            return set()
+        sets.sort(key=len)
+        result = set(sets[0])
+        for ids in sets[1:]:
+            result &= ids
+            if not result:
+                break
+        return result
+
+    def counts(self, *, include_inactive: bool) -> List[Dict[str, Any]]:
+        postings = self.postings if include_inactive else self.active_postings
+        items = [
+            {"tag": self.labels[key], "count": len(ids)}
+            for key, ids in postings.items()
+            if ids
+        ]
+        items.sort(key=lambda item: (-item["count"], tag_key(item["tag"])))
+        return items
+
+
+class TagIndexRegistry:
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.RLock()
+        self._partitions: Dict[str, CompanyTagIndex] = {}
+        self._build_locks: Dict[str, threading.Lock] = {}
+        self._generations: Dict[str, int] = defaultdict(int)
+        # Cambios de los hooks durante cada carga: (id, documento o None).
+        self._changes: Dict[str, List[Tuple[str, Optional[Dict[str, Any]]]]] = {}
+
+    def partition(
+        self,
+        company_id: str,
+        loader: Callable[[], Iterable[Dict[str, Any]]],
+    ) -> CompanyTagIndex:
+        with self._lock:
+            index = self._partitions.get(company_id)
+            if index is not None and not self._expired(index):
+                return index
+            build_lock = self._build_locks.setdefault(company_id, threading.Lock())
+        if not build_lock.acquire(blocking=index is None):
+            return index
+        try:
+            with self._lock:
+                current = self._partitions.get(company_id)
+                if current is not None and not self._expired(current):
+                    return current
+                generation = self._generations[company_id]
+                self._changes[company_id] = []
+            fresh = CompanyTagIndex()
+            try:
+                for document in loader():
+                    if document.get("id") is not None:
+                        fresh.add(document)
+            finally:
+                with self._lock:
+                    changes = self._changes.pop(company_id)
+            with self._lock:
+                for document_id, document in changes:
+                    if document is None:
+                        fresh.remove(document_id)
+                    else:
+                        fresh.add(document)
+                if self._generations[company_id] == generation:
+                    self._partitions[company_id] = fresh
+            return fresh
+        finally:
+            build_lock.release()
+
+    def match(
+        self,
+        company_id: str,
+        loader: Callable[[], Iterable[Dict[str, Any]]],
+        tags: Iterable[str],
+        *,
+        include_inactive: bool,
+    ) -> Set[str]:
+        index = self.partition(company_id, loader)
+        with self._lock:
+            return index.match(tags, include_inactive=include_inactive)
+
+    def counts(
+        self,
+        company_id: str,
+        loader: Callable[[], Iterable[Dict[str, Any]]],
+        *,
+        include_inactive: bool,
+    ) -> List[Dict[str, Any]]:
+        index = self.partition(company_id, loader)
+        with self._lock:
+            return index.counts(include_inactive=include_inactive)
+
+    def upsert(
+        self, document: Optional[Dict[str, Any]], previous_company: Optional[str] = None
+    ) -> None:
+        if not document or document.get("id") is None:
+            return
+        with self._lock:
+            company_id = document.get("company_id")
+            if previous_company and previous_company != company_id:
+                self.remove(previous_company, document["id"])
+            if company_id in self._changes:
+                self._changes[company_id].append((str(document["id"]), document))
+            index = self._partitions.get(company_id) if company_id else None
+            if index is not None:
+                index.add(document)
+
+    def remove(self, company_id: Optional[str], document_id: Any) -> None:
+        if not company_id:
+            return
+        with self._lock:
+            if company_id in self._changes:
+                self._changes[company_id].append((str(document_id), None))
+            index = self._partitions.get(company_id)
+            if index is not None:
+                index.remove(str(document_id))
+
+    def invalidate(self, company_id: Optional[str] = None) -> None:
+        with self._lock:
+            if company_id is None:
+                for key in list(self._generations):
+                    self._generations[key] += 1
+                self._partitions.clear()
+            else:
+                self._generations[company_id] += 1
+                self._partitions.pop(company_id, None)
+
+    def _expired(self, index: CompanyTagIndex) -> bool:
+        return time.monotonic() - index.built_at > self.ttl_seconds
+
+
+tag_index = TagIndexRegistry(settings.TAG_INDEX_TTL_SECONDS)
@@ -34,6 +34,9 @@ class FlowController:
         schema = FlowDetail.model_validate(record)
         return ResponseBuilder.success(schema, "Flujo obtenido")
 
+    def flow_version(self, profile: Dict, flow_id: str):
+        return self.service.flow_version(profile, flow_id)
+
     def create_flow(self, profile: Dict, payload: FlowCreate) -> ApiResponse[Flow]:
         data = payload.model_dump(exclude_unset=True)
         created = self.service.create_flow(profile, data)
@@ -4,9 +4,10 @@ from __future__ import annotations
 
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 
 from app.libraries.auth.roles import require_role
+from app.libraries.utils.etag import conditional_get
 from app.libraries.utils.response_models import ApiResponse
 
 from .controller import FlowController
@@ -34,7 +35,17 @@ async def list_flows(
 
 
 @router.get("/{flow_id}", response_model=ApiResponse[FlowDetail])
-async def get_flow(flow_id: str, profile=Depends(require_role(["root", "admin", "user"]))):
+async def get_flow(
+    flow_id: str,
+    request: Request,
+    response: Response,
+    profile=Depends(require_role(["root", "admin", "user"])),
+):
+    cached = conditional_get(
+        request, response, lambda: controller.flow_version(profile, flow_id)
+    )
+    if cached is not None:
+        return cached
     return controller.get_flow(profile, flow_id)
 
 
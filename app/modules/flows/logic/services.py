@@ -6,6 +6,8 @@ from typing import Any, Dict, List, Optional
 
 from app.libraries.customs.base_service import BaseService
 from app.libraries.exceptions.app_exceptions import AuthError, ValidationError
+from app.libraries.utils.concurrency import run_concurrently
+from app.modules.search.logic.index import FLOW_NODE, search_index
 from app.modules.users.logic.services import UserService
 
 from ..data.dao import FlowDAO, FlowEdgeDAO, FlowNodeDAO
@@ -66,6 +68,20 @@ class FlowService(BaseService):
         edges = self.edge_dao.list_for_flow(flow_id)
         return {**flow, "nodes": nodes, "edges": edges}
 
+    def flow_version(self, profile: Dict[str, Any], flow_id: str):
+        """Sonda barata de :meth:`get_flow`: la fila del flujo más conteos y
+        último ``updated_at`` de nodos y aristas, sin traerlos."""
+        flow = self.get_by_id(flow_id)
+        self._ensure_flow_access(profile, flow)
+        filters = {"flow_id": flow_id}
+        probes = run_concurrently(
+            lambda: self.node_dao.count_where(filters),
+            lambda: self.node_dao.latest_value("updated_at", filters),
+            lambda: self.edge_dao.count_where(filters),
+            lambda: self.edge_dao.latest_value("updated_at", filters),
+        )
+        return [flow, *probes]
+
     def create_flow(self, profile: Dict[str, Any], data: Dict[str, Any]):
         company_id = self._resolve_company(profile, data.get("company_id"))
         if not company_id:
@@ -86,7 +102,9 @@ class FlowService(BaseService):
         flow = self.get_by_id(flow_id)
         self._ensure_flow_access(profile, flow)
         payload = {**data, "flow_id": flow_id, "company_id": flow.get("company_id")}
-        return self.node_dao.insert(payload)
+        created = self.node_dao.insert(payload)
+        search_index.upsert(FLOW_NODE, created)
+        return created
 
     # ------------------------------------------------------------------
     # Edges
@@ -0,0 +1,35 @@
+"""Central registration of periodic background jobs."""
+
+from __future__ import annotations
+
+from app.config.settings import settings
+from app.libraries.jobs.scheduler import JobScheduler
+from app.modules.documents.logic.services import DocumentService
+
+
+def register_jobs(scheduler: JobScheduler) -> None:
+    """Register module maintenance jobs on ``scheduler``."""
+
+    # --- Documentos ---
+    documents = DocumentService()
+    if settings.READ_COUNTERS_RECONCILE_SECONDS > 0:
+        scheduler.register(
+            "reconcile_read_counters",
+            settings.READ_COUNTERS_RECONCILE_SECONDS,
+            documents.reconcile_read_counters,
+            run_on_start=True,
+        )
+    if settings.REVIEW_CHECK_SECONDS > 0:
+        # Recarga la agenda de revisiones cada REVIEW_SCHEDULE_TTL_SECONDS.
+        scheduler.register(
+            "notify_due_reviews",
+            settings.REVIEW_CHECK_SECONDS,
+            documents.notify_due_reviews,
+            run_on_start=True,
+        )
+    if settings.READ_DIGEST_SECONDS > 0:
+        scheduler.register(
+            "send_read_digest",
+            settings.READ_DIGEST_SECONDS,
+            documents.send_read_digest,
+        )
@@ -4,19 +4,29 @@ from __future__ import annotations
 
 from typing import Dict, List
 
+from fastapi.responses import StreamingResponse
+
 from app.libraries.utils.response_builder import ResponseBuilder
+from app.libraries.utils.streaming import json_array_chunks, ndjson_lines
 from app.libraries.utils.response_models import ApiResponse
 
 from ..logic.services import ProcessService
 from app.modules.artifact_links.api.schemas import ArtifactLink
 
 from .schemas import (
+    ExportFormat,
     Process,
     ProcessCreate,
     ProcessDetail,
     ProcessLinkPayload,
+    ProcessSummary,
+    ProcessTreeNode,
     ProcessUpdate,
     Task,
+    TaskBulkReassign,
+    TaskBulkReorder,
+    TaskBulkSelection,
+    TaskBulkStatus,
     TaskCreate,
     TaskLinkPayload,
     TaskUpdate,
@@ -37,6 +47,42 @@ class ProcessController:
         schema = ProcessDetail.model_validate(record)
         return ResponseBuilder.success(schema, "Proceso obtenido")
 
+    def get_process_tree(
+        self,
+        profile: Dict,
+        *,
+        company_id: str | None,
+        root_id: str | None,
+        depth: int | None,
+    ) -> ApiResponse[List[ProcessTreeNode]]:
+        nodes = self.service.get_process_tree(
+            profile, company_id=company_id, root_id=root_id, depth=depth
+        )
+        items = [ProcessTreeNode.model_validate(node) for node in nodes]
+        return ResponseBuilder.success(items, "Mapa de procesos obtenido")
+
+    def get_process_ancestors(
+        self, profile: Dict, process_id: str
+    ) -> ApiResponse[List[ProcessSummary]]:
+        path = self.service.get_process_ancestors(profile, process_id)
+        items = [ProcessSummary.model_validate(node) for node in path]
+        return ResponseBuilder.success(items, "Ancestros obtenidos")
+
+    def export_processes(
+        self, profile: Dict, company_id: str | None, export_format: ExportFormat
+    ) -> StreamingResponse:
+        records = self.service.export_process_map(profile, company_id)
+        if export_format == ExportFormat.JSON:
+            body, media_type = json_array_chunks(records), "application/json"
+        else:
+            body, media_type = ndjson_lines(records), "application/x-ndjson"
+        filename = f"procesos.{export_format.value}"
+        return StreamingResponse(
+            body,
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
+
     def create_process(self, profile: Dict, payload: ProcessCreate) -> ApiResponse[Process]:
         data = payload.model_dump(exclude_unset=True)
         created = self.service.create_process(profile, data)
@@ -83,6 +129,41 @@ class ProcessController:
         result = self.service.delete_task(profile, process_id, task_id)
         return ResponseBuilder.success(result, "Tarea eliminada")
 
+    def bulk_update_task_status(
+        self, profile: Dict, process_id: str, payload: TaskBulkStatus
+    ) -> ApiResponse[List[Task]]:
+        records = self.service.bulk_update_task_status(
+            profile, process_id, payload.task_ids, payload.status.value
+        )
+        items = [Task.model_validate(record) for record in records]
+        return ResponseBuilder.success(items, "Tareas actualizadas")
+
+    def bulk_reassign_tasks(
+        self, profile: Dict, process_id: str, payload: TaskBulkReassign
+    ) -> ApiResponse[List[Task]]:
+        records = self.service.bulk_reassign_tasks(
+            profile,
+            process_id,
+            payload.task_ids,
+            owner_id=payload.owner_id,
+            owner=payload.owner,
+        )
+        items = [Task.model_validate(record) for record in records]
+        return ResponseBuilder.success(items, "Tareas reasignadas")
+
+    def reorder_tasks(
+        self, profile: Dict, process_id: str, payload: TaskBulkReorder
+    ) -> ApiResponse[List[Task]]:
+        records = self.service.reorder_tasks(profile, process_id, payload.task_ids)
+        items = [Task.model_validate(record) for record in records]
+        return ResponseBuilder.success(items, "Tareas reordenadas")
+
+    def bulk_delete_tasks(
+        self, profile: Dict, process_id: str, payload: TaskBulkSelection
+    ) -> ApiResponse[Dict]:
+        result = self.service.bulk_delete_tasks(profile, process_id, payload.task_ids)
+        return ResponseBuilder.success(result, "Tareas eliminadas")
+
     # Links
     def list_links(self, profile: Dict, process_id: str) -> ApiResponse[List[ArtifactLink]]:
         records = self.service.list_links(profile, process_id)
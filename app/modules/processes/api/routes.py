@@ -12,12 +12,19 @@ from app.modules.artifact_links.api.schemas import ArtifactLink
 
 from .controller import ProcessController
 from .schemas import (
+    ExportFormat,
     Process,
     ProcessCreate,
     ProcessDetail,
     ProcessLinkPayload,
+    ProcessSummary,
+    ProcessTreeNode,
     ProcessUpdate,
     Task,
+    TaskBulkReassign,
+    TaskBulkReorder,
+    TaskBulkSelection,
+    TaskBulkStatus,
     TaskCreate,
     TaskLinkPayload,
     TaskUpdate,
@@ -43,6 +50,36 @@ async def create_process(
     return controller.create_process(profile, payload)
 
 
+@router.get("/tree", response_model=ApiResponse[List[ProcessTreeNode]])
+async def get_process_tree(
+    company_id: Optional[str] = Query(default=None),
+    root_id: Optional[str] = Query(
+        default=None, description="Devuelve solo el subárbol de este proceso"
+    ),
+    depth: Optional[int] = Query(
+        default=None, ge=0, description="Niveles bajo la raíz (sin límite por defecto)"
+    ),
+    profile=Depends(require_role(["root", "admin", "user"])),
+):
+    return controller.get_process_tree(
+        profile, company_id=company_id, root_id=root_id, depth=depth
+    )
+
+
+@router.get("/export")
+async def export_processes(
+    company_id: Optional[str] = Query(default=None),
+    export_format: ExportFormat = Query(
+        default=ExportFormat.NDJSON,
+        alias="format",
+        description="ndjson: un proceso por línea; json: arreglo JSON",
+    ),
+    profile=Depends(require_role(["root", "admin"])),
+):
+    """Mapa de procesos completo (tareas, vínculos, documentos y responsables)."""
+    return controller.export_processes(profile, company_id, export_format)
+
+
 @router.get("/{process_id}", response_model=ApiResponse[ProcessDetail])
 async def get_process(
     process_id: str,
@@ -51,6 +88,17 @@ async def get_process(
     return controller.get_process(profile, process_id)
 
 
+@router.get(
+    "/{process_id}/ancestors",
+    response_model=ApiResponse[List[ProcessSummary]],
+)
+async def get_process_ancestors(
+    process_id: str,
+    profile=Depends(require_role(["root", "admin", "user"])),
+):
+    return controller.get_process_ancestors(profile, process_id)
+
+
 @router.put("/{process_id}", response_model=ApiResponse[Process])
 async def update_process(
     process_id: str,
@@ -86,6 +134,54 @@ async def create_task(
     return controller.create_task(profile, process_id, payload)
 
 
+@router.post(
+    "/{process_id}/tasks/bulk/status",
+    response_model=ApiResponse[List[Task]],
+)
+async def bulk_update_task_status(
+    process_id: str,
+    payload: TaskBulkStatus,
+    profile=Depends(require_role(["root", "admin"])),
+):
+    return controller.bulk_update_task_status(profile, process_id, payload)
+
+
+@router.post(
+    "/{process_id}/tasks/bulk/reassign",
+    response_model=ApiResponse[List[Task]],
+)
+async def bulk_reassign_tasks(
+    process_id: str,
+    payload: TaskBulkReassign,
+    profile=Depends(require_role(["root", "admin"])),
+):
+    return controller.bulk_reassign_tasks(profile, process_id, payload)
+
+
+@router.post(
+    "/{process_id}/tasks/bulk/reorder",
+    response_model=ApiResponse[List[Task]],
+)
+async def reorder_tasks(
+    process_id: str,
+    payload: TaskBulkReorder,
+    profile=Depends(require_role(["root", "admin"])),
+):
+    return controller.reorder_tasks(profile, process_id, payload)
+
+
+@router.post(
+    "/{process_id}/tasks/bulk/delete",
+    response_model=ApiResponse[dict],
+)
+async def bulk_delete_tasks(
+    process_id: str,
+    payload: TaskBulkSelection,
+    profile=Depends(require_role(["root", "admin"])),
+):
+    return controller.bulk_delete_tasks(profile, process_id, payload)
+
+
 @router.put(
     "/{process_id}/tasks/{task_id}",
     response_model=ApiResponse[Task],
@@ -6,7 +6,7 @@ from datetime import datetime
 from enum import Enum
 from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.modules.artifact_links.api.schemas import ArtifactEntityType, ArtifactLink
 
@@ -19,6 +19,11 @@ class TaskStatus(str, Enum):
     VIGENTE = "vigente"
 
 
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    JSON = "json"
+
+
 class MaturityLabels(str, Enum):
     ESTABLECIDO = "establecido"
     EN_MEJORA = "en_mejora"
@@ -101,6 +106,9 @@ class TaskBase(BaseModel):
         default=None, description="Documentos vinculados con la tarea"
     )
     status: Optional[TaskStatus] = TaskStatus.BORRADOR
+    order_index: Optional[int] = Field(
+        default=None, description="Posición de la tarea dentro del proceso"
+    )
 
 
 class TaskCreate(TaskBase):
@@ -118,9 +126,37 @@ class TaskUpdate(BaseModel):
     owner: Optional[str] = None
     related_documents: Optional[List[str]] = None
     status: Optional[str] = None
+    order_index: Optional[int] = None
     updated_at: Optional[datetime] = None
 
 
+class TaskBulkSelection(BaseModel):
+    task_ids: List[str] = Field(
+        ...,
+        alias="taskIds",
+        min_length=1,
+        max_length=500,
+        description="Tareas a modificar",
+    )
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class TaskBulkStatus(TaskBulkSelection):
+    status: TaskStatus
+
+
+class TaskBulkReassign(TaskBulkSelection):
+    owner_id: Optional[str] = Field(
+        default=None, description="Nuevo responsable; vacío para quitarlo"
+    )
+    owner: Optional[str] = Field(default=None, description="Nombre del responsable")
+
+
+class TaskBulkReorder(TaskBulkSelection):
+    """Las tareas indicadas pasan al principio en ese orden; el resto las sigue."""
+
+
 class Task(TaskBase):
     id: str
     company_id: str
@@ -150,3 +186,18 @@ class TaskLinkPayload(ProcessLinkPayload):
 class ProcessDetail(Process):
     tasks: List[Task] = Field(default_factory=list)
     links: List[ArtifactLink] = Field(default_factory=list)
+
+
+class ProcessSummary(BaseModel):
+    id: str
+    code: Optional[str] = None
+    name: Optional[str] = None
+    area: Optional[str] = None
+    owner_id: Optional[str] = None
+    parent_id: Optional[str] = None
+
+
+class ProcessTreeNode(ProcessSummary):
+    children: List["ProcessTreeNode"] = Field(default_factory=list)
+
+    model_config = ConfigDict(from_attributes=True)
@@ -2,22 +2,107 @@
 
 from __future__ import annotations
 
-from typing import Dict
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Sequence, Tuple
 
 from app.libraries.customs.supabase_dao import CustomSupabaseDAO
+from app.libraries.exceptions.app_exceptions import DataAccessError
+
+logger = logging.getLogger(__name__)
 
 
 class ProcessDAO(CustomSupabaseDAO):
     def __init__(self) -> None:
         super().__init__("processes")
 
+    def get_by_ids(self, process_ids: Sequence[str]):
+        if not process_ids:
+            return []
+        query = self._build_select_query().in_("id", list(process_ids))
+        return self._execute(query, "get_processes_by_ids")
+
 
 class TaskDAO(CustomSupabaseDAO):
+    # ``False`` cuando la base todavía no tiene ``tasks.order_index`` (ver
+    # ``doc/plan_fases_qms.md``); hasta aplicar la migración se lista sin
+    # orden, como antes.
+    _has_order_index = True
+
     def __init__(self) -> None:
         super().__init__("tasks")
 
     def list_for_process(self, process_id: str):
-        data = self.filter(process_id=process_id)
-        return data
+        return self._list_ordered(
+            lambda: self._build_select_query().eq("process_id", process_id),
+            "list_for_process",
+        )
+
+    def list_for_processes(self, process_ids: Sequence[str]):
+        if not process_ids:
+            return []
+        return self._list_ordered(
+            lambda: self._build_select_query().in_("process_id", list(process_ids)),
+            "list_tasks_for_processes",
+        )
+
+    def get_by_ids(self, task_ids: Sequence[str], *, columns=None):
+        if not task_ids:
+            return []
+        query = self._build_select_query(columns).in_("id", list(task_ids))
+        return self._execute(query, "get_tasks_by_ids")
+
+    def update_many(self, task_ids: Sequence[str], payload: Dict):
+        """Aplica el mismo cambio a varias tareas en una sola consulta."""
+        query = self.table.update(self._serialize_payload(payload)).in_(
+            "id", list(task_ids)
+        )
+        return self._execute(query, "update_tasks")
+
+    def set_order_indexes(
+        self, positions: Sequence[Tuple[str, int]], updated_at: datetime
+    ) -> List[Dict]:
+        """Escribe ``order_index`` de varias tareas con un único ``upsert``.
+
+        Las filas solo llevan ``id``, ``order_index`` y ``updated_at``, así
+        que el resto de columnas queda como esté. Una tarea borrada mientras
+        tanto volvería a crearse casi vacía: esas filas (sin ``process_id``)
+        se borran de nuevo y no se devuelven.
+        """
+        if not positions:
+            return []
+        payload = [
+            self._serialize_payload(
+                {"id": task_id, "order_index": index, "updated_at": updated_at}
+            )
+            for task_id, index in positions
+        ]
+        query = self.table.upsert(payload, on_conflict="id")
+        rows = self._execute(query, "set_task_order") or []
+        recreated = [row["id"] for row in rows if row.get("process_id") is None]
+        if recreated:
+            self.delete_many(recreated)
+        return [row for row in rows if row.get("process_id") is not None]
 
+    def delete_many(self, task_ids: Sequence[str]) -> int:
+        query = self.table.delete().in_("id", list(task_ids))
+        return len(self._execute(query, "delete_tasks") or [])
 
+    def _list_ordered(self, build_query: Callable[[], Any], action: str):
+        """Tareas por ``order_index`` (sin valor al final) y luego por código."""
+        if TaskDAO._has_order_index:
+            query = (
+                build_query()
+                .order("order_index", desc=False, nullsfirst=False)
+                .order("code", desc=False)
+            )
+            try:
+                return self._execute(query, action)
+            except DataAccessError as error:
+                if "order_index" not in str(error.details.get("error", "")):
+                    raise
+                logger.warning(
+                    "tasks.order_index no existe; se listan las tareas sin orden"
+                )
+                TaskDAO._has_order_index = False
+        return self._execute(build_query(), action)
@@ -2,15 +2,41 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
 
+from app.config.settings import settings
 from app.libraries.customs.base_service import BaseService
-from app.libraries.exceptions.app_exceptions import AuthError, ValidationError
+from app.libraries.utils.concurrency import run_concurrently
+from app.libraries.exceptions.app_exceptions import (
+    AuthError,
+    NotFoundError,
+    ValidationError,
+)
 from app.modules.artifact_links.api.schemas import ArtifactEntityType
 from app.modules.artifact_links.logic.services import ArtifactLinkService
+from app.modules.documents.data.dao import DocumentDAO
+from app.modules.search.logic.index import PROCESS, search_index
 from app.modules.users.logic.services import UserService
 
 from ..data.dao import ProcessDAO, TaskDAO
+from .tree import TREE_COLUMNS, ProcessTree, process_tree_cache
+
+
+def _fetch_in_batches(
+    ids: Sequence[str],
+    fetch: Callable[[List[str]], List[Dict[str, Any]]],
+    batch_size: int,
+) -> List[Dict[str, Any]]:
+    """``fetch`` por lotes de ``batch_size`` IDs, para que ningún ``in_``
+    arme una URL de PostgREST demasiado larga."""
+
+    ids = list(ids)
+    batches = [
+        ids[start : start + batch_size] for start in range(0, len(ids), batch_size)
+    ]
+    results = run_concurrently(*[lambda batch=batch: fetch(batch) for batch in batches])
+    return [row for rows in results for row in rows]
 
 
 class ProcessService(BaseService):
@@ -20,9 +46,11 @@ class ProcessService(BaseService):
         task_dao: Optional[TaskDAO] = None,
         user_service: Optional[UserService] = None,
         artifact_link_service: Optional[ArtifactLinkService] = None,
+        document_dao: Optional[DocumentDAO] = None,
     ) -> None:
         super().__init__(process_dao or ProcessDAO())
         self.task_dao = task_dao or TaskDAO()
+        self.document_dao = document_dao or DocumentDAO()
         self.user_service = user_service or UserService()
         self.artifact_links = artifact_link_service or ArtifactLinkService()
 
@@ -52,6 +80,31 @@ class ProcessService(BaseService):
             raise ValidationError("La tarea no pertenece a este proceso")
         return task
 
+    def _ensure_tasks(self, process_id: str, task_ids: Sequence[str], *, columns=None):
+        """Como :meth:`_ensure_task` para varias tareas, con una sola consulta."""
+        task_ids = list(dict.fromkeys(task_ids))
+        found = {
+            task["id"]: task
+            for task in self.task_dao.get_by_ids(task_ids, columns=columns)
+            if task.get("process_id") == process_id
+        }
+        missing = [task_id for task_id in task_ids if task_id not in found]
+        if missing:
+            raise ValidationError(
+                "Hay tareas que no pertenecen a este proceso",
+                details={"ids": missing},
+            )
+        return [found[task_id] for task_id in task_ids]
+
+    def _process_tree(self, company_id: str, *, fresh: bool = False) -> ProcessTree:
+        """Árbol de la empresa desde la caché, o leído de la base con ``fresh``."""
+        if fresh:
+            process_tree_cache.invalidate(company_id)
+        return process_tree_cache.get(
+            company_id,
+            lambda: self.dao.filter(columns=TREE_COLUMNS, company_id=company_id),
+        )
+
     # ------------------------------------------------------------------
     # Processes
     # ------------------------------------------------------------------
@@ -69,13 +122,190 @@ class ProcessService(BaseService):
     def get_process_detail(self, profile: Dict[str, Any], process_id: str):
         process = self.get_by_id(process_id)
         self._ensure_process_access(profile, process)
-        tasks = self.task_dao.list_for_process(process_id)
-        links = self.artifact_links.list_for_entity(
-            profile, process_id, ArtifactEntityType.PROCESS
+        # Con el proceso ya cargado, tareas y vínculos van en paralelo.
+        tasks, links = run_concurrently(
+            lambda: self.task_dao.list_for_process(process_id),
+            lambda: self.artifact_links.list_for_loaded_entity(
+                profile, process, ArtifactEntityType.PROCESS
+            ),
         )
         payload = {**process, "tasks": tasks, "links": links}
         return payload
 
+    def get_process_tree(
+        self,
+        profile: Dict[str, Any],
+        *,
+        company_id: Optional[str] = None,
+        root_id: Optional[str] = None,
+        depth: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Mapa de procesos anidado, completo o desde ``root_id``."""
+        resolved_company = self._resolve_company(profile, company_id)
+        if not resolved_company:
+            raise ValidationError("Debe indicarse una empresa")
+        tree = self._process_tree(resolved_company)
+        if root_id is not None and root_id not in tree:
+            # Puede ser un alta de otra instancia todavía no reflejada.
+            tree = self._process_tree(resolved_company, fresh=True)
+        if root_id is not None and root_id not in tree:
+            raise NotFoundError("El proceso no pertenece al mapa de la empresa")
+        return tree.subtree(root_id, depth=depth)
+
+    def get_process_ancestors(
+        self, profile: Dict[str, Any], process_id: str
+    ) -> List[Dict[str, Any]]:
+        """Procesos desde la raíz del mapa hasta el padre de ``process_id``."""
+        process = self.get_by_id(process_id)
+        self._ensure_process_access(profile, process)
+        tree = self._process_tree(process["company_id"])
+        if process_id not in tree:
+            # Escritura de otra instancia todavía no reflejada en la caché.
+            tree = self._process_tree(process["company_id"], fresh=True)
+        if process_id not in tree:
+            return []
+        return tree.ancestors(process_id)
+
+    def export_process_map(
+        self, profile: Dict[str, Any], company_id: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Mapa de procesos completo de una empresa, un registro por proceso.
+
+        Los permisos se validan antes de devolver el generador. Luego se
+        recorre en preorden el árbol recién leído de la base y, por cada bloque de
+        ``PROCESS_EXPORT_CHUNK_SIZE`` procesos, se cargan procesos, tareas y
+        vínculos y después documentos y responsables con consultas ``in_``
+        de a lo sumo ese mismo tamaño; en memoria solo queda el bloque en
+        curso.
+        """
+        resolved_company = self._resolve_company(profile, company_id)
+        if not resolved_company:
+            raise ValidationError("Debe indicarse una empresa")
+        # La exportación es para auditoría: no se arriesga un árbol en caché
+        # que no incluya procesos creados en otra instancia.
+        tree = self._process_tree(resolved_company, fresh=True)
+        chunk_size = max(1, settings.PROCESS_EXPORT_CHUNK_SIZE)
+
+        def records() -> Iterator[Dict[str, Any]]:
+            chunk: List[tuple] = []
+            for entry in tree.walk():
+                chunk.append(entry)
+                if len(chunk) >= chunk_size:
+                    yield from self._export_chunk(chunk, chunk_size)
+                    chunk = []
+            if chunk:
+                yield from self._export_chunk(chunk, chunk_size)
+
+        return records()
+
+    def _export_chunk(
+        self, chunk: List[tuple], batch_size: int
+    ) -> Iterator[Dict[str, Any]]:
+        process_ids = [process_id for process_id, _ in chunk]
+        processes, tasks, process_links = run_concurrently(
+            lambda: self.dao.get_by_ids(process_ids),
+            lambda: self.task_dao.list_for_processes(process_ids),
+            lambda: self.artifact_links.dao.list_for_entities(
+                process_ids, ArtifactEntityType.PROCESS.value
+            ),
+        )
+        task_ids = [task["id"] for task in tasks if task.get("id")]
+        task_links = _fetch_in_batches(
+            task_ids,
+            lambda batch: self.artifact_links.dao.list_for_entities(
+                batch, ArtifactEntityType.TASK.value
+            ),
+            batch_size,
+        )
+
+        document_type = ArtifactEntityType.DOCUMENT.value
+        document_ids = set()
+        for link in (*process_links, *task_links):
+            for side in ("from", "to"):
+                if link.get(f"{side}_type") == document_type:
+                    document_ids.add(link.get(f"{side}_id"))
+        owner_ids = {
+            record.get("owner_id")
+            for record in (*processes, *tasks)
+            if record.get("owner_id")
+        }
+        documents, owners = run_concurrently(
+            lambda: _fetch_in_batches(
+                sorted(document_ids),
+                lambda batch: self.document_dao.filter_documents({}, ids=batch),
+                batch_size,
+            ),
+            lambda: _fetch_in_batches(
+                sorted(owner_ids), self.user_service.dao.get_by_ids, batch_size
+            ),
+        )
+        document_lookup = {
+            document["id"]: {
+                "id": document["id"],
+                "code": document.get("code"),
+                "title": document.get("title"),
+                "type": document.get("type"),
+                "active": document.get("active"),
+                "current_version_id": document.get("current_version_id"),
+            }
+            for document in documents
+        }
+        owner_names = {
+            owner.get("id"): owner.get("full_name") or owner.get("email")
+            for owner in owners
+            if owner
+        }
+
+        def links_by(entity_links: List[Dict[str, Any]]):
+            grouped: Dict[str, List[Dict[str, Any]]] = {}
+            for link in entity_links:
+                for side in ("from_id", "to_id"):
+                    grouped.setdefault(link.get(side), []).append(link)
+            return grouped
+
+        def linked_documents(links: List[Dict[str, Any]]):
+            found = []
+            for link in links:
+                for side in ("from", "to"):
+                    if link.get(f"{side}_type") != document_type:
+                        continue
+                    document = document_lookup.get(link.get(f"{side}_id"))
+                    if document is not None:
+                        found.append(
+                            {**document, "relation_type": link.get("relation_type")}
+                        )
+            return found
+
+        process_lookup = {process["id"]: process for process in processes}
+        links_for_process = links_by(process_links)
+        links_for_task = links_by(task_links)
+        tasks_for_process: Dict[str, List[Dict[str, Any]]] = {}
+        for task in tasks:
+            task_link_list = links_for_task.get(task.get("id"), [])
+            tasks_for_process.setdefault(task.get("process_id"), []).append(
+                {
+                    **task,
+                    "owner_name": owner_names.get(task.get("owner_id")),
+                    "links": task_link_list,
+                    "documents": linked_documents(task_link_list),
+                }
+            )
+
+        for process_id, depth in chunk:
+            process = process_lookup.get(process_id)
+            if process is None:
+                # Borrado después de armar el árbol.
+                continue
+            process_link_list = links_for_process.get(process_id, [])
+            yield {
+                **process,
+                "depth": depth,
+                "owner_name": owner_names.get(process.get("owner_id")),
+                "tasks": tasks_for_process.get(process_id, []),
+                "links": process_link_list,
+                "documents": linked_documents(process_link_list),
+            }
+
     def create_process(
         self,
         profile: Dict[str, Any],
@@ -85,11 +315,14 @@ class ProcessService(BaseService):
         if not company_id:
             raise ValidationError("Debe indicarse una empresa para el proceso")
         data = {**data, "company_id": company_id}
-        return self.create(
+        created = self.create(
             data,
             performed_by=profile.get("id"),
             audit_metadata={"company_id": company_id},
         )
+        search_index.upsert(PROCESS, created)
+        process_tree_cache.invalidate(company_id)
+        return created
 
     def update_process(
         self,
@@ -101,21 +334,29 @@ class ProcessService(BaseService):
         self._ensure_process_access(profile, process)
         if updates.get("company_id") and profile.get("role") != "root":
             raise AuthError("Solo un usuario root puede reasignar la empresa")
-        return self.update(
+        updated = self.update(
             process_id,
             updates,
             performed_by=profile.get("id"),
             audit_metadata={"updated_fields": list(updates.keys())},
         )
+        search_index.move(PROCESS, process.get("company_id"), updated)
+        process_tree_cache.invalidate(process.get("company_id"))
+        if updates.get("company_id"):
+            process_tree_cache.invalidate(updates["company_id"])
+        return updated
 
     def delete_process(self, profile: Dict[str, Any], process_id: str):
         process = self.get_by_id(process_id)
         self._ensure_process_access(profile, process)
-        return self.delete(
+        deleted = self.delete(
             process_id,
             performed_by=profile.get("id"),
             audit_metadata={"code": process.get("code")},
         )
+        search_index.remove(process.get("company_id"), PROCESS, process_id)
+        process_tree_cache.invalidate(process.get("company_id"))
+        return deleted
 
     # ------------------------------------------------------------------
     # Tasks
@@ -163,14 +404,119 @@ class ProcessService(BaseService):
         self._ensure_task(process_id, task_id)
         return self.task_dao.delete(task_id)
 
+    # ------------------------------------------------------------------
+    # Bulk tasks
+    # ------------------------------------------------------------------
+    def _load_for_bulk(self, profile: Dict[str, Any], process_id: str):
+        process = self.get_by_id(process_id)
+        self._ensure_process_access(profile, process)
+        return process
+
+    def bulk_update_task_status(
+        self,
+        profile: Dict[str, Any],
+        process_id: str,
+        task_ids: Sequence[str],
+        status: str,
+    ):
+        self._load_for_bulk(profile, process_id)
+        tasks = self._ensure_tasks(process_id, task_ids, columns="id,process_id")
+        return self.task_dao.update_many(
+            [task["id"] for task in tasks],
+            {"status": status, "updated_at": datetime.utcnow()},
+        )
+
+    def bulk_reassign_tasks(
+        self,
+        profile: Dict[str, Any],
+        process_id: str,
+        task_ids: Sequence[str],
+        *,
+        owner_id: Optional[str],
+        owner: Optional[str] = None,
+    ):
+        process = self._load_for_bulk(profile, process_id)
+        tasks = self._ensure_tasks(process_id, task_ids, columns="id,process_id")
+        if owner_id:
+            user = self.user_service.get_user(owner_id)
+            if user.get("company_id") != process.get("company_id"):
+                raise ValidationError(
+                    "El responsable no pertenece a la empresa del proceso"
+                )
+            owner = owner or user.get("full_name") or user.get("email")
+        return self.task_dao.update_many(
+            [task["id"] for task in tasks],
+            {
+                "owner_id": owner_id or None,
+                "owner": owner if owner_id else None,
+                "updated_at": datetime.utcnow(),
+            },
+        )
+
+    def reorder_tasks(
+        self,
+        profile: Dict[str, Any],
+        process_id: str,
+        task_ids: Sequence[str],
+    ):
+        """Pone ``task_ids`` primero, en ese orden, y el resto detrás.
+
+        Las tareas no indicadas conservan su orden relativo. Las que
+        cambian de ``order_index`` se escriben con una sola consulta que
+        solo lleva esa columna (más ``updated_at``): escribir las filas
+        leídas al principio revertiría ediciones concurrentes de otros campos.
+        """
+        self._load_for_bulk(profile, process_id)
+        tasks = self.task_dao.list_for_process(process_id)
+        by_id = {task["id"]: task for task in tasks}
+        task_ids = list(dict.fromkeys(task_ids))
+        missing = [task_id for task_id in task_ids if task_id not in by_id]
+        if missing:
+            raise ValidationError(
+                "Hay tareas que no pertenecen a este proceso",
+                details={"ids": missing},
+            )
+
+        selected = set(task_ids)
+        ordered = [by_id[task_id] for task_id in task_ids]
+        ordered += [task for task in tasks if task["id"] not in selected]
+        now = datetime.utcnow()
+        changed = [
+            (task["id"], index)
+            for index, task in enumerate(ordered)
+            if task.get("order_index") != index
+        ]
+        updated = {
+            record["id"]: record
+            for record in self.task_dao.set_order_indexes(changed, now)
+        }
+        changed_ids = {task_id for task_id, _ in changed}
+        # Las que se borraron durante el reordenamiento ya no se devuelven.
+        return [
+            updated.get(task["id"], task)
+            for task in ordered
+            if task["id"] not in changed_ids or task["id"] in updated
+        ]
+
+    def bulk_delete_tasks(
+        self,
+        profile: Dict[str, Any],
+        process_id: str,
+        task_ids: Sequence[str],
+    ):
+        self._load_for_bulk(profile, process_id)
+        tasks = self._ensure_tasks(process_id, task_ids, columns="id,process_id")
+        deleted = self.task_dao.delete_many([task["id"] for task in tasks])
+        return {"deleted": deleted}
+
     # ------------------------------------------------------------------
     # Links with documents
     # ------------------------------------------------------------------
     def list_links(self, profile: Dict[str, Any], process_id: str):
         process = self.get_by_id(process_id)
         self._ensure_process_access(profile, process)
-        return self.artifact_links.list_for_entity(
-            profile, process_id, ArtifactEntityType.PROCESS
+        return self.artifact_links.list_for_loaded_entity(
+            profile, process, ArtifactEntityType.PROCESS
         )
 
     def create_link(
@@ -220,8 +566,8 @@ class ProcessService(BaseService):
         process = self.get_by_id(process_id)
         self._ensure_process_access(profile, process)
         task = self._ensure_task(process_id, task_id)
-        return self.artifact_links.list_for_entity(
-            profile, task["id"], ArtifactEntityType.TASK
+        return self.artifact_links.list_for_loaded_entity(
+            profile, task, ArtifactEntityType.TASK
         )
 
     def create_task_link(
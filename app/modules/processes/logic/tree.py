@@ -0,0 +1,167 @@
+"""Mapa de procesos por empresa como lista de adyacencia en memoria.
+
+``processes.parent_id`` define la jerarquía. Cada empresa se carga una vez
+(solo las columnas del mapa) y queda en caché hasta que un alta, cambio o
+baja de procesos la invalida. Esa invalidación es local al proceso, así que
+el árbol también se recarga al vencer ``PROCESS_TREE_TTL_SECONDS``. Con los
+hijos ya agrupados por padre, el árbol completo, un subárbol o el camino de
+ancestros se arman en tiempo proporcional a la respuesta.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.config.settings import settings
+
+TREE_COLUMNS = "id,code,name,area,owner_id,parent_id"
+
+
+def _summary(process: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": process["id"],
+        "code": process.get("code"),
+        "name": process.get("name"),
+        "area": process.get("area"),
+        "owner_id": process.get("owner_id"),
+        "parent_id": process.get("parent_id"),
+    }
+
+
+class ProcessTree:
+    def __init__(self, processes: Iterable[Dict[str, Any]]) -> None:
+        self.built_at = time.monotonic()
+        self.nodes: Dict[str, Dict[str, Any]] = {
+            str(process["id"]): _summary(process)
+            for process in processes
+            if process.get("id") is not None
+        }
+        self.children: Dict[str, List[str]] = defaultdict(list)
+        self.roots: List[str] = []
+        # Padres que no existen en la empresa dejan al proceso como raíz.
+        for process_id, node in self.nodes.items():
+            parent_id = node.get("parent_id")
+            if parent_id and parent_id in self.nodes and parent_id != process_id:
+                self.children[parent_id].append(process_id)
+            else:
+                self.roots.append(process_id)
+        self._break_cycles()
+        self._root_set = set(self.roots)
+        order = self._sort_key
+        self.roots.sort(key=order)
+        for siblings in self.children.values():
+            siblings.sort(key=order)
+
+    def __contains__(self, process_id: str) -> bool:
+        return process_id in self.nodes
+
+    def _sort_key(self, process_id: str):
+        node = self.nodes[process_id]
+        return (node.get("code") or "", node.get("name") or "", process_id)
+
+    def _break_cycles(self) -> None:
+        """Los procesos en un ciclo de ``parent_id`` no cuelgan de ninguna
+        raíz; el primero de cada ciclo se promueve a raíz."""
+
+        reachable = set()
+        stack = list(self.roots)
+        while stack:
+            process_id = stack.pop()
+            reachable.add(process_id)
+            stack.extend(self.children.get(process_id, ()))
+        for process_id in sorted(self.nodes):
+            if process_id in reachable:
+                continue
+            parent_id = self.nodes[process_id]["parent_id"]
+            self.children[parent_id].remove(process_id)
+            self.roots.append(process_id)
+            stack = [process_id]
+            while stack:
+                current = stack.pop()
+                reachable.add(current)
+                stack.extend(self.children.get(current, ()))
+
+    def subtree(
+        self, root_id: Optional[str] = None, *, depth: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Árbol anidado desde ``root_id`` (o todas las raíces) hasta ``depth``."""
+
+        start = [root_id] if root_id is not None else self.roots
+        result: List[Dict[str, Any]] = []
+        stack = [(process_id, result, 0) for process_id in reversed(start)]
+        while stack:
+            process_id, siblings, level = stack.pop()
+            node = {**self.nodes[process_id], "children": []}
+            siblings.append(node)
+            if depth is not None and level >= depth:
+                continue
+            for child_id in reversed(self.children.get(process_id, ())):
+                stack.append((child_id, node["children"], level + 1))
+        return result
+
+    def walk(self) -> Iterator[Tuple[str, int]]:
+        """``(process_id, profundidad)`` en preorden, padres antes que hijos."""
+
+        stack = [(process_id, 0) for process_id in reversed(self.roots)]
+        while stack:
+            process_id, level = stack.pop()
+            yield process_id, level
+            for child_id in reversed(self.children.get(process_id, ())):
+                stack.append((child_id, level + 1))
+
+    def ancestors(self, process_id: str) -> List[Dict[str, Any]]:
+        """Camino desde la raíz hasta el padre de ``process_id``."""
+
+        path: List[Dict[str, Any]] = []
+        if process_id in self._root_set:
+            return path
+        seen = {process_id}
+        parent_id = self.nodes[process_id].get("parent_id")
+        while parent_id and parent_id in self.nodes and parent_id not in seen:
+            seen.add(parent_id)
+            path.append(self.nodes[parent_id])
+            if parent_id in self._root_set:
+                break
+            parent_id = self.nodes[parent_id].get("parent_id")
+        path.reverse()
+        return path
+
+
+class ProcessTreeCache:
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._trees: Dict[str, ProcessTree] = {}
+        self._generations: Dict[str, int] = defaultdict(int)
+
+    def get(
+        self, company_id: str, loader: Callable[[], Iterable[Dict[str, Any]]]
+    ) -> ProcessTree:
+        with self._lock:
+            tree = self._trees.get(company_id)
+            generation = self._generations[company_id]
+        if tree is not None and time.monotonic() - tree.built_at <= self.ttl_seconds:
+            return tree
+        # Se carga fuera del lock; si hubo una escritura mientras tanto, el
+        # árbol se usa para esta respuesta pero no se guarda.
+        tree = ProcessTree(loader())
+        with self._lock:
+            if self._generations[company_id] == generation:
+                self._trees[company_id] = tree
+        return tree
+
+    def invalidate(self, company_id: Optional[str] = None) -> None:
+        with self._lock:
+            if company_id is None:
+                for key in list(self._generations):
+                    self._generations[key] += 1
+                self._trees.clear()
+                return
+            self._generations[company_id] += 1
+            self._trees.pop(company_id, None)
+
+
+process_tree_cache = ProcessTreeCache(settings.PROCESS_TREE_TTL_SECONDS)
@@ -11,6 +11,7 @@ from app.modules.diagrams.api.routes import router as diagrams_router
 from app.modules.flows.api.routes import router as flows_router
 from app.modules.documents.api.routes import router as documents_router
 from app.modules.processes.api.routes import router as processes_router
+from app.modules.search.api.routes import router as search_router
 from app.modules.users.api.routes import router as users_router
 
 # from app.modules.analytics.api.routes import router as analytics_router
@@ -30,6 +31,7 @@ def register_routes(app: FastAPI) -> None:
     app.include_router(
         artifact_links_router, prefix="/artifact-links", tags=["Artifact Links"]
     )
+    app.include_router(search_router, prefix="/search", tags=["Search"])
 
     # --- Rutas de módulos Adicionales ---
     # app.include_router(analytics_router, prefix="/analytics", tags=["Analytics"])
@@ -0,0 +1,37 @@
+"""Controllers for search endpoints."""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence
+
+from app.libraries.utils.response_builder import ResponseBuilder
+from app.libraries.utils.response_models import ApiResponse
+
+from ..logic.services import SearchService
+from .schemas import SearchHit
+
+
+class SearchController:
+    def __init__(self, service: SearchService | None = None) -> None:
+        self.service = service or SearchService()
+
+    def search(
+        self,
+        profile: Dict,
+        query: str,
+        *,
+        company_id: Optional[str],
+        types: Optional[Sequence[str]],
+        include_inactive: bool,
+        limit: int,
+    ) -> ApiResponse[List[SearchHit]]:
+        hits = self.service.search(
+            profile,
+            query,
+            company_id=company_id,
+            types=types,
+            include_inactive=include_inactive,
+            limit=limit,
+        )
+        items = [SearchHit.model_validate(hit) for hit in hits]
+        return ResponseBuilder.success(items, "Resultados de búsqueda")
@@ -0,0 +1,39 @@
+"""FastAPI routes for full-text search."""
+
+from __future__ import annotations
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from app.libraries.auth.roles import require_role
+from app.libraries.utils.response_models import ApiResponse
+
+from .controller import SearchController
+from .schemas import SearchEntityType, SearchHit
+
+router = APIRouter()
+controller = SearchController()
+
+
+@router.get("/", response_model=ApiResponse[List[SearchHit]])
+async def search(
+    q: str = Query(
+        ..., min_length=1, description="Texto a buscar; el último término es prefijo"
+    ),
+    company_id: Optional[str] = Query(default=None),
+    types: Optional[List[SearchEntityType]] = Query(
+        default=None, description="Limita los resultados a estos tipos"
+    ),
+    include_inactive: bool = Query(default=False),
+    limit: int = Query(default=20, ge=1, le=100),
+    profile=Depends(require_role(["root", "admin", "user"])),
+):
+    return controller.search(
+        profile,
+        q,
+        company_id=company_id,
+        types=[item.value for item in types] if types else None,
+        include_inactive=include_inactive,
+        limit=limit,
+    )
@@ -0,0 +1,27 @@
+"""Pydantic schemas for search endpoints."""
+
+from __future__ import annotations
+
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class SearchEntityType(str, Enum):
+    DOCUMENT = "document"
+    PROCESS = "process"
+    FLOW_NODE = "flow_node"
+
+
+class SearchHit(BaseModel):
+    type: SearchEntityType
+    id: str
+    title: str
+    score: float = Field(..., description="Puntaje BM25")
+    matched_terms: List[str] = Field(default_factory=list)
+    code: Optional[str] = None
+    active: Optional[bool] = None
+    flow_id: Optional[str] = Field(
+        default=None, description="Flujo al que pertenece el nodo"
+    )
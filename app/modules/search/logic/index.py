@@ -0,0 +1,390 @@
+"""Índice invertido en memoria, particionado por empresa, con ranking BM25.
+
+Cada entrada indexada (documento, proceso o nodo de flujo) se identifica
+por ``(tipo, id)`` y aporta varios campos de texto con un peso: el peso
+multiplica la frecuencia del término, así que un acierto en el título vale
+más que uno en la descripción (una variante simple de BM25F).
+
+Los términos se normalizan para español sin tildes (``"Gestión"`` y
+``"gestion"`` son el mismo término) y se guardan además en una lista
+ordenada, que resuelve las búsquedas por prefijo con ``bisect``.
+
+Las particiones se construyen la primera vez que se consulta una empresa;
+desde ahí las mantienen los servicios al crear, actualizar o borrar. Esos
+hooks no ven lo que escriben otros workers o instancias, así que cada
+partición se reconstruye al vencer ``SEARCH_INDEX_TTL_SECONDS``.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.config.settings import settings
+
+EntryKey = Tuple[str, str]
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Un prefijo corto como "a" podría expandirse a miles de términos.
+MAX_PREFIX_EXPANSIONS = 64
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+SPANISH_STOPWORDS = frozenset(
+    """
+    a al algo ante como con contra cual de del desde donde durante e el ella
+    en entre es esa ese esta este hasta la las le les lo los mas me mi muy ni
+    no o otra otro para pero por que se segun sin sobre su sus tambien u un
+    una uno y ya
+    """.split()
+)
+
+
+def fold_text(text: str) -> str:
+    """Minúsculas y sin tildes ni diéresis (``"Ñandú"`` → ``"nandu"``)."""
+
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text: Any, *, keep_stopwords: bool = False) -> List[str]:
+    if text is None:
+        return []
+    if isinstance(text, (list, tuple, set)):
+        text = " ".join(str(item) for item in text if item is not None)
+    tokens = _TOKEN_PATTERN.findall(fold_text(str(text)))
+    if keep_stopwords:
+        return tokens
+    return [token for token in tokens if token not in SPANISH_STOPWORDS]
+
+
+# ----------------------------------------------------------------------
+# Campos indexados por entidad
+# ----------------------------------------------------------------------
+DOCUMENT = "document"
+PROCESS = "process"
+FLOW_NODE = "flow_node"
+ENTITY_TYPES = (DOCUMENT, PROCESS, FLOW_NODE)
+
+Fields = List[Tuple[Any, float]]
+
+
+def document_fields(document: Dict[str, Any]) -> Tuple[Fields, str, Dict[str, Any]]:
+    fields = [
+        (document.get("title"), 3.0),
+        (document.get("code"), 3.0),
+        (document.get("tags"), 2.0),
+        (document.get("description"), 1.0),
+    ]
+    meta = {"code": document.get("code"), "active": document.get("active", True)}
+    return fields, document.get("title") or "", meta
+
+
+def process_fields(process: Dict[str, Any]) -> Tuple[Fields, str, Dict[str, Any]]:
+    fields = [
+        (process.get("name"), 3.0),
+        (process.get("code"), 2.0),
+        (process.get("objective"), 1.0),
+    ]
+    return fields, process.get("name") or "", {"code": process.get("code")}
+
+
+def flow_node_fields(node: Dict[str, Any]) -> Tuple[Fields, str, Dict[str, Any]]:
+    fields = [(node.get("label"), 3.0)]
+    return fields, node.get("label") or "", {"flow_id": node.get("flow_id")}
+
+
+FieldExtractor = Callable[[Dict[str, Any]], Tuple[Fields, str, Dict[str, Any]]]
+ENTITY_FIELDS: Dict[str, FieldExtractor] = {
+    DOCUMENT: document_fields,
+    PROCESS: process_fields,
+    FLOW_NODE: flow_node_fields,
+}
+
+
+@dataclass
+class IndexEntry:
+    entity_type: str
+    entity_id: str
+    title: str
+    meta: Dict[str, Any]
+    term_frequencies: Dict[str, float]
+    length: float
+
+
+@dataclass
+class SearchHit:
+    entry: IndexEntry
+    score: float
+    matched_terms: List[str]
+
+
+class CompanyIndex:
+    """Índice de una empresa. No es thread-safe: lo protege el registro."""
+
+    def __init__(self) -> None:
+        self.built_at = time.monotonic()
+        self.entries: Dict[EntryKey, IndexEntry] = {}
+        self.postings: Dict[str, Dict[EntryKey, float]] = defaultdict(dict)
+        self.terms: List[str] = []
+        self.total_length = 0.0
+
+    def add_record(self, entity_type: str, record: Dict[str, Any]) -> None:
+        fields, title, meta = ENTITY_FIELDS[entity_type](record)
+        self.add(entity_type, record["id"], fields, title=title, meta=meta)
+
+    def add(
+        self,
+        entity_type: str,
+        entity_id: str,
+        fields: Sequence[Tuple[Any, float]],
+        *,
+        title: str,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        key = (entity_type, str(entity_id))
+        self.remove(*key)
+
+        frequencies: Counter = Counter()
+        for text, weight in fields:
+            for token in tokenize(text):
+                frequencies[token] += weight
+        length = float(sum(frequencies.values()))
+        entry = IndexEntry(
+            entity_type, key[1], title, meta or {}, dict(frequencies), length
+        )
+        self.entries[key] = entry
+        self.total_length += length
+        for term, frequency in frequencies.items():
+            posting = self.postings[term]
+            if not posting:
+                insort(self.terms, term)
+            posting[key] = frequency
+
+    def remove(self, entity_type: str, entity_id: str) -> bool:
+        key = (entity_type, str(entity_id))
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return False
+        self.total_length -= entry.length
+        for term in entry.term_frequencies:
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            posting.pop(key, None)
+            if not posting:
+                del self.postings[term]
+                position = bisect_left(self.terms, term)
+                if position < len(self.terms) and self.terms[position] == term:
+                    del self.terms[position]
+        return True
+
+    def expand_prefix(self, prefix: str) -> List[str]:
+        start = bisect_left(self.terms, prefix)
+        expanded: List[str] = []
+        for term in self.terms[start:]:
+            if not term.startswith(prefix) or len(expanded) >= MAX_PREFIX_EXPANSIONS:
+                break
+            expanded.append(term)
+        return expanded
+
+    def search(
+        self,
+        query: str,
+        *,
+        limit: int = 20,
+        accept: Optional[Callable[[IndexEntry], bool]] = None,
+    ) -> List[SearchHit]:
+        """Busca con BM25; el último término (o los que terminan en ``*``)
+        se tratan como prefijo, para responder mientras se escribe."""
+
+        groups = self._query_groups(query)
+        if not groups or not self.entries:
+            return []
+
+        total = len(self.entries)
+        average_length = self.total_length / total if total else 0.0
+        scores: Dict[EntryKey, float] = defaultdict(float)
+        matched: Dict[EntryKey, List[str]] = defaultdict(list)
+
+        for terms in groups:
+            # Con prefijos cada documento suma solo su mejor expansión.
+            best: Dict[EntryKey, Tuple[float, str]] = {}
+            for term in terms:
+                posting = self.postings.get(term)
+                if not posting:
+                    continue
+                matches = len(posting)
+                idf = math.log(1 + (total - matches + 0.5) / (matches + 0.5))
+                for key, frequency in posting.items():
+                    relative = self.entries[key].length / average_length
+                    norm = 1 - BM25_B + BM25_B * relative
+                    saturation = frequency + BM25_K1 * norm
+                    score = idf * frequency * (BM25_K1 + 1) / saturation
+                    if key not in best or score > best[key][0]:
+                        best[key] = (score, term)
+            for key, (score, term) in best.items():
+                scores[key] += score
+                matched[key].append(term)
+
+        hits = []
+        for key, score in scores.items():
+            entry = self.entries[key]
+            if accept is not None and not accept(entry):
+                continue
+            hits.append(SearchHit(entry, score, matched[key]))
+        # Más términos distintos primero; luego BM25 y título para desempatar.
+        hits.sort(
+            key=lambda hit: (-len(hit.matched_terms), -hit.score, hit.entry.title)
+        )
+        return hits[:limit]
+
+    def _query_groups(self, query: str) -> List[List[str]]:
+        raw_parts = query.strip().split()
+        if not raw_parts:
+            return []
+        groups: List[List[str]] = []
+        for position, part in enumerate(raw_parts):
+            explicit_prefix = part.endswith("*")
+            is_prefix = explicit_prefix or position == len(raw_parts) - 1
+            tokens = tokenize(part.rstrip("*"), keep_stopwords=is_prefix)
+            for token_position, token in enumerate(tokens):
+                last = token_position == len(tokens) - 1
+                if is_prefix and last:
+                    expanded = self.expand_prefix(token)
+                    if expanded:
+                        groups.append(expanded)
+                    elif token not in SPANISH_STOPWORDS:
+                        groups.append([token])
+                elif token not in SPANISH_STOPWORDS:
+                    groups.append([token])
+        return groups
+
+
+class SearchIndexRegistry:
+    """Particiones por empresa construidas bajo demanda.
+
+    Los métodos de mantenimiento (:meth:`upsert`, :meth:`remove`) ignoran
+    las empresas cuya partición todavía no se construyó: la construcción
+    posterior ya leerá el estado actualizado de la base.
+
+    La carga corre fuera del lock del registro, con un lock por empresa para
+    no construir dos veces la misma partición. Lo que los hooks cambian
+    mientras tanto se reaplica sobre la partición nueva antes de instalarla;
+    si la empresa se invalida durante la carga, la partición solo sirve a
+    esa consulta. Al reconstruir una partición vencida, las demás consultas
+    de la empresa siguen usando la anterior hasta que la nueva esté lista.
+    """
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.RLock()
+        self._partitions: Dict[str, CompanyIndex] = {}
+        self._build_locks: Dict[str, threading.Lock] = {}
+        self._generations: Dict[str, int] = defaultdict(int)
+        # Cambios de los hooks durante cada carga: (tipo, id, registro o None).
+        self._changes: Dict[str, List[Tuple[str, str, Optional[Dict[str, Any]]]]] = {}
+
+    def partition(
+        self, company_id: str, loader: Callable[[CompanyIndex], None]
+    ) -> CompanyIndex:
+        with self._lock:
+            index = self._partitions.get(company_id)
+            if index is not None and not self._expired(index):
+                return index
+            build_lock = self._build_locks.setdefault(company_id, threading.Lock())
+        if not build_lock.acquire(blocking=index is None):
+            return index
+        try:
+            with self._lock:
+                current = self._partitions.get(company_id)
+                if current is not None and not self._expired(current):
+                    return current
+                generation = self._generations[company_id]
+                self._changes[company_id] = []
+            fresh = CompanyIndex()
+            try:
+                loader(fresh)
+            finally:
+                with self._lock:
+                    changes = self._changes.pop(company_id)
+            with self._lock:
+                for entity_type, entity_id, record in changes:
+                    if record is None:
+                        fresh.remove(entity_type, entity_id)
+                    else:
+                        fresh.add_record(entity_type, record)
+                if self._generations[company_id] == generation:
+                    self._partitions[company_id] = fresh
+            return fresh
+        finally:
+            build_lock.release()
+
+    def search(
+        self,
+        company_id: str,
+        loader: Callable[[CompanyIndex], None],
+        query: str,
+        **options: Any,
+    ) -> List[SearchHit]:
+        index = self.partition(company_id, loader)
+        with self._lock:
+            return index.search(query, **options)
+
+    def upsert(self, entity_type: str, record: Optional[Dict[str, Any]]) -> None:
+        """Reindexa ``record`` en la partición de su ``company_id``."""
+        if not record or not record.get("company_id") or record.get("id") is None:
+            return
+        with self._lock:
+            company_id = record["company_id"]
+            if company_id in self._changes:
+                self._changes[company_id].append(
+                    (entity_type, str(record["id"]), record)
+                )
+            index = self._partitions.get(company_id)
+            if index is not None:
+                index.add_record(entity_type, record)
+
+    def move(
+        self, entity_type: str, previous_company: Optional[str], record: Dict[str, Any]
+    ) -> None:
+        """Reindexa un registro que pudo cambiar de empresa."""
+        with self._lock:
+            if previous_company and previous_company != record.get("company_id"):
+                self.remove(previous_company, entity_type, record.get("id"))
+            self.upsert(entity_type, record)
+
+    def remove(
+        self, company_id: Optional[str], entity_type: str, entity_id: Any
+    ) -> None:
+        if not company_id or entity_id is None:
+            return
+        with self._lock:
+            if company_id in self._changes:
+                self._changes[company_id].append((entity_type, str(entity_id), None))
+            index = self._partitions.get(company_id)
+            if index is not None:
+                index.remove(entity_type, entity_id)
+
+    def invalidate(self, company_id: Optional[str] = None) -> None:
+        with self._lock:
+            if company_id is None:
+                for key in list(self._generations):
+                    self._generations[key] += 1
+                self._partitions.clear()
+            else:
+                self._generations[company_id] += 1
+                self._partitions.pop(company_id, None)
+
+    def _expired(self, index: CompanyIndex) -> bool:
+        return time.monotonic() - index.built_at > self.ttl_seconds
+
+
+search_index = SearchIndexRegistry(settings.SEARCH_INDEX_TTL_SECONDS)
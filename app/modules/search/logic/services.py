@@ -0,0 +1,112 @@
+"""Business logic for full-text search."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from app.libraries.exceptions.app_exceptions import AuthError, ValidationError
+from app.libraries.utils.concurrency import run_concurrently
+from app.modules.documents.data.dao import DocumentDAO
+from app.modules.flows.data.dao import FlowNodeDAO
+from app.modules.processes.data.dao import ProcessDAO
+from app.modules.users.logic.services import UserService
+
+from .index import (
+    DOCUMENT,
+    ENTITY_TYPES,
+    FLOW_NODE,
+    PROCESS,
+    CompanyIndex,
+    IndexEntry,
+    search_index,
+)
+
+
+class SearchService:
+    def __init__(
+        self,
+        document_dao: Optional[DocumentDAO] = None,
+        process_dao: Optional[ProcessDAO] = None,
+        node_dao: Optional[FlowNodeDAO] = None,
+        user_service: Optional[UserService] = None,
+    ) -> None:
+        self.document_dao = document_dao or DocumentDAO()
+        self.process_dao = process_dao or ProcessDAO()
+        self.node_dao = node_dao or FlowNodeDAO()
+        self.user_service = user_service or UserService()
+
+    def _resolve_company(self, profile: Dict[str, Any], company_id: Optional[str]):
+        role = profile.get("role")
+        if role == "root":
+            return company_id or profile.get("company_id")
+
+        profile_company = self.user_service.ensure_has_company(profile)
+        if company_id and company_id != profile_company:
+            raise AuthError("No puedes operar sobre otra empresa")
+        return profile_company
+
+    def _loader(self, company_id: str):
+        def load(index: CompanyIndex) -> None:
+            documents, processes, nodes = run_concurrently(
+                lambda: self.document_dao.filter(company_id=company_id),
+                lambda: self.process_dao.filter(company_id=company_id),
+                lambda: self.node_dao.filter(company_id=company_id),
+            )
+            for entity_type, records in (
+                (DOCUMENT, documents),
+                (PROCESS, processes),
+                (FLOW_NODE, nodes),
+            ):
+                for record in records:
+                    if record.get("id") is not None:
+                        index.add_record(entity_type, record)
+
+        return load
+
+    def search(
+        self,
+        profile: Dict[str, Any],
+        query: str,
+        *,
+        company_id: Optional[str] = None,
+        types: Optional[Sequence[str]] = None,
+        include_inactive: bool = False,
+        limit: int = 20,
+    ) -> List[Dict[str, Any]]:
+        resolved_company = self._resolve_company(profile, company_id)
+        if not resolved_company:
+            raise ValidationError("Debe indicarse una empresa para buscar")
+        if not query or not query.strip():
+            return []
+
+        wanted = set(types or ENTITY_TYPES)
+        unknown = wanted - set(ENTITY_TYPES)
+        if unknown:
+            raise ValidationError(
+                "Tipos de búsqueda no soportados",
+                details={"types": sorted(unknown), "allowed": list(ENTITY_TYPES)},
+            )
+
+        def accept(entry: IndexEntry) -> bool:
+            if entry.entity_type not in wanted:
+                return False
+            return include_inactive or entry.meta.get("active", True) is not False
+
+        hits = search_index.search(
+            resolved_company,
+            self._loader(resolved_company),
+            query,
+            limit=limit,
+            accept=accept,
+        )
+        return [
+            {
+                "type": hit.entry.entity_type,
+                "id": hit.entry.entity_id,
+                "title": hit.entry.title,
+                "score": round(hit.score, 4),
+                "matched_terms": hit.matched_terms,
+                **hit.entry.meta,
+            }
+            for hit in hits
+        ]
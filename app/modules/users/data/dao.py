@@ -25,3 +25,11 @@ class UserDAO(CustomSupabaseDAO):
 
         query = self.table.select("*").in_("id", list(user_ids))
         return self._execute(query, "get_by_ids")
+
+    def list_display_names(self, company_id: Optional[str] = None):
+        """Columnas que se muestran como nombre; con ``company_id``, sus
+        usuarios y los ``root`` (que pueden aprobar en cualquier empresa)."""
+        query = self._build_select_query("id,full_name,email,position").order("id")
+        if company_id:
+            query = query.or_(f"company_id.eq.{company_id},role.eq.root")
+        return self._execute(query, "list_display_names")
@@ -0,0 +1,221 @@
+"""Inyección de latencia y errores para el cliente mock.
+
+Contra el mock cada llamada cuesta microsegundos, así que los patrones N+1
+pasan inadvertidos. Con un :class:`MockFaultInjector` cada ``execute()``
+simula el round-trip de Supabase con una distribución de latencia y puede
+fallar con cierta probabilidad, configurable por tabla y por acción.
+
+Las reglas se leen de un JSON (``MOCK_FAULTS_PATH``)::
+
+    {
+      "seed": 7,
+      "sleep": true,
+      "rules": [
+        {"latency_ms": {"distribution": "lognormal", "median": 35, "sigma": 0.4}},
+        {"table": "document_reads", "action": "select",
+         "latency_ms": {"distribution": "uniform", "min": 20, "max": 80}},
+        {"action": "upsert", "error": {"rate": 0.05, "phase": "after"}}
+      ]
+    }
+
+``table`` y ``action`` omitidos equivalen a ``"*"``; para cada llamada se
+usa la regla más específica. Cada par tabla/acción tiene su propio
+generador sembrado, de modo que una misma secuencia de llamadas produce
+siempre las mismas latencias y los mismos fallos.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+WILDCARD = "*"
+ERROR_PHASES = ("before", "after")
+DEFAULT_ERROR_CODE = "08006"
+DEFAULT_ERROR_MESSAGE = "Fallo de conexión inyectado por el mock"
+
+
+@dataclass
+class LatencySpec:
+    """Distribución de latencia en milisegundos."""
+
+    distribution: str = "fixed"
+    value: float = 0.0
+    min: float = 0.0
+    max: Optional[float] = None
+    mean: float = 0.0
+    stddev: float = 0.0
+    median: float = 0.0
+    sigma: float = 0.0
+
+    @classmethod
+    def from_dict(cls, data: Any) -> "LatencySpec":
+        if isinstance(data, (int, float)):
+            return cls(value=float(data))
+        spec = cls(**data)
+        if spec.distribution not in {"fixed", "uniform", "normal", "lognormal", "exponential"}:
+            raise ValueError(f"Distribución de latencia desconocida: {spec.distribution}")
+        return spec
+
+    def sample(self, rng: random.Random) -> float:
+        if self.distribution == "uniform":
+            value = rng.uniform(self.min, self.max if self.max is not None else self.min)
+        elif self.distribution == "normal":
+            value = rng.gauss(self.mean, self.stddev)
+        elif self.distribution == "lognormal":
+            value = self.median * rng.lognormvariate(0.0, self.sigma)
+        elif self.distribution == "exponential":
+            value = rng.expovariate(1.0 / self.mean) if self.mean > 0 else 0.0
+        else:
+            value = self.value
+        # ``min`` y ``max`` también acotan las distribuciones no uniformes.
+        value = max(value, self.min)
+        if self.max is not None:
+            value = min(value, self.max)
+        return value
+
+
+@dataclass
+class ErrorSpec:
+    """Probabilidad y forma de un error inyectado.
+
+    Con ``phase="before"`` la llamada falla sin aplicarse; con ``"after"``
+    la escritura se aplica pero la respuesta se pierde, como un timeout del
+    lado del cliente, lo que permite ejercitar reintentos no idempotentes.
+    """
+
+    rate: float = 0.0
+    code: str = DEFAULT_ERROR_CODE
+    message: str = DEFAULT_ERROR_MESSAGE
+    phase: str = "before"
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ErrorSpec":
+        spec = cls(**data)
+        if spec.phase not in ERROR_PHASES:
+            raise ValueError(f"Fase de error desconocida: {spec.phase}")
+        return spec
+
+
+@dataclass
+class MockFaultRule:
+    table: str = WILDCARD
+    action: str = WILDCARD
+    latency: Optional[LatencySpec] = None
+    error: Optional[ErrorSpec] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MockFaultRule":
+        latency = data.get("latency_ms")
+        error = data.get("error")
+        return cls(
+            table=data.get("table", WILDCARD),
+            action=data.get("action", WILDCARD),
+            latency=LatencySpec.from_dict(latency) if latency is not None else None,
+            error=ErrorSpec.from_dict(error) if error is not None else None,
+        )
+
+
+@dataclass
+class FaultStats:
+    calls: int = 0
+    errors: int = 0
+    latency_ms: float = 0.0
+
+
+@dataclass
+class FaultDecision:
+    """Resultado de evaluar una llamada: cuánto esperar y si debe fallar."""
+
+    latency_ms: float = 0.0
+    error: Optional[ErrorSpec] = None
+
+
+class MockFaultInjector:
+    """Decide la latencia y los errores de cada llamada al mock."""
+
+    def __init__(
+        self,
+        rules: List[MockFaultRule],
+        *,
+        seed: int = 0,
+        sleep: bool = True,
+    ) -> None:
+        self.seed = seed
+        # Con ``sleep=False`` la latencia solo se contabiliza: útil para
+        # medir round-trips en benchmarks sin esperar en tiempo real.
+        self.sleep = sleep
+        self._rules: Dict[Tuple[str, str], MockFaultRule] = {
+            (rule.table, rule.action): rule for rule in rules
+        }
+        self._random: Dict[Tuple[str, str], random.Random] = {}
+        self._stats: Dict[Tuple[str, str], FaultStats] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MockFaultInjector":
+        rules = [MockFaultRule.from_dict(item) for item in data.get("rules", [])]
+        return cls(rules, seed=int(data.get("seed", 0)), sleep=bool(data.get("sleep", True)))
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "MockFaultInjector":
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    def _rule_for(self, table: str, action: str) -> Optional[MockFaultRule]:
+        for key in (
+            (table, action),
+            (table, WILDCARD),
+            (WILDCARD, action),
+            (WILDCARD, WILDCARD),
+        ):
+            rule = self._rules.get(key)
+            if rule is not None:
+                return rule
+        return None
+
+    def decide(self, table: str, action: str) -> FaultDecision:
+        rule = self._rule_for(table, action)
+        key = (table, action)
+        with self._lock:
+            stats = self._stats.setdefault(key, FaultStats())
+            stats.calls += 1
+            if rule is None:
+                return FaultDecision()
+            rng = self._random.get(key)
+            if rng is None:
+                rng = self._random[key] = random.Random(f"{self.seed}:{table}:{action}")
+            # El error se sortea aunque la regla no lo defina, así agregar o
+            # quitar ``error`` no altera las latencias de las llamadas siguientes.
+            latency = rule.latency.sample(rng) if rule.latency else 0.0
+            roll = rng.random()
+            error = rule.error if rule.error and roll < rule.error.rate else None
+            stats.latency_ms += latency
+            if error is not None:
+                stats.errors += 1
+        return FaultDecision(latency_ms=latency, error=error)
+
+    def wait(self, decision: FaultDecision) -> None:
+        if self.sleep and decision.latency_ms > 0:
+            time.sleep(decision.latency_ms / 1000.0)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Resumen por ``tabla.acción`` de llamadas, errores y latencia simulada."""
+
+        with self._lock:
+            return {
+                f"{table}.{action}": {
+                    "calls": item.calls,
+                    "errors": item.errors,
+                    "latency_ms": round(item.latency_ms, 3),
+                }
+                for (table, action), item in sorted(self._stats.items())
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats.clear()
@@ -0,0 +1,206 @@
+"""Persistencia en disco para el cliente mock: journal + snapshots.
+
+Cada escritura confirmada en :class:`MockSupabaseClient` se agrega a un
+journal binario (registros ``pickle`` con prefijo de longitud). Cada cierta
+cantidad de registros se genera un snapshot compactado de todas las tablas
+y se descarta el journal ya incluido en él. Al iniciar se carga el último
+snapshot y se reproducen solo los registros posteriores.
+
+Cada registro lleva un número de secuencia global y cada tabla del snapshot
+guarda la última secuencia aplicada, de modo que el snapshot puede tomarse
+tabla por tabla sin detener las escrituras del resto.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import pickle
+import struct
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct(">I")
+SNAPSHOT_FILE = "snapshot.bin"
+JOURNAL_FILE = "journal.bin"
+ROTATED_JOURNAL_FILE = "journal.bin.old"
+
+TableSnapshot = Tuple[List[Dict[str, Any]], int]
+SnapshotProvider = Callable[[], Dict[str, TableSnapshot]]
+
+
+class MockJournal:
+    """Journal de escrituras con compactación periódica en snapshots."""
+
+    def __init__(
+        self,
+        directory: str | Path,
+        *,
+        snapshot_every: int = 1000,
+        fsync: bool = False,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.snapshot_every = max(1, snapshot_every)
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._handle = None
+        self._seq = 0
+        self._pending = 0
+        self._compacting = False
+        self._snapshot_provider: Optional[SnapshotProvider] = None
+
+    # ------------------------------------------------------------------
+    # Rutas
+    # ------------------------------------------------------------------
+    @property
+    def snapshot_path(self) -> Path:
+        return self.directory / SNAPSHOT_FILE
+
+    @property
+    def journal_path(self) -> Path:
+        return self.directory / JOURNAL_FILE
+
+    @property
+    def rotated_journal_path(self) -> Path:
+        return self.directory / ROTATED_JOURNAL_FILE
+
+    def has_snapshot(self) -> bool:
+        return self.snapshot_path.exists()
+
+    # ------------------------------------------------------------------
+    # Carga
+    # ------------------------------------------------------------------
+    def load_snapshot(self) -> Dict[str, TableSnapshot]:
+        """Devuelve ``{tabla: (filas, última secuencia aplicada)}``."""
+
+        if not self.has_snapshot():
+            return {}
+        with self.snapshot_path.open("rb") as handle:
+            snapshot = pickle.load(handle)
+        self._seq = max(self._seq, snapshot.get("seq", 0))
+        return snapshot.get("tables", {})
+
+    def iter_entries(self) -> Iterator[Dict[str, Any]]:
+        """Recorre los registros pendientes de aplicar sobre el snapshot."""
+
+        for path in (self.rotated_journal_path, self.journal_path):
+            if not path.exists():
+                continue
+            for entry in self._read_file(path):
+                self._seq = max(self._seq, entry["seq"])
+                self._pending += 1
+                yield entry
+
+    @staticmethod
+    def _read_file(path: Path) -> Iterator[Dict[str, Any]]:
+        with path.open("rb") as handle:
+            while True:
+                header = handle.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    return
+                (size,) = _HEADER.unpack(header)
+                body = handle.read(size)
+                if len(body) < size:
+                    # Registro truncado por un corte abrupto: se descarta.
+                    logger.warning("Registro incompleto al final de %s", path)
+                    return
+                yield pickle.loads(body)
+
+    # ------------------------------------------------------------------
+    # Escritura
+    # ------------------------------------------------------------------
+    def attach(self, provider: SnapshotProvider) -> None:
+        """Registra la función que entrega el estado de las tablas al compactar."""
+
+        self._snapshot_provider = provider
+
+    def append(self, entry: Dict[str, Any]) -> int:
+        """Agrega un registro y devuelve su número de secuencia."""
+
+        with self._lock:
+            self._seq += 1
+            record = {**entry, "seq": self._seq}
+            body = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+            handle = self._open()
+            handle.write(_HEADER.pack(len(body)))
+            handle.write(body)
+            handle.flush()
+            if self.fsync:
+                os.fsync(handle.fileno())
+            self._pending += 1
+            should_compact = (
+                self._pending >= self.snapshot_every and not self._compacting
+            )
+            if should_compact:
+                self._compacting = True
+            seq = self._seq
+
+        if should_compact:
+            # Se compacta fuera del lock de la tabla que disparó la escritura.
+            threading.Thread(
+                target=self.compact, name="mock-journal-compaction", daemon=True
+            ).start()
+        return seq
+
+    def _open(self):
+        if self._handle is None:
+            self._handle = self.journal_path.open("ab")
+        return self._handle
+
+    def compact(self) -> None:
+        """Escribe un snapshot con el estado actual y descarta el journal cubierto."""
+
+        provider = self._snapshot_provider
+        if provider is None:
+            return
+        try:
+            with self._lock:
+                if self._handle is not None:
+                    self._handle.close()
+                    self._handle = None
+                if self.journal_path.exists():
+                    if self.rotated_journal_path.exists():
+                        # Quedó de una compactación interrumpida: se conserva
+                        # todo lo pendiente en un único archivo rotado.
+                        with self.rotated_journal_path.open("ab") as target:
+                            target.write(self.journal_path.read_bytes())
+                        self.journal_path.unlink()
+                    else:
+                        os.replace(self.journal_path, self.rotated_journal_path)
+                self._pending = 0
+                seq = self._seq
+
+            tables = provider()
+            self._write_snapshot({"seq": seq, "tables": tables})
+            if self.rotated_journal_path.exists():
+                self.rotated_journal_path.unlink()
+            logger.info(
+                "Snapshot del mock compactado",
+                extra={"tables": len(tables), "seq": seq},
+            )
+        except Exception:
+            logger.exception("No se pudo compactar el journal del mock")
+        finally:
+            with self._lock:
+                self._compacting = False
+
+    def write_initial_snapshot(self, tables: Dict[str, TableSnapshot]) -> None:
+        self._write_snapshot({"seq": self._seq, "tables": tables})
+
+    def _write_snapshot(self, snapshot: Dict[str, Any]) -> None:
+        temporary = self.snapshot_path.with_suffix(".tmp")
+        with temporary.open("wb") as handle:
+            pickle.dump(snapshot, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporary, self.snapshot_path)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
@@ -2,9 +2,42 @@
 
 from __future__ import annotations
 
+import heapq
+import logging
+import threading
+import uuid
+from bisect import bisect_left, bisect_right, insort
 from copy import deepcopy
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from functools import cmp_to_key
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from app.libraries.utils.locks import ReadWriteLock
+from app.services.query_filters import RANGE_OPERATORS, Condition, FilterMixin, like_to_regex
+
+if TYPE_CHECKING:
+    from app.services.mock_faults import MockFaultInjector
+    from app.services.mock_persistence import MockJournal, TableSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+PRIMARY_KEY: Tuple[str, ...] = ("id",)
+DEFAULT_SORTED_COLUMNS: Tuple[str, ...] = ("read_at", "created_at", "next_review_at")
+# Mayor que cualquier secuencia: ``(valor, _AFTER_ANY_SEQ)`` sigue a todas
+# las entradas con ese valor en el índice ordenado.
+_AFTER_ANY_SEQ = float("inf")
 
 
 @dataclass
@@ -13,29 +46,571 @@ class MockResponse:
 
     data: Any
     error: Any = None
+    count: Optional[int] = None
+
+
+class MockAPIError(Exception):
+    """Error equivalente a las violaciones de restricciones de PostgREST."""
+
+    def __init__(self, message: str, *, code: str = "23505") -> None:
+        self.message = message
+        self.code = code
+        super().__init__(message)
+
+
+class MockInjectedError(MockAPIError):
+    """Error simulado por :class:`~app.services.mock_faults.MockFaultInjector`.
+
+    ``applied`` indica si la escritura llegó a aplicarse antes de perder la
+    respuesta.
+    """
+
+    def __init__(self, message: str, *, code: str, applied: bool = False) -> None:
+        super().__init__(message, code=code)
+        self.applied = applied
+
+
+def _freeze(value: Any) -> Any:
+    """Convierte valores no hashables para poder usarlos como clave de índice."""
+
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    return value
+
+
+def _sort_value(value: Any) -> Any:
+    """Normaliza un valor no nulo para compararlo al ordenar."""
+
+    if isinstance(value, str):
+        return value.lower()
+    if isinstance(value, (int, float, bool)):
+        return value
+    return str(value)
+
+
+def _coerce(row_value: Any, value: Any) -> Any:
+    """Adapta un valor textual (p. ej. de ``or_``) al tipo de la columna."""
+
+    if not isinstance(value, str) or isinstance(row_value, str):
+        return value
+    if isinstance(row_value, bool):
+        lowered = value.strip().lower()
+        if lowered in {"true", "false"}:
+            return lowered == "true"
+        return value
+    if isinstance(row_value, (int, float)):
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _equals(row_value: Any, value: Any) -> bool:
+    return row_value == value or row_value == _coerce(row_value, value)
+
+
+def _compare(row_value: Any, value: Any) -> int:
+    """Compara con la misma normalización que los índices ordenados."""
+
+    left = _sort_value(row_value)
+    right = _sort_value(_coerce(row_value, value))
+    try:
+        return (left > right) - (left < right)
+    except TypeError:
+        left, right = str(left), str(right)
+        return (left > right) - (left < right)
+
+
+_RANGE_CHECKS: Dict[str, Callable[[int], bool]] = {
+    "gt": lambda result: result > 0,
+    "gte": lambda result: result >= 0,
+    "lt": lambda result: result < 0,
+    "lte": lambda result: result <= 0,
+}
+
+
+def _compile_condition(condition: Condition) -> Callable[[Dict[str, Any]], Optional[bool]]:
+    """Traduce una condición a una función con lógica de tres valores.
+
+    Devuelve ``True``, ``False`` o ``None`` (``NULL``) como PostgreSQL, de
+    modo que ``not`` sobre una comparación con ``NULL`` sigue excluyendo
+    la fila.
+    """
+
+    operator = condition[0]
+    if operator == "not":
+        inner = _compile_condition(condition[1])
+
+        def negate(row: Dict[str, Any]) -> Optional[bool]:
+            result = inner(row)
+            return None if result is None else not result
+
+        return negate
+
+    if operator in {"and", "or"}:
+        parts = [_compile_condition(item) for item in condition[1]]
+        decisive = operator == "or"
+
+        def combine(row: Dict[str, Any]) -> Optional[bool]:
+            result: Optional[bool] = not decisive
+            for part in parts:
+                value = part(row)
+                if value is decisive:
+                    return decisive
+                if value is None:
+                    result = None
+            return result
+
+        return combine
+
+    _, column, value = condition
+    if operator == "is":
+        return lambda row: row.get(column) is value
+
+    if operator == "eq" and value is None:
+        # Compatibilidad con el mock anterior: ``eq(col, None)`` es ``IS NULL``.
+        return lambda row: row.get(column) is None
+
+    if operator == "in":
+        frozen = {_freeze(item) for item in value}
+        textual = [item for item in value if isinstance(item, str)]
+
+        def contained(row: Dict[str, Any]) -> Optional[bool]:
+            current = row.get(column)
+            if current is None:
+                return None
+            if _freeze(current) in frozen:
+                return True
+            return any(_equals(current, item) for item in textual)
+
+        return contained
+
+    if operator in {"like", "ilike"}:
+        pattern = like_to_regex(str(value), operator == "ilike")
+
+        def matches(row: Dict[str, Any]) -> Optional[bool]:
+            current = row.get(column)
+            if current is None:
+                return None
+            return pattern.fullmatch(str(current)) is not None
+
+        return matches
+
+    if operator in {"eq", "neq"}:
+        expected = operator == "eq"
+
+        def equality(row: Dict[str, Any]) -> Optional[bool]:
+            current = row.get(column)
+            if current is None or value is None:
+                return None
+            return _equals(current, value) is expected
+
+        return equality
+
+    if operator in _RANGE_CHECKS:
+        check = _RANGE_CHECKS[operator]
+
+        def in_range(row: Dict[str, Any]) -> Optional[bool]:
+            current = row.get(column)
+            if current is None or value is None:
+                return None
+            return check(_compare(current, value))
+
+        return in_range
+
+    raise ValueError(f"Operador no soportado: {operator}")
+
+
+class MockSortedIndex:
+    """Índice ordenado por una columna, mantenido con búsqueda binaria.
+
+    Guarda pares ``(valor normalizado, secuencia)``; la secuencia es el
+    orden de inserción de la fila y desempata igual que un ordenamiento
+    estable sobre la tabla. Las filas con la columna en ``NULL`` se
+    guardan aparte y siempre se entregan al final.
+    """
+
+    def __init__(self, column: str) -> None:
+        self.column = column
+        self._entries: List[Tuple[Any, int]] = []
+        self._rows: Dict[int, Dict[str, Any]] = {}
+        self._nulls: Dict[int, Dict[str, Any]] = {}
+
+    def add(self, seq: int, row: Dict[str, Any]) -> None:
+        value = row.get(self.column)
+        if value is None:
+            self._nulls[seq] = row
+            return
+        insort(self._entries, (_sort_value(value), seq))
+        self._rows[seq] = row
+
+    def discard(self, seq: int, row: Dict[str, Any]) -> None:
+        value = row.get(self.column)
+        if value is None:
+            self._nulls.pop(seq, None)
+            return
+        entry = (_sort_value(value), seq)
+        position = bisect_left(self._entries, entry)
+        if position < len(self._entries) and self._entries[position] == entry:
+            del self._entries[position]
+        self._rows.pop(seq, None)
+
+    def iter_rows(
+        self,
+        *,
+        desc: bool = False,
+        lower: Sequence[Tuple[Any, bool]] = (),
+        upper: Sequence[Tuple[Any, bool]] = (),
+    ) -> Iterator[Dict[str, Any]]:
+        """Recorre las filas en orden; los empates conservan el orden de inserción.
+
+        ``lower`` y ``upper`` son cotas ``(valor, inclusiva)`` sobre la
+        columna; con alguna cota las filas ``NULL`` quedan fuera, igual que
+        en una comparación SQL. Las posiciones se calculan antes de devolver
+        el iterador, así un ``TypeError`` por tipos no comparables se lanza
+        en la llamada y no a mitad del recorrido.
+        """
+
+        start, stop = self._positions(lower, upper)
+        return self._iter_range(start, stop, desc, include_nulls=not (lower or upper))
+
+    def _positions(
+        self, lower: Sequence[Tuple[Any, bool]], upper: Sequence[Tuple[Any, bool]]
+    ) -> Tuple[int, int]:
+        start, stop = 0, len(self._entries)
+        for value, inclusive in lower:
+            key = _sort_value(value)
+            if inclusive:
+                position = bisect_left(self._entries, (key,))
+            else:
+                position = bisect_right(self._entries, (key, _AFTER_ANY_SEQ))
+            start = max(start, position)
+        for value, inclusive in upper:
+            key = _sort_value(value)
+            if inclusive:
+                position = bisect_right(self._entries, (key, _AFTER_ANY_SEQ))
+            else:
+                position = bisect_left(self._entries, (key,))
+            stop = min(stop, position)
+        return start, max(start, stop)
+
+    def _iter_range(
+        self, start: int, stop: int, desc: bool, *, include_nulls: bool
+    ) -> Iterator[Dict[str, Any]]:
+        entries = self._entries
+        if not desc:
+            for position in range(start, stop):
+                yield self._rows[entries[position][1]]
+        else:
+            run: List[int] = []
+            current: Any = None
+            for position in range(stop - 1, start - 1, -1):
+                value, seq = entries[position]
+                if run and value != current:
+                    for item in reversed(run):
+                        yield self._rows[item]
+                    run = []
+                current = value
+                run.append(seq)
+            for item in reversed(run):
+                yield self._rows[item]
+
+        if include_nulls:
+            for seq in sorted(self._nulls):
+                yield self._nulls[seq]
+
+
+class MockTableStore:
+    """Filas de una tabla junto con sus índices únicos.
+
+    Cada índice se identifica por la tupla de columnas que lo componen
+    (la clave primaria ``id`` y cada combinación usada en ``on_conflict``)
+    y mapea los valores de esas columnas a la fila correspondiente. Igual
+    que en PostgreSQL, las filas con algún valor ``NULL`` en la clave no
+    participan del índice.
+
+    Para las columnas de ``sorted_columns`` se construye, la primera vez que
+    se ordena por ellas, un :class:`MockSortedIndex` que luego se mantiene
+    en cada escritura.
+
+    El acceso concurrente se coordina con ``lock``: las consultas toman el
+    lock de lectura y las escrituras el de escritura. La única mutación que
+    ocurre bajo lectura es la construcción perezosa de índices ordenados,
+    protegida por su propio mutex.
+    """
+
+    def __init__(
+        self,
+        rows: Optional[Iterable[Dict[str, Any]]] = None,
+        *,
+        sorted_columns: Sequence[str] = (),
+    ) -> None:
+        self.rows: List[Dict[str, Any]] = []
+        self._unique: Dict[Tuple[str, ...], Dict[Tuple[Any, ...], Dict[str, Any]]] = {
+            PRIMARY_KEY: {}
+        }
+        self.sorted_columns = tuple(sorted_columns)
+        self._sorted: Dict[str, Optional[MockSortedIndex]] = {}
+        self._seq: Dict[int, int] = {}
+        self._next_seq = 0
+        # Última secuencia del journal aplicada sobre esta tabla.
+        self.applied_seq = 0
+        self.lock = ReadWriteLock()
+        self._build_lock = threading.Lock()
+        for row in rows or []:
+            self.add(deepcopy(row))
+
+    # Índices -----------------------------------------------------------
+    @staticmethod
+    def _key_for(row: Dict[str, Any], keys: Tuple[str, ...]) -> Optional[Tuple[Any, ...]]:
+        values = tuple(row.get(key) for key in keys)
+        if any(value is None for value in values):
+            return None
+        return tuple(_freeze(value) for value in values)
+
+    def ensure_index(self, keys: Tuple[str, ...]) -> Dict[Tuple[Any, ...], Dict[str, Any]]:
+        """Índice único sobre ``keys``, construido la primera vez.
+
+        Como ``CREATE UNIQUE INDEX`` en PostgreSQL, falla si las filas ya
+        tienen valores duplicados en esas columnas; el índice no se registra
+        y cada ``on_conflict`` sobre ellas vuelve a fallar.
+        """
+        index = self._unique.get(keys)
+        if index is None:
+            index = {}
+            for row in self.rows:
+                key = self._key_for(row, keys)
+                if key is None:
+                    continue
+                if key in index:
+                    values = ", ".join(f"{k}={row.get(k)!r}" for k in keys)
+                    logger.error(
+                        "Datos duplicados impiden el índice único (%s)", ", ".join(keys)
+                    )
+                    raise MockAPIError(
+                        f"could not create unique index ({', '.join(keys)}): "
+                        f"key ({values}) is duplicated"
+                    )
+                index[key] = row
+            self._unique[keys] = index
+        return index
+
+    def index_keys(self) -> List[Tuple[str, ...]]:
+        return list(self._unique)
+
+    def find(self, keys: Tuple[str, ...], values: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        key = self._key_for(values, keys)
+        if key is None:
+            return None
+        return self.ensure_index(keys).get(key)
+
+    def find_conflict(
+        self, row: Dict[str, Any], *, ignore: Optional[Dict[str, Any]] = None
+    ) -> Optional[Tuple[str, ...]]:
+        """Devuelve el índice que rechazaría ``row`` o ``None`` si no hay conflicto."""
+
+        for keys, index in self._unique.items():
+            key = self._key_for(row, keys)
+            if key is None:
+                continue
+            existing = index.get(key)
+            if existing is not None and existing is not ignore:
+                return keys
+        return None
+
+    def _index(self, row: Dict[str, Any]) -> None:
+        for keys, index in self._unique.items():
+            key = self._key_for(row, keys)
+            if key is not None:
+                index[key] = row
+
+    def _unindex(self, row: Dict[str, Any]) -> None:
+        for keys, index in self._unique.items():
+            key = self._key_for(row, keys)
+            if key is not None and index.get(key) is row:
+                del index[key]
+
+    def sorted_index(self, column: str) -> Optional[MockSortedIndex]:
+        """Devuelve el índice ordenado de ``column`` si la columna lo admite."""
+
+        if column not in self.sorted_columns:
+            return None
+        if column in self._sorted:
+            return self._sorted[column]
+        with self._build_lock:
+            if column not in self._sorted:
+                index: Optional[MockSortedIndex] = MockSortedIndex(column)
+                try:
+                    for row in self.rows:
+                        index.add(self._seq[id(row)], row)
+                except TypeError:
+                    # Tipos no comparables entre sí: se ordena sin índice.
+                    index = None
+                self._sorted[column] = index
+        return self._sorted[column]
+
+    def _sorted_apply(self, operation: str, row: Dict[str, Any], columns=None) -> None:
+        seq = self._seq[id(row)]
+        for column, index in self._sorted.items():
+            if index is None or (columns is not None and column not in columns):
+                continue
+            try:
+                getattr(index, operation)(seq, row)
+            except TypeError:
+                self._sorted[column] = None
+
+    def in_insertion_order(self, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Ordena filas obtenidas por un índice como aparecen en ``rows``."""
+
+        return sorted(rows, key=lambda row: self._seq[id(row)])
+
+    # Mutaciones --------------------------------------------------------
+    def add(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        self.rows.append(row)
+        self._seq[id(row)] = self._next_seq
+        self._next_seq += 1
+        self._index(row)
+        self._sorted_apply("add", row)
+        return row
+
+    def update(self, row: Dict[str, Any], changes: Dict[str, Any]) -> Dict[str, Any]:
+        resorted = [column for column in self._sorted if column in changes]
+        touched = any(
+            column in changes for keys in self._unique for column in keys
+        )
+        if touched:
+            candidate = {**row, **changes}
+            conflict = self.find_conflict(candidate, ignore=row)
+            if conflict is not None:
+                raise _unique_violation(conflict, candidate)
+            self._unindex(row)
+
+        self._sorted_apply("discard", row, resorted)
+        row.update(changes)
+        self._sorted_apply("add", row, resorted)
+        if touched:
+            self._index(row)
+        return row
+
+    def restore(self, row: Dict[str, Any], snapshot: Dict[str, Any]) -> None:
+        """Devuelve ``row`` exactamente al estado de ``snapshot`` (rollback)."""
+
+        self._unindex(row)
+        self._sorted_apply("discard", row)
+        row.clear()
+        row.update(snapshot)
+        self._index(row)
+        self._sorted_apply("add", row)
+
+    def remove(self, rows: Sequence[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        to_remove = {id(row) for row in rows}
+        for row in rows:
+            self._unindex(row)
+            self._sorted_apply("discard", row)
+            self._seq.pop(id(row), None)
+        self.rows[:] = [row for row in self.rows if id(row) not in to_remove]
+
+
+def _unique_violation(keys: Tuple[str, ...], row: Dict[str, Any]) -> MockAPIError:
+    values = ", ".join(f"{key}={row.get(key)!r}" for key in keys)
+    return MockAPIError(
+        f"duplicate key value violates unique constraint ({values})"
+    )
 
 
 class MockSupabaseClient:
-    """Cliente simplificado que emula la interfaz básica del SDK de Supabase."""
+    """Cliente simplificado que emula la interfaz básica del SDK de Supabase.
+
+    Con un :class:`~app.services.mock_persistence.MockJournal` las escrituras
+    sobreviven a los reinicios: el estado se restaura desde el último
+    snapshot más el journal, e ``initial_data`` solo se usa la primera vez.
+
+    Con un :class:`~app.services.mock_faults.MockFaultInjector` cada
+    ``execute()`` simula la latencia y los errores de un round-trip real.
+    El replay del journal no pasa por ``execute()`` y no se ve afectado.
+    """
 
     def __init__(
-        self, initial_data: Optional[Dict[str, Iterable[Dict[str, Any]]]] = None
+        self,
+        initial_data: Optional[Dict[str, Iterable[Dict[str, Any]]]] = None,
+        *,
+        sorted_columns: Sequence[str] = DEFAULT_SORTED_COLUMNS,
+        journal: Optional["MockJournal"] = None,
+        faults: Optional["MockFaultInjector"] = None,
     ):
-        self._tables: Dict[str, List[Dict[str, Any]]] = {}
-        if initial_data:
+        self._sorted_columns = tuple(sorted_columns)
+        self.faults = faults
+        self._tables: Dict[str, MockTableStore] = {}
+        self._tables_lock = threading.Lock()
+        self._journal = journal
+
+        snapshot = journal.load_snapshot() if journal is not None else {}
+        if snapshot:
+            for table, (rows, applied_seq) in snapshot.items():
+                store = MockTableStore(rows, sorted_columns=self._sorted_columns)
+                store.applied_seq = applied_seq
+                self._tables[table] = store
+        elif initial_data:
             for table, rows in initial_data.items():
-                self._tables[table] = [deepcopy(row) for row in rows]
+                self._tables[table] = MockTableStore(
+                    rows, sorted_columns=self._sorted_columns
+                )
+
+        if journal is not None:
+            if not snapshot:
+                journal.write_initial_snapshot(self._snapshot())
+            self._replay(journal)
+            journal.attach(self._snapshot)
 
     # API compatible con supabase-py
     def table(self, table_name: str) -> "MockTable":
         return MockTable(self, table_name)
 
     # Utilidades internas
+    def _get_store(self, table_name: str) -> MockTableStore:
+        store = self._tables.get(table_name)
+        if store is None:
+            with self._tables_lock:
+                store = self._tables.setdefault(
+                    table_name, MockTableStore(sorted_columns=self._sorted_columns)
+                )
+        return store
+
     def _get_table_data(self, table_name: str) -> List[Dict[str, Any]]:
-        return self._tables.setdefault(table_name, [])
+        return self._get_store(table_name).rows
 
-    def _set_table_data(self, table_name: str, data: List[Dict[str, Any]]) -> None:
-        self._tables[table_name] = data
+    def _replay(self, journal: "MockJournal") -> None:
+        replayed = 0
+        for entry in journal.iter_entries():
+            store = self._get_store(entry["table"])
+            if entry["seq"] <= store.applied_seq:
+                continue
+            try:
+                MockQuery.from_journal_entry(self, entry)._write(store)
+            except MockAPIError:
+                # La escritura original tampoco se aplicó: se omite igual.
+                logger.warning(
+                    "Registro del journal omitido",
+                    extra={"table": entry["table"], "seq": entry["seq"]},
+                )
+            store.applied_seq = entry["seq"]
+            replayed += 1
+        if replayed:
+            logger.info("Journal del mock reproducido", extra={"entries": replayed})
+
+    def _snapshot(self) -> Dict[str, "TableSnapshot"]:
+        with self._tables_lock:
+            stores = list(self._tables.items())
+        snapshot: Dict[str, "TableSnapshot"] = {}
+        for table, store in stores:
+            with store.lock.read():
+                snapshot[table] = (deepcopy(store.rows), store.applied_seq)
+        return snapshot
 
 
 class MockTable:
@@ -43,8 +618,14 @@ class MockTable:
         self._client = client
         self._table_name = table_name
 
-    def select(self, columns: str = "*") -> "MockQuery":
-        return MockQuery(self._client, self._table_name, "select", columns=columns)
+    def select(self, *columns: str, count: Optional[str] = None) -> "MockQuery":
+        return MockQuery(
+            self._client,
+            self._table_name,
+            "select",
+            columns=",".join(columns) or "*",
+            count=count,
+        )
 
     def insert(self, payload: Dict[str, Any]) -> "MockQuery":
         return MockQuery(self._client, self._table_name, "insert", payload=payload)
@@ -67,7 +648,7 @@ class MockTable:
         return MockQuery(self._client, self._table_name, "delete")
 
 
-class MockQuery:
+class MockQuery(FilterMixin):
     def __init__(
         self,
         client: MockSupabaseClient,
@@ -77,78 +658,254 @@ class MockQuery:
         columns: str = "*",
         payload: Optional[Dict[str, Any]] = None,
         on_conflict: Optional[str] = None,
+        count: Optional[str] = None,
     ) -> None:
         self._client = client
         self._table_name = table_name
         self._action = action
         self._columns = columns
         self._payload = deepcopy(payload) if payload is not None else None
-        self._filters: Dict[str, Any] = {}
-        self._in_filters: Dict[str, Iterable[Any]] = {}
-        self._orderings: List[Tuple[str, bool]] = []
-        self._limit: Optional[int] = None
+        self._orderings: List[Tuple[str, bool, bool]] = []
         self._on_conflict = on_conflict
+        # ``exact``, ``planned`` y ``estimated`` devuelven el conteo exacto.
+        self._count = count
+        self._init_filters()
 
-    def eq(self, key: str, value: Any) -> "MockQuery":
-        self._filters[key] = value
+    def order(
+        self, column: str, *, desc: bool = False, nullsfirst: Optional[bool] = None
+    ) -> "MockQuery":
+        # Sin ``nullsfirst`` los nulos van al final en ambas direcciones.
+        self._orderings.append((column, desc, bool(nullsfirst)))
         return self
 
-    def in_(self, key: str, values: Iterable[Any]) -> "MockQuery":
-        self._in_filters[key] = list(values)
-        return self
+    def execute(self) -> MockResponse:
+        faults = self._client.faults
+        if faults is None:
+            return self._execute()
 
-    def order(self, column: str, *, desc: bool = False) -> "MockQuery":
-        self._orderings.append((column, desc))
-        return self
+        # La latencia se simula fuera de los locks, como un round-trip de red.
+        decision = faults.decide(self._table_name, self._action)
+        faults.wait(decision)
+        error = decision.error
+        if error is not None and error.phase == "before":
+            raise MockInjectedError(error.message, code=error.code)
+        response = self._execute()
+        if error is not None:
+            raise MockInjectedError(error.message, code=error.code, applied=True)
+        return response
 
-    def limit(self, count: int) -> "MockQuery":
-        self._limit = count
-        return self
+    def _execute(self) -> MockResponse:
+        store = self._client._get_store(self._table_name)
 
-    def execute(self) -> MockResponse:
-        data = self._client._get_table_data(self._table_name)
+        # Las copias se toman dentro del lock: fuera de él otra escritura
+        # podría estar modificando las mismas filas.
+        if self._action == "select":
+            with store.lock.read():
+                total: Optional[int] = None
+                if self._count:
+                    filtered = self._filter_rows(store)
+                    total = len(filtered)
+                    limited = self._page(filtered)
+                else:
+                    limited = self._select_rows(store)
+                result = [self._project_columns(row) for row in limited]
+                return MockResponse(data=deepcopy(result), count=total)
 
-        # Filtrado
-        filtered = []
-        for row in data:
-            if not self._matches_filters(row):
-                continue
-            filtered.append(row)
+        if self._action not in {"insert", "upsert", "update", "delete"}:
+            raise ValueError(f"Unsupported action: {self._action}")
 
-        if self._action == "select":
-            ordered = self._apply_ordering(filtered)
-            limited = self._apply_limit(ordered)
-            result = [self._project_columns(row) for row in limited]
-            return MockResponse(data=deepcopy(result))
+        with store.lock.write():
+            written = self._write(store)
+            journal = self._client._journal
+            if written and journal is not None:
+                store.applied_seq = journal.append(self._to_journal_entry())
+            return MockResponse(data=deepcopy(written))
 
+    def _write(self, store: MockTableStore) -> List[Dict[str, Any]]:
         if self._action == "insert":
-            inserted_rows = self._prepare_insert()
-            data.extend(inserted_rows)
-            return MockResponse(data=deepcopy(inserted_rows))
-
+            return self._prepare_insert(store)
+        if self._action == "upsert":
+            return self._apply_upsert(store)
         if self._action == "update":
-            updated_rows = self._apply_update(filtered)
-            return MockResponse(data=deepcopy(updated_rows))
-
-        if self._action == "delete":
-            deleted_rows = self._apply_delete(filtered)
-            return MockResponse(data=deepcopy(deleted_rows))
+            return self._apply_update(store, self._filter_rows(store))
+        return self._apply_delete(store, self._filter_rows(store))
 
-        if self._action == "upsert":
-            upserted_rows = self._apply_upsert()
-            return MockResponse(data=deepcopy(upserted_rows))
+    # Journal
+    def _to_journal_entry(self) -> Dict[str, Any]:
+        return {
+            "table": self._table_name,
+            "action": self._action,
+            "payload": self._payload,
+            "on_conflict": self._on_conflict,
+            "conditions": self._conditions,
+        }
 
-        raise ValueError(f"Unsupported action: {self._action}")
+    @classmethod
+    def from_journal_entry(
+        cls, client: MockSupabaseClient, entry: Dict[str, Any]
+    ) -> "MockQuery":
+        query = cls(
+            client,
+            entry["table"],
+            entry["action"],
+            payload=entry.get("payload"),
+            on_conflict=entry.get("on_conflict"),
+        )
+        if "conditions" in entry:
+            query._conditions = list(entry["conditions"])
+        else:
+            # Formato anterior del journal: solo ``eq`` e ``in_``.
+            for key, value in (entry.get("filters") or {}).items():
+                query._conditions.append(("eq", key, value))
+            for key, values in (entry.get("in_filters") or {}).items():
+                query._conditions.append(("in", key, list(values)))
+        return query
 
     # Helpers
-    def _matches_filters(self, row: Dict[str, Any]) -> bool:
-        for key, value in self._filters.items():
-            if row.get(key) != value:
-                return False
-        for key, values in self._in_filters.items():
-            if row.get(key) not in values:
-                return False
-        return True
+    def _predicate(self) -> Callable[[Dict[str, Any]], bool]:
+        checks = [_compile_condition(condition) for condition in self._conditions]
+        if not checks:
+            return lambda row: True
+        # Como en SQL, solo pasan las filas cuyo resultado es TRUE (no NULL).
+        return lambda row: all(check(row) is True for check in checks)
+
+    def _top_level(self, *operators: str) -> Iterator[Tuple[str, str, Any]]:
+        for condition in self._conditions:
+            if condition[0] in operators and len(condition) == 3:
+                yield condition  # type: ignore[misc]
+
+    def _has_unique_lookup(self, store: MockTableStore) -> bool:
+        """Indica si ``_candidate_rows`` resolverá la consulta con un índice único."""
+
+        if any(column == "id" for _, column, _ in self._top_level("in")):
+            return True
+        equals = {column for _, column, value in self._top_level("eq") if value is not None}
+        return any(set(keys) <= equals for keys in store.index_keys())
+
+    def _bounds(
+        self, column: str
+    ) -> Tuple[List[Tuple[Any, bool]], List[Tuple[Any, bool]]]:
+        lower: List[Tuple[Any, bool]] = []
+        upper: List[Tuple[Any, bool]] = []
+        for operator, key, value in self._top_level("eq", *RANGE_OPERATORS):
+            if key != column or value is None:
+                continue
+            if operator in {"eq", "gt", "gte"}:
+                lower.append((value, operator != "gt"))
+            if operator in {"eq", "lt", "lte"}:
+                upper.append((value, operator != "lt"))
+        return lower, upper
+
+    def _candidate_rows(self, store: MockTableStore) -> Sequence[Dict[str, Any]]:
+        """Reduce las filas a revisar usando los índices disponibles.
+
+        Las condiciones se vuelven a evaluar después sobre cada candidata,
+        así que los índices solo necesitan devolver un superconjunto.
+        """
+
+        equals = {
+            column: value
+            for _, column, value in self._top_level("eq")
+            if value is not None
+        }
+        # Clave primaria o cualquier índice único cubierto por ``eq``.
+        for keys in store.index_keys():
+            if all(key in equals for key in keys):
+                found = store.find(keys, equals)
+                return [found] if found is not None else []
+        for _, column, values in self._top_level("in"):
+            if column == "id":
+                unique_ids = dict.fromkeys(_freeze(value) for value in values)
+                found_rows = (store.find(PRIMARY_KEY, {"id": value}) for value in unique_ids)
+                return [row for row in found_rows if row is not None]
+
+        # Rangos sobre columnas con índice ordenado.
+        for _, column, _ in self._top_level(*RANGE_OPERATORS):
+            index = store.sorted_index(column)
+            if index is None:
+                continue
+            lower, upper = self._bounds(column)
+            try:
+                rows = index.iter_rows(lower=lower, upper=upper)
+            except TypeError:
+                continue
+            return store.in_insertion_order(rows)
+        return store.rows
+
+    def _filter_rows(self, store: MockTableStore) -> List[Dict[str, Any]]:
+        predicate = self._predicate()
+        return [row for row in self._candidate_rows(store) if predicate(row)]
+
+    def _select_rows(self, store: MockTableStore) -> List[Dict[str, Any]]:
+        offset = self._offset
+        if (
+            self._limit is not None
+            and len(self._orderings) == 1
+            and not self._orderings[0][2]
+            and not self._has_unique_lookup(store)
+        ):
+            column, desc, _ = self._orderings[0]
+            index = store.sorted_index(column)
+            ordered_rows: Optional[Iterator[Dict[str, Any]]] = None
+            if index is not None:
+                lower, upper = self._bounds(column)
+                try:
+                    ordered_rows = index.iter_rows(desc=desc, lower=lower, upper=upper)
+                except TypeError:
+                    ordered_rows = None
+            if ordered_rows is not None:
+                # Recorre el índice ya ordenado y corta al completar la página.
+                selected: List[Dict[str, Any]] = []
+                if self._limit <= 0:
+                    return selected
+                predicate = self._predicate()
+                skipped = 0
+                for row in ordered_rows:
+                    if not predicate(row):
+                        continue
+                    if skipped < offset:
+                        skipped += 1
+                        continue
+                    selected.append(row)
+                    if len(selected) >= self._limit:
+                        break
+                return selected
+
+        return self._page(self._filter_rows(store))
+
+    def _page(self, filtered: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Ordena las filas ya filtradas y aplica ``offset``/``limit``."""
+
+        if self._limit is not None and self._orderings:
+            return self._top_k(filtered, self._offset + self._limit)[self._offset :]
+        ordered = self._apply_ordering(filtered)
+        return self._apply_limit(ordered)
+
+    def _compare_rows(self, left: Dict[str, Any], right: Dict[str, Any]) -> int:
+        for column, desc, nullsfirst in self._orderings:
+            a = left.get(column)
+            b = right.get(column)
+            if a is None or b is None:
+                if a is None and b is None:
+                    continue
+                # La posición de los nulos no depende de la dirección.
+                result = 1 if a is None else -1
+                return -result if nullsfirst else result
+            a = _sort_value(a)
+            b = _sort_value(b)
+            if a == b:
+                continue
+            result = -1 if a < b else 1
+            return -result if desc else result
+        return 0
+
+    def _top_k(self, rows: Sequence[Dict[str, Any]], count: int) -> List[Dict[str, Any]]:
+        """Selecciona los ``count`` primeros con un heap en O(n log k)."""
+
+        if count <= 0:
+            return []
+        # ``nsmallest`` es estable: equivale a ``sorted(rows, key=...)[:count]``.
+        return heapq.nsmallest(count, rows, key=cmp_to_key(self._compare_rows))
 
     def _apply_ordering(self, rows: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
         if not self._orderings:
@@ -156,27 +913,18 @@ class MockQuery:
 
         ordered = list(rows)
 
-        def normalize(value: Any) -> Any:
-            if value is None:
-                return value
-            if isinstance(value, str):
-                return value.lower()
-            if isinstance(value, (int, float, bool)):
-                return value
-            return str(value)
-
-        for column, desc in reversed(self._orderings):
+        for column, desc, nullsfirst in reversed(self._orderings):
             non_null = [row for row in ordered if row.get(column) is not None]
             nulls = [row for row in ordered if row.get(column) is None]
-            non_null.sort(key=lambda item: normalize(item.get(column)), reverse=desc)
-            ordered = non_null + nulls
+            non_null.sort(key=lambda item: _sort_value(item.get(column)), reverse=desc)
+            ordered = nulls + non_null if nullsfirst else non_null + nulls
 
         return ordered
 
     def _apply_limit(self, rows: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
         if self._limit is None:
-            return list(rows)
-        return list(rows)[: self._limit]
+            return list(rows[self._offset :])
+        return list(rows[self._offset : self._offset + self._limit])
 
     def _project_columns(self, row: Dict[str, Any]) -> Dict[str, Any]:
         if self._columns in {"*", ""}:
@@ -185,62 +933,105 @@ class MockQuery:
         columns = [col.strip() for col in self._columns.split(",") if col.strip()]
         return {column: deepcopy(row.get(column)) for column in columns}
 
-    def _prepare_insert(self) -> List[Dict[str, Any]]:
+    def _prepare_insert(self, store: MockTableStore) -> List[Dict[str, Any]]:
         payloads = self._iter_payloads()
         if not payloads:
             return []
+        for position, row in enumerate(payloads):
+            self._assign_id(position, row)
 
-        return [deepcopy(item) for item in payloads]
+        # La inserción es atómica: se valida todo el lote antes de escribir.
+        batch = MockTableStore()
+        for keys in store.index_keys():
+            batch.ensure_index(keys)
+        for row in payloads:
+            conflict = store.find_conflict(row) or batch.find_conflict(row)
+            if conflict is not None:
+                raise _unique_violation(conflict, row)
+            batch.add(row)
 
-    def _apply_update(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [store.add(row) for row in payloads]
+
+    def _apply_update(
+        self, store: MockTableStore, rows: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
         if not rows or self._payload is None:
             return []
 
-        for row in rows:
-            row.update(self._payload)
+        snapshots: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+        try:
+            for row in rows:
+                snapshots.append((row, dict(row)))
+                store.update(row, deepcopy(self._payload))
+        except MockAPIError:
+            for row, snapshot in reversed(snapshots):
+                store.restore(row, snapshot)
+            raise
         return rows
 
-    def _apply_delete(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _apply_delete(
+        self, store: MockTableStore, rows: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
         if not rows:
             return []
 
-        table_data = self._client._get_table_data(self._table_name)
-        to_remove = {id(row) for row in rows}
-        remaining = [row for row in table_data if id(row) not in to_remove]
-        self._client._set_table_data(self._table_name, remaining)
+        store.remove(rows)
         return rows
 
-    def _apply_upsert(self) -> List[Dict[str, Any]]:
+    def _apply_upsert(self, store: MockTableStore) -> List[Dict[str, Any]]:
         payloads = self._iter_payloads()
         if not payloads:
             return []
 
-        table_data = self._client._get_table_data(self._table_name)
-        conflict_keys = self._parse_on_conflict()
+        # Sin ``on_conflict`` PostgREST resuelve contra la clave primaria.
+        conflict_keys = self._parse_on_conflict() or PRIMARY_KEY
+        store.ensure_index(conflict_keys)
         result: List[Dict[str, Any]] = []
+        added: List[Dict[str, Any]] = []
+        snapshots: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
 
-        for payload in payloads:
-            match = None
-            if conflict_keys:
-                for row in table_data:
-                    if all(row.get(key) == payload.get(key) for key in conflict_keys):
-                        match = row
-                        break
+        try:
+            for payload in payloads:
+                match = store.find(conflict_keys, payload)
+                if match is not None:
+                    snapshots.append((match, dict(match)))
+                    result.append(store.update(match, payload))
+                    continue
 
-            if match is not None:
-                match.update(deepcopy(payload))
-                result.append(match)
-            else:
-                new_row = deepcopy(payload)
-                table_data.append(new_row)
-                result.append(new_row)
+                conflict = store.find_conflict(payload)
+                if conflict is not None:
+                    raise _unique_violation(conflict, payload)
+                self._assign_id(len(result), payload)
+                added.append(store.add(payload))
+                result.append(added[-1])
+        except MockAPIError:
+            # El lote se aplica completo o no se aplica.
+            for row, snapshot in reversed(snapshots):
+                store.restore(row, snapshot)
+            store.remove(added)
+            raise
 
         return result
 
-    def _parse_on_conflict(self) -> List[str]:
+    def _parse_on_conflict(self) -> Tuple[str, ...]:
         if not self._on_conflict:
-            return []
-        return [key.strip() for key in self._on_conflict.split(",") if key.strip()]
+            return ()
+        return tuple(
+            key.strip() for key in self._on_conflict.split(",") if key.strip()
+        )
+
+    def _assign_id(self, position: int, row: Dict[str, Any]) -> None:
+        """Completa ``id`` como el default ``gen_random_uuid()`` de las tablas.
+
+        El ID también se escribe en el payload original para que el journal
+        reproduzca la misma fila al reaplicarse.
+        """
+
+        if row.get("id") is not None:
+            return
+        row["id"] = str(uuid.uuid4())
+        originals = self._payload if isinstance(self._payload, list) else [self._payload]
+        originals[position]["id"] = row["id"]
 
     def _iter_payloads(self) -> List[Dict[str, Any]]:
         if self._payload is None:
@@ -0,0 +1,59 @@
+# app/services/notifications.py
+"""Avisos a usuarios por los canales disponibles (email y WhatsApp).
+
+Las tareas en segundo plano corren en hilos sin event loop, así que el
+envío de email (asíncrono) se ejecuta aquí con ``asyncio.run``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import html
+import logging
+from typing import Any, Dict, Optional
+
+from app.services.email_client import EmailService, email_service
+from app.services.whatsapp_client import WhatsAppService, whatsapp_service
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationService:
+    def __init__(
+        self,
+        email: Optional[EmailService] = None,
+        whatsapp: Optional[WhatsAppService] = None,
+    ) -> None:
+        self.email = email or email_service
+        self.whatsapp = whatsapp or whatsapp_service
+
+    def notify_user(
+        self,
+        user: Dict[str, Any],
+        *,
+        subject: str,
+        message: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Envía ``message`` al email y, si lo tiene, al teléfono del usuario."""
+
+        results: Dict[str, Any] = {}
+        if user.get("email"):
+            body = "<br>".join(html.escape(line) for line in message.splitlines())
+            results["email"] = asyncio.run(
+                self.email.send_email(
+                    to=user["email"], subject=subject, html_body=f"<p>{body}</p>"
+                )
+            )
+        if user.get("phone"):
+            results["whatsapp"] = self.whatsapp.send_message(
+                to=user["phone"], message=message, metadata=metadata
+            )
+        if not results:
+            logger.warning(
+                "El usuario %s no tiene email ni teléfono para avisos", user.get("id")
+            )
+        return results
+
+
+notification_service = NotificationService()
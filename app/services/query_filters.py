@@ -0,0 +1,225 @@
+"""Operadores de filtro de PostgREST compartidos por los clientes locales.
+
+:class:`FilterMixin` agrega a las consultas del mock y de SQLite la misma
+superficie de filtros que ``postgrest-py`` (``eq``, ``gt``, ``ilike``,
+``or_``, ``not_``, ``range``...). Cada filtro se guarda como una condición
+en forma de tupla y cada backend decide cómo evaluarla:
+
+* ``(op, columna, valor)`` con ``op`` en :data:`COMPARISON_OPERATORS`,
+  ``"in"`` (valor: lista) o ``"is"`` (valor: ``None``, ``True`` o ``False``).
+* ``("not", condición)``
+* ``("and", [condiciones])`` y ``("or", [condiciones])``
+
+Las tuplas son serializables, por lo que también sirven como formato del
+journal del mock.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional, Tuple
+
+Condition = Tuple[Any, ...]
+
+COMPARISON_OPERATORS = frozenset({"eq", "neq", "gt", "gte", "lt", "lte", "like", "ilike"})
+RANGE_OPERATORS = frozenset({"gt", "gte", "lt", "lte"})
+_LOGIC_OPERATORS = ("and", "or")
+
+
+def normalize_value(value: Any) -> Any:
+    """Convierte fechas a ISO 8601, como las serializa el cliente real."""
+
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def normalize_is_value(value: Any) -> Optional[bool]:
+    if value is None or value is True or value is False:
+        return value
+    text = str(value).strip().lower()
+    if text == "null":
+        return None
+    if text in {"true", "false"}:
+        return text == "true"
+    raise ValueError(f"Valor no soportado para is: {value!r}")
+
+
+@lru_cache(maxsize=256)
+def like_to_regex(pattern: str, case_insensitive: bool) -> "re.Pattern[str]":
+    """Traduce un patrón ``LIKE`` (``%``/``*`` y ``_``) a una expresión regular."""
+
+    parts = []
+    for char in pattern:
+        if char in "%*":
+            parts.append(".*")
+        elif char == "_":
+            parts.append(".")
+        else:
+            parts.append(re.escape(char))
+    flags = re.DOTALL | (re.IGNORECASE if case_insensitive else 0)
+    return re.compile("".join(parts), flags)
+
+
+# ----------------------------------------------------------------------
+# Parser de árboles lógicos (``or=(a.eq.1,and(b.gt.2,c.is.null))``)
+# ----------------------------------------------------------------------
+def _split_top_level(text: str) -> List[str]:
+    items: List[str] = []
+    depth = 0
+    quoted = False
+    current: List[str] = []
+    escaped = False
+    for char in text:
+        if escaped:
+            current.append(char)
+            escaped = False
+            continue
+        if char == "\\":
+            current.append(char)
+            escaped = True
+            continue
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and char == ",":
+            items.append("".join(current).strip())
+            current = []
+            continue
+        current.append(char)
+    if quoted or depth != 0:
+        raise ValueError(f"Filtro lógico mal formado: {text!r}")
+    tail = "".join(current).strip()
+    if tail:
+        items.append(tail)
+    return items
+
+
+def _unquote(value: str) -> str:
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return re.sub(r"\\(.)", r"\1", value[1:-1])
+    return value
+
+
+def _parse_item(item: str) -> Condition:
+    negated = False
+    if item.startswith("not."):
+        negated = True
+        item = item[4:]
+    for operator in _LOGIC_OPERATORS:
+        if item.startswith(f"{operator}(") and item.endswith(")"):
+            condition: Condition = (operator, parse_logic_tree(item[len(operator) + 1 : -1]))
+            return ("not", condition) if negated else condition
+    if negated:
+        raise ValueError(f"Filtro lógico mal formado: not.{item!r}")
+
+    try:
+        column, rest = item.split(".", 1)
+        operator, value = rest.split(".", 1)
+        if operator == "not":
+            negated = True
+            operator, value = value.split(".", 1)
+    except ValueError:
+        raise ValueError(f"Filtro lógico mal formado: {item!r}") from None
+
+    if operator == "in":
+        if not (value.startswith("(") and value.endswith(")")):
+            raise ValueError(f"Lista mal formada en filtro in: {item!r}")
+        values = [_unquote(part) for part in _split_top_level(value[1:-1])]
+        condition = ("in", column, values)
+    elif operator == "is":
+        condition = ("is", column, normalize_is_value(value))
+    elif operator in COMPARISON_OPERATORS:
+        condition = (operator, column, _unquote(value))
+    else:
+        raise ValueError(f"Operador no soportado: {operator}")
+    return ("not", condition) if negated else condition
+
+
+def parse_logic_tree(text: str) -> List[Condition]:
+    """Convierte la sintaxis de ``or_``/``and(...)`` de PostgREST en condiciones."""
+
+    return [_parse_item(item) for item in _split_top_level(text)]
+
+
+# ----------------------------------------------------------------------
+# Mixin con la API de filtros de postgrest-py
+# ----------------------------------------------------------------------
+class FilterMixin:
+    """Métodos de filtro, paginación y negación compartidos por las consultas.
+
+    Las clases que lo usan deben llamar a :meth:`_init_filters` en su
+    constructor.
+    """
+
+    def _init_filters(self) -> None:
+        self._conditions: List[Condition] = []
+        self._negate_next = False
+        self._limit: Optional[int] = None
+        self._offset = 0
+
+    def _add_condition(self, condition: Condition):
+        if self._negate_next:
+            condition = ("not", condition)
+            self._negate_next = False
+        self._conditions.append(condition)
+        return self
+
+    @property
+    def not_(self):
+        """Niega el próximo filtro: ``query.not_.eq("status", "borrador")``."""
+
+        self._negate_next = True
+        return self
+
+    def eq(self, key: str, value: Any):
+        return self._add_condition(("eq", key, normalize_value(value)))
+
+    def neq(self, key: str, value: Any):
+        return self._add_condition(("neq", key, normalize_value(value)))
+
+    def gt(self, key: str, value: Any):
+        return self._add_condition(("gt", key, normalize_value(value)))
+
+    def gte(self, key: str, value: Any):
+        return self._add_condition(("gte", key, normalize_value(value)))
+
+    def lt(self, key: str, value: Any):
+        return self._add_condition(("lt", key, normalize_value(value)))
+
+    def lte(self, key: str, value: Any):
+        return self._add_condition(("lte", key, normalize_value(value)))
+
+    def like(self, key: str, pattern: str):
+        return self._add_condition(("like", key, pattern))
+
+    def ilike(self, key: str, pattern: str):
+        return self._add_condition(("ilike", key, pattern))
+
+    def is_(self, key: str, value: Any):
+        return self._add_condition(("is", key, normalize_is_value(value)))
+
+    def in_(self, key: str, values: Iterable[Any]):
+        return self._add_condition(("in", key, [normalize_value(v) for v in values]))
+
+    def or_(self, filters: str, reference_table: Optional[str] = None):
+        if reference_table:
+            raise ValueError("Los filtros sobre tablas relacionadas no están soportados")
+        return self._add_condition(("or", parse_logic_tree(filters)))
+
+    def limit(self, count: int):
+        self._limit = count
+        return self
+
+    def range(self, start: int, end: int):
+        """Pagina con índices inclusivos, igual que el header ``Range``."""
+
+        self._offset = max(0, start)
+        self._limit = max(0, end - self._offset + 1)
+        return self
@@ -0,0 +1,479 @@
+"""Cliente local sobre SQLite que emula la API ``table()`` de supabase-py.
+
+A diferencia del mock en memoria, cada tabla vive en un archivo SQLite en
+modo WAL con índices reales sobre las columnas más consultadas, por lo que
+los tiempos medidos en benchmarks offline reflejan un acceso indexado y
+transaccional. Las filas se guardan como JSON (``data``) junto a la clave
+primaria ``id``; los índices se definen sobre expresiones ``json_extract``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+import sqlite3
+import threading
+import uuid
+from copy import deepcopy
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from app.services.mock_supabase_client import MockAPIError, MockResponse
+from app.services.query_filters import Condition, FilterMixin
+
+logger = logging.getLogger(__name__)
+
+# Columnas que filtran los DAO, por tabla: un índice de más también cuesta
+# en cada escritura. La clave ``"*"`` aplica a todas las tablas.
+DEFAULT_INDEXED_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "user_profiles": ("company_id", "email"),
+    "artifact_links": ("company_id", "from_id", "to_id"),
+    "flows": ("company_id",),
+    "flow_nodes": ("company_id", "flow_id"),
+    "flow_edges": ("flow_id",),
+    "processes": ("company_id",),
+    "tasks": ("process_id",),
+    "diagrams": ("company_id",),
+    "documents": ("company_id", "process_id", "next_review_at"),
+    "document_versions": ("document_id",),
+    "document_read_counters": ("document_id",),
+    "document_reads": ("document_id", "due_date"),
+}
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _identifier(name: str) -> str:
+    if not _IDENTIFIER.match(name):
+        raise ValueError(f"Identificador inválido: {name!r}")
+    return name
+
+
+def _column(name: str) -> str:
+    if name == "id":
+        return "id"
+    return f"json_extract(data, '$.{_identifier(name)}')"
+
+
+def _bind(value: Any) -> Any:
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    if value is None or isinstance(value, (int, float, str)):
+        return value
+    return str(value)
+
+
+def _dumps(row: Dict[str, Any]) -> str:
+    return json.dumps(row, ensure_ascii=False, default=str)
+
+
+_SQL_OPERATORS = {"eq": "=", "neq": "<>", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+
+def _glob_pattern(pattern: str) -> str:
+    """``LIKE`` de PostgreSQL distingue mayúsculas: se traduce a ``GLOB``."""
+
+    parts = []
+    for char in pattern:
+        if char in "%*":
+            parts.append("*")
+        elif char == "_":
+            parts.append("?")
+        elif char in "?[":
+            parts.append(f"[{char}]")
+        else:
+            parts.append(char)
+    return "".join(parts)
+
+
+def _operand(expression: str, value: Any, params: List[Any]) -> str:
+    """Placeholder para ``value``; los textos se adaptan al tipo de la columna.
+
+    Los filtros de ``or_`` llegan como texto (``n.gt.5``), y SQLite ordena
+    cualquier número antes que cualquier texto. Igual que el cast implícito
+    de PostgreSQL, un texto numérico o booleano se compara como número
+    cuando la columna lo es.
+    """
+
+    if not isinstance(value, str):
+        params.append(_bind(value))
+        return "?"
+    typed: Any = None
+    lowered = value.strip().lower()
+    if lowered in {"true", "false"}:
+        typed = int(lowered == "true")
+    else:
+        try:
+            typed = float(value)
+        except ValueError:
+            params.append(value)
+            return "?"
+    params.extend([typed, value])
+    return f"CASE WHEN typeof({expression}) IN ('integer', 'real') THEN ? ELSE ? END"
+
+
+def _sql_condition(condition: Condition, params: List[Any]) -> str:
+    """Compila una condición de :mod:`app.services.query_filters` a SQL."""
+
+    operator = condition[0]
+    if operator == "not":
+        return f"NOT ({_sql_condition(condition[1], params)})"
+    if operator in {"and", "or"}:
+        parts = [_sql_condition(item, params) for item in condition[1]]
+        if not parts:
+            return "1" if operator == "and" else "0"
+        return "(" + f" {operator.upper()} ".join(parts) + ")"
+
+    _, column, value = condition
+    expression = _column(column)
+    if operator == "in":
+        if not value:
+            return "0"
+        operands = [_operand(expression, item, params) for item in value]
+        return f"{expression} IN ({', '.join(operands)})"
+    if operator == "is" or (operator == "eq" and value is None):
+        if value is None:
+            return f"{expression} IS NULL"
+        params.append(int(value))
+        return f"{expression} IS ?"
+    if operator == "like":
+        params.append(_glob_pattern(str(value)))
+        return f"{expression} GLOB ?"
+    if operator == "ilike":
+        # ``LIKE`` de SQLite ya ignora mayúsculas (solo ASCII).
+        params.append(str(value).replace("*", "%"))
+        return f"{expression} LIKE ?"
+    if operator in _SQL_OPERATORS:
+        operand = _operand(expression, value, params)
+        return f"{expression} {_SQL_OPERATORS[operator]} {operand}"
+    raise ValueError(f"Operador no soportado: {operator}")
+
+
+class SQLiteSupabaseClient:
+    """Backend local con la misma superficie que usan los DAO."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        indexed_columns: Mapping[str, Sequence[str]] = DEFAULT_INDEXED_COLUMNS,
+    ) -> None:
+        self.path = Path(path)
+        if self.path.parent and not self.path.parent.exists():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._indexed_columns = {
+            table: tuple(_identifier(column) for column in columns)
+            for table, columns in indexed_columns.items()
+        }
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._known_tables: set[str] = set()
+        self._unique_indexes: set[Tuple[str, Tuple[str, ...]]] = set()
+
+    # API compatible con supabase-py
+    def table(self, table_name: str) -> "SQLiteTable":
+        return SQLiteTable(self, _identifier(table_name))
+
+    # ------------------------------------------------------------------
+    # Conexiones y esquema
+    # ------------------------------------------------------------------
+    def connection(self) -> sqlite3.Connection:
+        """Conexión propia del hilo actual (sqlite3 no comparte conexiones)."""
+
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, isolation_level=None, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def ensure_table(self, table_name: str) -> None:
+        if table_name in self._known_tables:
+            return
+        with self._schema_lock:
+            if table_name in self._known_tables:
+                return
+            connection = self.connection()
+            connection.execute(
+                f'CREATE TABLE IF NOT EXISTS "{table_name}" '
+                "(id TEXT PRIMARY KEY, data TEXT NOT NULL)"
+            )
+            columns = (
+                *self._indexed_columns.get("*", ()),
+                *self._indexed_columns.get(table_name, ()),
+            )
+            for column in dict.fromkeys(columns):
+                connection.execute(
+                    f'CREATE INDEX IF NOT EXISTS "ix_{table_name}_{column}" '
+                    f'ON "{table_name}" ({_column(column)})'
+                )
+            self._known_tables.add(table_name)
+
+    def ensure_unique_index(self, table_name: str, keys: Tuple[str, ...]) -> None:
+        """Crea el índice único que respalda un ``on_conflict``.
+
+        Como ``CREATE UNIQUE INDEX`` en PostgreSQL (y el mock), falla si la
+        tabla ya tiene valores duplicados en ``keys``; el índice no se
+        registra y cada ``on_conflict`` sobre esas columnas vuelve a fallar.
+        """
+
+        if keys == ("id",) or (table_name, keys) in self._unique_indexes:
+            return
+        with self._schema_lock:
+            name = f"ux_{table_name}_{'_'.join(keys)}"
+            expressions = ", ".join(_column(key) for key in keys)
+            try:
+                self.connection().execute(
+                    f'CREATE UNIQUE INDEX IF NOT EXISTS "{name}" '
+                    f'ON "{table_name}" ({expressions})'
+                )
+            except sqlite3.IntegrityError:
+                duplicate = self.connection().execute(
+                    f'SELECT {expressions} FROM "{table_name}" '
+                    f"GROUP BY {expressions} HAVING COUNT(*) > 1 LIMIT 1"
+                ).fetchone()
+                values = ", ".join(
+                    f"{key}={value!r}" for key, value in zip(keys, duplicate or ())
+                )
+                logger.error(
+                    "Datos duplicados impiden el índice único (%s)", ", ".join(keys)
+                )
+                raise MockAPIError(
+                    f"could not create unique index ({', '.join(keys)}): "
+                    f"key ({values}) is duplicated"
+                ) from None
+            self._unique_indexes.add((table_name, keys))
+
+    def is_empty(self) -> bool:
+        cursor = self.connection().execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table'"
+        )
+        return cursor.fetchone()[0] == 0
+
+    def seed(self, initial_data: Dict[str, Iterable[Dict[str, Any]]]) -> None:
+        for table_name, rows in initial_data.items():
+            payload = [dict(row) for row in rows]
+            if payload:
+                self.table(table_name).upsert(payload).execute()
+        if initial_data:
+            logger.info("Base SQLite inicializada", extra={"path": str(self.path)})
+
+
+class SQLiteTable:
+    def __init__(self, client: SQLiteSupabaseClient, table_name: str):
+        self._client = client
+        self._table_name = table_name
+
+    def select(self, *columns: str, count: Optional[str] = None) -> "SQLiteQuery":
+        return SQLiteQuery(
+            self._client,
+            self._table_name,
+            "select",
+            columns=",".join(columns) or "*",
+            count=count,
+        )
+
+    def insert(self, payload: Any) -> "SQLiteQuery":
+        return SQLiteQuery(self._client, self._table_name, "insert", payload=payload)
+
+    def update(self, payload: Dict[str, Any]) -> "SQLiteQuery":
+        return SQLiteQuery(self._client, self._table_name, "update", payload=payload)
+
+    def upsert(self, payload: Any, *, on_conflict: Optional[str] = None) -> "SQLiteQuery":
+        return SQLiteQuery(
+            self._client,
+            self._table_name,
+            "upsert",
+            payload=payload,
+            on_conflict=on_conflict,
+        )
+
+    def delete(self) -> "SQLiteQuery":
+        return SQLiteQuery(self._client, self._table_name, "delete")
+
+
+class SQLiteQuery(FilterMixin):
+    def __init__(
+        self,
+        client: SQLiteSupabaseClient,
+        table_name: str,
+        action: str,
+        *,
+        columns: str = "*",
+        payload: Any = None,
+        on_conflict: Optional[str] = None,
+        count: Optional[str] = None,
+    ) -> None:
+        self._client = client
+        self._table_name = table_name
+        self._action = action
+        self._columns = columns
+        self._payload = deepcopy(payload) if payload is not None else None
+        self._on_conflict = on_conflict
+        self._orderings: List[Tuple[str, bool, bool]] = []
+        self._count = count
+        self._init_filters()
+
+    # Filtros -----------------------------------------------------------
+    def order(
+        self, column: str, *, desc: bool = False, nullsfirst: Optional[bool] = None
+    ) -> "SQLiteQuery":
+        self._orderings.append((column, desc, bool(nullsfirst)))
+        return self
+
+    # Ejecución ---------------------------------------------------------
+    def execute(self) -> MockResponse:
+        self._client.ensure_table(self._table_name)
+        connection = self._client.connection()
+
+        if self._action == "select":
+            rows = [json.loads(data) for (_, data) in self._fetch(connection)]
+            total = self._count_rows(connection) if self._count else None
+            return MockResponse(
+                data=[self._project_columns(row) for row in rows], count=total
+            )
+
+        if self._action not in {"insert", "upsert", "update", "delete"}:
+            raise ValueError(f"Unsupported action: {self._action}")
+
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            if self._action == "insert":
+                written = self._insert(connection)
+            elif self._action == "upsert":
+                written = self._upsert(connection)
+            elif self._action == "update":
+                written = self._update(connection)
+            else:
+                written = self._delete(connection)
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+        return MockResponse(data=written)
+
+    def _where(self, params: List[Any]) -> str:
+        if not self._conditions:
+            return ""
+        clauses = [_sql_condition(condition, params) for condition in self._conditions]
+        return " WHERE " + " AND ".join(clauses)
+
+    def _order_by(self) -> str:
+        if not self._orderings:
+            return ""
+        parts = []
+        for column, desc, nullsfirst in self._orderings:
+            expression = _column(column)
+            # Los nulos al final salvo ``nullsfirst``, igual que el mock.
+            parts.append(f"{expression} IS {'NOT ' if nullsfirst else ''}NULL")
+            parts.append(f"{expression} {'DESC' if desc else 'ASC'}")
+        return " ORDER BY " + ", ".join(parts)
+
+    def _fetch(self, connection: sqlite3.Connection) -> List[Tuple[str, str]]:
+        params: List[Any] = []
+        sql = f'SELECT id, data FROM "{self._table_name}"{self._where(params)}{self._order_by()}'
+        if self._limit is not None or self._offset:
+            sql += " LIMIT ? OFFSET ?"
+            params.extend([-1 if self._limit is None else self._limit, self._offset])
+        return connection.execute(sql, params).fetchall()
+
+    def _count_rows(self, connection: sqlite3.Connection) -> int:
+        params: List[Any] = []
+        sql = f'SELECT COUNT(*) FROM "{self._table_name}"{self._where(params)}'
+        return connection.execute(sql, params).fetchone()[0]
+
+    def _project_columns(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        if self._columns in {"*", ""}:
+            return row
+        columns = [col.strip() for col in self._columns.split(",") if col.strip()]
+        return {column: row.get(column) for column in columns}
+
+    def _iter_payloads(self) -> List[Dict[str, Any]]:
+        if self._payload is None:
+            return []
+        if isinstance(self._payload, list):
+            return [dict(item) for item in self._payload]
+        return [dict(self._payload)]
+
+    @staticmethod
+    def _with_id(row: Dict[str, Any]) -> Dict[str, Any]:
+        # Igual que el default ``gen_random_uuid()`` de las tablas reales.
+        if row.get("id") is None:
+            row["id"] = str(uuid.uuid4())
+        else:
+            row["id"] = str(row["id"])
+        return row
+
+    def _insert(self, connection: sqlite3.Connection) -> List[Dict[str, Any]]:
+        rows = [self._with_id(row) for row in self._iter_payloads()]
+        connection.executemany(
+            f'INSERT INTO "{self._table_name}" (id, data) VALUES (?, ?)',
+            [(row["id"], _dumps(row)) for row in rows],
+        )
+        return rows
+
+    def _parse_on_conflict(self) -> Tuple[str, ...]:
+        if not self._on_conflict:
+            return ("id",)
+        keys = tuple(k.strip() for k in self._on_conflict.split(",") if k.strip())
+        return keys or ("id",)
+
+    def _upsert(self, connection: sqlite3.Connection) -> List[Dict[str, Any]]:
+        keys = self._parse_on_conflict()
+        self._client.ensure_unique_index(self._table_name, keys)
+        lookup = (
+            f'SELECT id, data FROM "{self._table_name}" WHERE '
+            + " AND ".join(f"{_column(key)} = ?" for key in keys)
+        )
+        result: List[Dict[str, Any]] = []
+        for payload in self._iter_payloads():
+            values = [payload.get(key) for key in keys]
+            existing = None
+            if all(value is not None for value in values):
+                existing = connection.execute(
+                    lookup, [_bind(value) for value in values]
+                ).fetchone()
+            if existing is None:
+                row = self._with_id(payload)
+                connection.execute(
+                    f'INSERT INTO "{self._table_name}" (id, data) VALUES (?, ?)',
+                    (row["id"], _dumps(row)),
+                )
+            else:
+                current_id, data = existing
+                row = {**json.loads(data), **payload}
+                self._store(connection, current_id, row)
+            result.append(row)
+        return result
+
+    def _store(
+        self, connection: sqlite3.Connection, current_id: str, row: Dict[str, Any]
+    ) -> None:
+        row["id"] = str(row.get("id") or current_id)
+        connection.execute(
+            f'UPDATE "{self._table_name}" SET id = ?, data = ? WHERE id = ?',
+            (row["id"], _dumps(row), current_id),
+        )
+
+    def _update(self, connection: sqlite3.Connection) -> List[Dict[str, Any]]:
+        if not self._payload:
+            return []
+        updated: List[Dict[str, Any]] = []
+        for current_id, data in self._fetch(connection):
+            row = {**json.loads(data), **self._payload}
+            self._store(connection, current_id, row)
+            updated.append(row)
+        return updated
+
+    def _delete(self, connection: sqlite3.Connection) -> List[Dict[str, Any]]:
+        rows = self._fetch(connection)
+        if rows:
+            connection.executemany(
+                f'DELETE FROM "{self._table_name}" WHERE id = ?',
+                [(current_id,) for current_id, _ in rows],
+            )
+        return [json.loads(data) for _, data in rows]
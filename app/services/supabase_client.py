@@ -11,7 +11,13 @@ from typing import Any, Dict
 from supabase import Client, create_client
 
 from app.config.settings import settings
+from app.services.mock_faults import MockFaultInjector
+from app.services.mock_persistence import MockJournal
 from app.services.mock_supabase_client import MockSupabaseClient
+from app.services.sqlite_supabase_client import (
+    DEFAULT_INDEXED_COLUMNS,
+    SQLiteSupabaseClient,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -39,15 +45,67 @@ def _load_mock_data(path: str | Path | None) -> Dict[str, Any] | None:
     return data
 
 
-def _create_supabase_client() -> Client | MockSupabaseClient:
+def _split_columns(value: str) -> list[str]:
+    return [column.strip() for column in value.split(",") if column.strip()]
+
+
+def _indexed_columns_by_table(entries: list[str]) -> dict[str, tuple[str, ...]]:
+    """``tabla.columna`` indexa esa tabla; ``columna`` sola, todas."""
+    by_table: dict[str, tuple[str, ...]] = {}
+    for entry in entries:
+        table, _, column = entry.rpartition(".")
+        by_table[table or "*"] = (*by_table.get(table or "*", ()), column)
+    return by_table
+
+
+def _create_supabase_client() -> Client | MockSupabaseClient | SQLiteSupabaseClient:
     data_source = settings.DATA_SOURCE.lower()
 
     if data_source == "mock":
-        initial_data = _load_mock_data(settings.MOCK_DATA_PATH)
-        return MockSupabaseClient(initial_data=initial_data)
+        journal = None
+        if settings.MOCK_PERSIST_DIR:
+            journal = MockJournal(
+                settings.MOCK_PERSIST_DIR,
+                snapshot_every=settings.MOCK_SNAPSHOT_EVERY,
+                fsync=settings.MOCK_JOURNAL_FSYNC,
+            )
+        # Con un snapshot previo el JSON inicial ya no se vuelve a leer.
+        initial_data = None
+        if journal is None or not journal.has_snapshot():
+            initial_data = _load_mock_data(settings.MOCK_DATA_PATH)
+        sorted_columns = _split_columns(settings.MOCK_SORTED_COLUMNS)
+        faults = None
+        if settings.MOCK_FAULTS_PATH:
+            faults = MockFaultInjector.from_file(settings.MOCK_FAULTS_PATH)
+            logger.info(
+                "Inyección de latencia y errores activa en el mock",
+                extra={"path": settings.MOCK_FAULTS_PATH, "seed": faults.seed},
+            )
+        return MockSupabaseClient(
+            initial_data=initial_data,
+            sorted_columns=sorted_columns,
+            journal=journal,
+            faults=faults,
+        )
+
+    if data_source == "sqlite":
+        indexed_columns = (
+            _indexed_columns_by_table(_split_columns(settings.SQLITE_INDEXED_COLUMNS))
+            if settings.SQLITE_INDEXED_COLUMNS
+            else DEFAULT_INDEXED_COLUMNS
+        )
+        client = SQLiteSupabaseClient(
+            settings.SQLITE_PATH, indexed_columns=indexed_columns
+        )
+        # Solo una base nueva se inicializa con los datos del mock.
+        if client.is_empty():
+            client.seed(_load_mock_data(settings.MOCK_DATA_PATH) or {})
+        return client
 
     if data_source != "supabase":
-        raise RuntimeError("DATA_SOURCE must be either 'supabase' or 'mock'")
+        raise RuntimeError(
+            "DATA_SOURCE must be one of 'supabase', 'mock' or 'sqlite'"
+        )
 
     if not settings.SUPABASE_URL or not settings.SUPABASE_KEY:
         raise RuntimeError(
@@ -57,16 +115,23 @@ def _create_supabase_client() -> Client | MockSupabaseClient:
     return create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
 
 
-supabase: Client | MockSupabaseClient = _create_supabase_client()
+supabase: Client | MockSupabaseClient | SQLiteSupabaseClient = (
+    _create_supabase_client()
+)
 
 
-def create_supabase_auth_client() -> Client | MockSupabaseClient:
+def create_supabase_auth_client() -> Client | MockSupabaseClient | SQLiteSupabaseClient:
     """Return a fresh Supabase client for Auth operations.
 
     Auth workflows mutate the internal session of the Supabase client
     (por ejemplo, ``sign_in_with_password`` reemplaza el access token).
     Al entregar un cliente nuevo para Auth evitamos que esas mutaciones
     afecten al singleton reutilizado por los DAO para acceder a las tablas.
+    En los backends locales (mock y SQLite) no hay sesión que proteger y se
+    reutiliza el singleton, así no se abre un segundo journal o conexión
+    sobre los mismos archivos.
     """
 
+    if isinstance(supabase, (MockSupabaseClient, SQLiteSupabaseClient)):
+        return supabase
     return _create_supabase_client()
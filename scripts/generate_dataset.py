@@ -0,0 +1,553 @@
+"""Generate a large synthetic tenant dataset for benchmarks.
+
+Produce el mismo formato que ``doc/mock_data.json`` (para ``MOCK_DATA_PATH``)
+o un CSV por tabla compatible con ``scripts/import_supabase.py``. La salida
+es determinista para una misma semilla y parámetros.
+
+Ejemplo (≈2M filas, ~480 MB; unos 20 s en una sola CPU)::
+
+    python scripts/generate_dataset.py --companies 20 --documents 2000 \
+        --users 150 --output bench/mock_large.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import random
+import sys
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.modules.documents.data.versioning import version_sort_key  # noqa: E402
+
+TABLE_ORDER: Sequence[str] = (
+    "companies",
+    "user_profiles",
+    "documents",
+    "document_versions",
+    "document_reads",
+    "processes",
+    "tasks",
+    "flows",
+    "flow_nodes",
+    "flow_edges",
+    "artifact_links",
+)
+
+DOCUMENT_TYPES = ("POE", "Instructivo", "Política", "Plantilla", "Presentación", "Video")
+VERSION_STATUSES = ("borrador", "en_revision", "aprobado", "publicado", "vigente")
+MATURITY = ("establecido", "en_mejora", "critico")
+NODE_TYPES = ("step", "step", "step", "decision", "event", "process", "integration")
+AREAS = ("Calidad", "Operaciones", "Ecommerce", "Postventa", "RRHH", "Compras", "SST")
+CATEGORIES = ("Gestión de Calidad", "Seguridad", "Operaciones", "Comercial", "Legal")
+TAGS = (
+    "ISO 9001",
+    "ISO 45001",
+    "Manual",
+    "Calidad",
+    "SST",
+    "Inducción",
+    "Checkout",
+    "Proveedores",
+    "Auditoría",
+    "Riesgos",
+)
+WORDS = (
+    "procedimiento",
+    "control",
+    "gestión",
+    "revisión",
+    "auditoría",
+    "proveedores",
+    "inducción",
+    "seguridad",
+    "calidad",
+    "mantenimiento",
+    "compras",
+    "despacho",
+    "pedidos",
+    "reclamos",
+    "capacitación",
+    "inventario",
+)
+
+BASE_DATE = date(2024, 1, 1)
+# Fechas y horas preformateadas: formatear cada timestamp domina el costo.
+_DAYS = [(BASE_DATE + timedelta(days=offset)).isoformat() for offset in range(3 * 366)]
+_TIMES = [
+    f"T{second // 3600:02d}:{second // 60 % 60:02d}:{second % 60:02d}Z"
+    for second in range(86400)
+]
+_UUID_CLEAR = ~((0xF000 << 64) | (0xC000 << 48))
+_UUID_V4 = (0x4000 << 64) | (0x8000 << 48)
+JSON_CHUNK = 2000
+
+Row = Dict[str, Any]
+
+
+@dataclass
+class DatasetConfig:
+    companies: int = 3
+    users: int = 40
+    documents: int = 300
+    max_versions: int = 6
+    read_ratio: float = 0.6
+    processes: int = 40
+    max_depth: int = 3
+    tasks: int = 6
+    flows: int = 5
+    nodes: int = 60
+    links_per_document: int = 3
+    seed: int = 42
+
+
+class DatasetGenerator:
+    """Genera las filas tabla por tabla a partir de un ``random.Random`` sembrado."""
+
+    def __init__(self, config: DatasetConfig) -> None:
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.company_ids: List[str] = []
+        self.users: Dict[str, List[str]] = {}
+        self.documents: Dict[str, List[str]] = {}
+        self.versions: Dict[str, List[Tuple[str, str]]] = {}
+        self.processes: Dict[str, List[str]] = {}
+        self.tasks: Dict[str, List[str]] = {}
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _uuid(self) -> str:
+        # Equivale a ``uuid.UUID(int=..., version=4)`` sin construir el objeto.
+        value = (self.rng.getrandbits(128) & _UUID_CLEAR) | _UUID_V4
+        text = f"{value:032x}"
+        return f"{text[:8]}-{text[8:12]}-{text[12:16]}-{text[16:20]}-{text[20:]}"
+
+    def _timestamp(self, start: int = 0, days: int = 365) -> str:
+        day, seconds = divmod(int(self.rng.random() * days * 86400), 86400)
+        return _DAYS[start + day] + _TIMES[seconds]
+
+    def _sentence(self, words: int) -> str:
+        return " ".join(self.rng.choice(WORDS) for _ in range(words)).capitalize()
+
+    def _version_count(self) -> int:
+        # Muchos documentos con pocas versiones y una cola con muchas.
+        return min(self.config.max_versions, 1 + int(self.rng.expovariate(0.8)))
+
+    # ------------------------------------------------------------------
+    # Tablas
+    # ------------------------------------------------------------------
+    def tables(self) -> Iterator[Tuple[str, Iterator[Row]]]:
+        yield "companies", self.companies()
+        yield "user_profiles", self.user_profiles()
+        yield "documents", self.documents_rows()
+        yield "document_versions", self.document_versions()
+        yield "document_reads", self.document_reads()
+        yield "processes", self.processes_rows()
+        yield "tasks", self.tasks_rows()
+        flows = list(self.flows())
+        yield "flows", iter(flows)
+        nodes_by_flow: Dict[str, List[str]] = {}
+        yield "flow_nodes", self.flow_nodes(flows, nodes_by_flow)
+        yield "flow_edges", self.flow_edges(flows, nodes_by_flow)
+        yield "artifact_links", self.artifact_links()
+
+    def companies(self) -> Iterator[Row]:
+        for index in range(self.config.companies):
+            company_id = self._uuid()
+            self.company_ids.append(company_id)
+            yield {
+                "id": company_id,
+                "name": f"Empresa Benchmark {index + 1:03d}",
+                "created_at": self._timestamp(days=30),
+            }
+
+    def user_profiles(self) -> Iterator[Row]:
+        for company_index, company_id in enumerate(self.company_ids):
+            ids = self.users.setdefault(company_id, [])
+            for index in range(self.config.users):
+                user_id = self._uuid()
+                ids.append(user_id)
+                yield {
+                    "id": user_id,
+                    "email": f"user{company_index:03d}.{index:05d}@bench.isotrack.com",
+                    "company_id": company_id,
+                    "full_name": f"Usuario {company_index:03d}-{index:05d}",
+                    "position": self.rng.choice(AREAS),
+                    "role": "admin" if index == 0 else "user",
+                    "created_at": self._timestamp(days=60),
+                }
+
+    def documents_rows(self) -> Iterator[Row]:
+        for company_id in self.company_ids:
+            ids = self.documents.setdefault(company_id, [])
+            owners = self.users[company_id]
+            for index in range(self.config.documents):
+                document_id = self._uuid()
+                ids.append(document_id)
+                # Las versiones se planifican acá para conocer el puntero vigente.
+                planned = [
+                    (self._uuid(), f"{number}.0")
+                    for number in range(1, self._version_count() + 1)
+                ]
+                self.versions[document_id] = planned
+                created_at = self._timestamp()
+                yield {
+                    "id": document_id,
+                    "title": f"{self._sentence(3)} {index + 1}",
+                    "code": f"DOC-{index + 1:05d}",
+                    "type": self.rng.choice(DOCUMENT_TYPES),
+                    "process_id": None,
+                    "owner_id": self.rng.choice(owners),
+                    "description": self._sentence(12),
+                    "active": self.rng.random() > 0.05,
+                    "company_id": company_id,
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                    "category": self.rng.choice(CATEGORIES),
+                    "tags": self.rng.sample(TAGS, self.rng.randint(0, 4)),
+                    "next_review_at": self._timestamp(start=365, days=540),
+                    "current_version_id": planned[-1][0],
+                }
+
+    def document_versions(self) -> Iterator[Row]:
+        for company_id in self.company_ids:
+            approvers = self.users[company_id][:5]
+            for document_id in self.documents[company_id]:
+                for version_id, label in self.versions[document_id]:
+                    created_at = self._timestamp()
+                    yield {
+                        "id": version_id,
+                        "document_id": document_id,
+                        "version": label,
+                        "version_sort_key": version_sort_key(label),
+                        "status": self.rng.choice(VERSION_STATUSES),
+                        "file_url": None,
+                        "external_url": f"https://files.bench.isotrack.com/{document_id}/{label}.pdf",
+                        "notes": self._sentence(6),
+                        "approved_by": self.rng.choice(approvers),
+                        "approved_at": created_at,
+                        "format": "pdf",
+                        "created_at": created_at,
+                    }
+
+    def document_reads(self) -> Iterator[Row]:
+        ratio = self.config.read_ratio
+        # Es la tabla más grande: se evitan búsquedas de atributos por fila.
+        rng_random, new_id, timestamp = self.rng.random, self._uuid, self._timestamp
+        for company_id in self.company_ids:
+            users = self.users[company_id]
+            for document_id in self.documents[company_id]:
+                labels = [label for _, label in self.versions[document_id]]
+                current = labels[-1]
+                # Una lectura por usuario (document_id,user_id es único),
+                # concentrada en la versión vigente.
+                readers = self.rng.sample(users, int(len(users) * ratio * rng_random()))
+                for user_id in readers:
+                    yield {
+                        "id": new_id(),
+                        "document_id": document_id,
+                        "user_id": user_id,
+                        "version": (
+                            current
+                            if rng_random() < 0.7
+                            else labels[int(rng_random() * len(labels))]
+                        ),
+                        "read_at": timestamp(),
+                        "due_date": timestamp()[:10] if rng_random() < 0.3 else None,
+                    }
+
+    def processes_rows(self) -> Iterator[Row]:
+        for company_id in self.company_ids:
+            ids = self.processes.setdefault(company_id, [])
+            owners = self.users[company_id]
+            levels: List[List[str]] = [[]]
+            for index in range(self.config.processes):
+                depth = 0
+                if levels[0]:
+                    depth = self.rng.randint(0, min(len(levels), self.config.max_depth - 1))
+                parent_id = self.rng.choice(levels[depth - 1]) if depth else None
+                process_id = self._uuid()
+                ids.append(process_id)
+                while len(levels) <= depth:
+                    levels.append([])
+                levels[depth].append(process_id)
+                created_at = self._timestamp()
+                yield {
+                    "id": process_id,
+                    "company_id": company_id,
+                    "code": f"PR-{index + 1:04d}",
+                    "name": f"Proceso de {self._sentence(2).lower()} {index + 1}",
+                    "area": self.rng.choice(AREAS),
+                    "owner_id": self.rng.choice(owners),
+                    "parent_id": parent_id,
+                    "objective": self._sentence(10),
+                    "description": self._sentence(15),
+                    "inputs": [self._sentence(2) for _ in range(3)],
+                    "outputs": [self._sentence(2) for _ in range(3)],
+                    "maturity": self.rng.choice(MATURITY),
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                }
+
+    def tasks_rows(self) -> Iterator[Row]:
+        for company_id in self.company_ids:
+            ids = self.tasks.setdefault(company_id, [])
+            owners = self.users[company_id]
+            for process_id in self.processes[company_id]:
+                for index in range(self.rng.randint(1, self.config.tasks * 2 - 1)):
+                    task_id = self._uuid()
+                    ids.append(task_id)
+                    yield {
+                        "id": task_id,
+                        "company_id": company_id,
+                        "process_id": process_id,
+                        "code": f"TA-{index + 1:03d}",
+                        "name": self._sentence(4),
+                        "purpose": self._sentence(8),
+                        "frequency": self.rng.choice(("Diario", "Semanal", "Mensual", "Por pedido")),
+                        "responsible_roles": [self.rng.choice(AREAS)],
+                        "owner_id": self.rng.choice(owners),
+                        "status": self.rng.choice(VERSION_STATUSES),
+                        "updated_at": self._timestamp(),
+                    }
+
+    def flows(self) -> Iterator[Row]:
+        for company_id in self.company_ids:
+            for index in range(self.config.flows):
+                created_at = self._timestamp()
+                yield {
+                    "id": self._uuid(),
+                    "company_id": company_id,
+                    "title": f"Flujo {self._sentence(2).lower()} {index + 1}",
+                    "description": self._sentence(10),
+                    "type": "principal",
+                    "tags": self.rng.sample(TAGS, 2),
+                    "area": self.rng.choice(AREAS),
+                    "visibility": "public",
+                    "layout_mode": "auto",
+                    "default_lane_mode": "system",
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                }
+
+    def flow_nodes(
+        self, flows: List[Row], nodes_by_flow: Dict[str, List[str]]
+    ) -> Iterator[Row]:
+        for flow in flows:
+            ids = nodes_by_flow.setdefault(flow["id"], [])
+            for index in range(self.config.nodes):
+                node_id = self._uuid()
+                ids.append(node_id)
+                yield {
+                    "id": node_id,
+                    "flow_id": flow["id"],
+                    "company_id": flow["company_id"],
+                    "label": self._sentence(3),
+                    "type": self.rng.choice(NODE_TYPES),
+                    "system": self.rng.choice(("VTEX", "Flexxus", "Easy", "Gateway", None)),
+                    "code": str(100 + index),
+                    "metadata": {"notes": self._sentence(5)},
+                    "position": {"x": (index % 10) * 180, "y": (index // 10) * 120},
+                    "order_index": index,
+                    "created_at": flow["created_at"],
+                    "updated_at": flow["created_at"],
+                }
+
+    def flow_edges(
+        self, flows: List[Row], nodes_by_flow: Dict[str, List[str]]
+    ) -> Iterator[Row]:
+        for flow in flows:
+            nodes = nodes_by_flow[flow["id"]]
+            for position in range(1, len(nodes)):
+                # Cadena principal más ramas ocasionales hacia nodos previos.
+                targets = [nodes[position]]
+                if position > 2 and self.rng.random() < 0.25:
+                    targets.append(nodes[self.rng.randrange(position - 1)])
+                for target in targets:
+                    source = nodes[position - 1] if target == nodes[position] else nodes[position]
+                    yield {
+                        "id": self._uuid(),
+                        "flow_id": flow["id"],
+                        "company_id": flow["company_id"],
+                        "source_node": source,
+                        "target_node": target,
+                        "label": None,
+                        "type": "smoothstep",
+                        "created_at": flow["created_at"],
+                    }
+
+    def artifact_links(self) -> Iterator[Row]:
+        for company_id in self.company_ids:
+            documents = self.documents[company_id]
+            sources = [("process", pid) for pid in self.processes[company_id]] + [
+                ("task", tid) for tid in self.tasks[company_id]
+            ]
+            if not sources or not documents:
+                continue
+            seen = set()
+            for document_id in documents:
+                for _ in range(self.rng.randint(1, self.config.links_per_document)):
+                    from_type, from_id = self.rng.choice(sources)
+                    if (from_id, document_id) in seen:
+                        continue
+                    seen.add((from_id, document_id))
+                    yield {
+                        "id": self._uuid(),
+                        "company_id": company_id,
+                        "from_id": from_id,
+                        "from_type": from_type,
+                        "to_id": document_id,
+                        "to_type": "document",
+                        "relation_type": "documento_soporte",
+                        "created_at": self._timestamp(),
+                    }
+
+
+# ----------------------------------------------------------------------
+# Escritura
+# ----------------------------------------------------------------------
+def _chunks(rows: Iterator[Row], size: int) -> Iterator[List[Row]]:
+    chunk: List[Row] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def write_json(generator: DatasetGenerator, path: Path) -> Dict[str, int]:
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    counts: Dict[str, int] = {}
+    with path.open("w", encoding="utf-8") as handle:
+        handle.write("{")
+        for table_index, (table, rows) in enumerate(generator.tables()):
+            handle.write(("," if table_index else "") + f"\n{json.dumps(table)}:[")
+            count = 0
+            # Se codifica por bloques: una llamada al encoder por cada
+            # ``JSON_CHUNK`` filas en lugar de una por fila.
+            for chunk in _chunks(rows, JSON_CHUNK):
+                body = encoder.encode(chunk)[1:-1].replace(',{"id"', ',\n{"id"')
+                handle.write(("," if count else "") + "\n" + body)
+                count += len(chunk)
+            handle.write("]")
+            counts[table] = count
+        handle.write("\n}\n")
+    return counts
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "True" if value else "False"
+    if isinstance(value, list):
+        # Literal de array de PostgreSQL, como en doc/imports/*.csv
+        return "{" + ",".join(json.dumps(str(item), ensure_ascii=False) for item in value) + "}"
+    if isinstance(value, dict):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def write_csv(generator: DatasetGenerator, folder: Path) -> Dict[str, int]:
+    folder.mkdir(parents=True, exist_ok=True)
+    counts: Dict[str, int] = {}
+    for table, rows in generator.tables():
+        count = 0
+        with (folder / f"{table}.csv").open("w", encoding="utf-8", newline="") as handle:
+            writer = None
+            for row in rows:
+                if writer is None:
+                    writer = csv.DictWriter(handle, fieldnames=list(row))
+                    writer.writeheader()
+                writer.writerow({key: _csv_value(value) for key, value in row.items()})
+                count += 1
+        counts[table] = count
+    return counts
+
+
+def parse_args() -> argparse.Namespace:
+    defaults = DatasetConfig()
+    parser = argparse.ArgumentParser(
+        description="Genera un dataset sintético grande y determinista para benchmarks"
+    )
+    parser.add_argument("--output", required=True, help="Archivo .json o carpeta para CSV")
+    parser.add_argument("--format", choices=("json", "csv"), default="json")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--companies", type=int, default=defaults.companies)
+    parser.add_argument("--users", type=int, default=defaults.users, help="Usuarios por empresa")
+    parser.add_argument(
+        "--documents", type=int, default=defaults.documents, help="Documentos por empresa"
+    )
+    parser.add_argument(
+        "--max-versions", type=int, default=defaults.max_versions, help="Versiones máximas por documento"
+    )
+    parser.add_argument(
+        "--read-ratio",
+        type=float,
+        default=defaults.read_ratio,
+        help="Fracción máxima de usuarios que leen cada documento",
+    )
+    parser.add_argument(
+        "--processes", type=int, default=defaults.processes, help="Procesos por empresa"
+    )
+    parser.add_argument(
+        "--max-depth", type=int, default=defaults.max_depth, help="Profundidad del árbol de procesos"
+    )
+    parser.add_argument("--tasks", type=int, default=defaults.tasks, help="Tareas promedio por proceso")
+    parser.add_argument("--flows", type=int, default=defaults.flows, help="Flujos por empresa")
+    parser.add_argument("--nodes", type=int, default=defaults.nodes, help="Nodos por flujo")
+    parser.add_argument(
+        "--links-per-document",
+        type=int,
+        default=defaults.links_per_document,
+        help="Vínculos máximos hacia cada documento",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    config = DatasetConfig(
+        companies=args.companies,
+        users=args.users,
+        documents=args.documents,
+        max_versions=args.max_versions,
+        read_ratio=args.read_ratio,
+        processes=args.processes,
+        max_depth=max(1, args.max_depth),
+        tasks=max(1, args.tasks),
+        flows=args.flows,
+        nodes=args.nodes,
+        links_per_document=max(1, args.links_per_document),
+        seed=args.seed,
+    )
+    generator = DatasetGenerator(config)
+    output = Path(args.output)
+
+    started = time.perf_counter()
+    if args.format == "json":
+        output.parent.mkdir(parents=True, exist_ok=True)
+        counts = write_json(generator, output)
+    else:
+        counts = write_csv(generator, output)
+    elapsed = time.perf_counter() - started
+
+    for table in TABLE_ORDER:
+        print(f"[OK] {table}: {counts.get(table, 0)} filas")
+    print(f"Total: {sum(counts.values())} filas en {elapsed:.1f}s → {output}")
+
+
+if __name__ == "__main__":
+    main()
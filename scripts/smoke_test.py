@@ -17,6 +17,7 @@ sys.path.append(str(ROOT_DIR))
 from app.modules.diagrams.logic.services import DiagramService
 from app.modules.documents.logic.services import DocumentService
 from app.modules.processes.logic.services import ProcessService
+from app.services.supabase_client import supabase
 
 
 def main() -> None:
@@ -91,6 +92,12 @@ def main() -> None:
     print(f"- Diagrama creado: {diagram['id']}")
     print("- Vínculos registrados en artifact_links")
 
+    faults = getattr(supabase, "faults", None)
+    if faults is not None:
+        print("Round-trips simulados (llamadas / errores / latencia):")
+        for key, item in faults.stats().items():
+            print(f"- {key}: {item['calls']} / {item['errors']} / {item['latency_ms']:.1f} ms")
+
 
 if __name__ == "__main__":
     main()